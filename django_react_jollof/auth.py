@@ -28,16 +28,11 @@ def get_client_secrets(social_login: str) -> Dict[str, str]:
     return secrets
 
 
-def write_env_file(secrets: Dict[str, str]) -> None:
+def format_env_file(secrets: Dict[str, str]) -> str:
     """
-    Write the provided client IDs and secrets to a .env file.
+    Return the contents of a .env file holding the provided client IDs and secrets.
 
     Args:
-        secrets (Dict[str, str]): A dictionary containing client IDs and secrets to be written to the .env file.
+        secrets (Dict[str, str]): Client IDs and secrets; empty values are left out.
     """
-    with open(".env", "w") as file:
-        for key, value in secrets.items():
-            if value:
-                file.write(f"{key}={value}\n")
-
-    click.echo(".env file created with provided secrets.")
+    return "".join(f"{key}={value}\n" for key, value in secrets.items() if value)
@@ -1,253 +1,472 @@
 import sys
 import os
-from textwrap import dedent
-from typing import Dict, List, Optional
+import re
+from functools import lru_cache
+from secrets import choice
+from textwrap import dedent, indent
+from typing import Dict, List, Optional, Sequence
+import shutil
 import subprocess
 import click
 
-from django_react_jollof.auth import get_client_secrets, write_env_file
-from django_react_jollof.utils import copy_templates, delete_file
+from django_react_jollof import db_snapshot, timings
+from django_react_jollof.auth import format_env_file
+from django_react_jollof.cache import fingerprint, publish_dir, staging_dir
+from django_react_jollof.environments import (
+    ENV_DIR,
+    base_env_path,
+    env_python,
+    has_overlay,
+    write_overlay,
+    write_pip_commands,
+)
+from django_react_jollof.pipeline import TaskGraph
+from django_react_jollof.runner import run_streaming
+from django_react_jollof.template_manifest import TEMPLATE_ROOT, read_template
+from django_react_jollof.tree import OutputTree
+from django_react_jollof.utils import LOCKFILE_DIR
+from django_react_jollof.wheelhouse import (
+    REQUIREMENTS_FILE,
+    interpreter_abi,
+    is_complete,
+    list_wheels,
+    wheelhouse_path,
+    write_index,
+)
+
+# Interpreter the dependency wheels are built for and project environments
+# are created from. Nothing is installed into its own environment.
+PYTHON = "python"
+
+BACKEND_DEPENDENCIES = [
+    "djangorestframework",
+    "djangorestframework-simplejwt",
+    "django-cors-headers",
+    "django-allauth",
+    "python-decouple",
+    "argon2-cffi",
+]
+
+# The closure of BACKEND_DEPENDENCIES pinned with hashes by
+# `django-react-jollof lock`, below the template directory, one per Python
+REQUIREMENTS_LOCK = "backend-{python}.requirements.txt"
+
+# Lock header naming the Python the lock was resolved with, e.g. cpython-311
+LOCK_PYTHON_HEADER = "# Resolved for: "
+
+# Prints where ensurepip keeps the wheels bundled with the interpreter
+_BUNDLED_PIP_SCRIPT = (
+    "import ensurepip, os; "
+    "print(os.path.join(os.path.dirname(ensurepip.__file__), '_bundled'))"
+)
+
+# Characters Django draws SECRET_KEY from (django.core.management.utils)
+SECRET_KEY_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)"
+
+# Entries of SOCIALACCOUNT_PROVIDERS in the generated settings.py
+SOCIAL_PROVIDER_SETTINGS = {
+    "google": dedent(
+        """\
+            "google": {
+                "SCOPE": [
+                    "profile",
+                    "email",
+                ],
+                "AUTH_PARAMS": {
+                    "access_type": "online",
+                },
+                "OAUTH_PKCE_ENABLED": True,
+                "APP": {
+                    "client_id": os.getenv("GOOGLE_CLIENT_ID", ""),
+                    "secret": os.getenv("GOOGLE_CLIENT_SECRET", ""),
+                    "key": "",
+                },
+            },
+        """
+    ),
+}
+
+
+# PASSWORD_HASHERS of each password hasher profile, the hasher of new
+# passwords first. The rest still verify older hashes, which Django replaces
+# at the user's next login.
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "users.hashers.TunedArgon2PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ],
+    "argon2": [
+        "users.hashers.TunedArgon2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ],
+}
 
 
 def run_subprocess_command(
-    command: List[str], success_message: str, error_message: str
+    command: List[str],
+    success_message: str,
+    error_message: str,
+    cwd: Optional[str] = None,
 ) -> None:
     """Helper function to run subprocess commands and handle errors."""
     try:
-        result = subprocess.run(command, check=True, text=True, capture_output=True)
+        run_streaming(command, cwd=cwd)
         click.echo(success_message)
-        click.echo(result.stdout)
     except subprocess.CalledProcessError as e:
         click.echo(f"{error_message}: {e.stderr.strip()}")
         sys.exit(1)
 
 
-def modify_urls_py(project_dir: str) -> None:
-    """Modify urls.py to include necessary imports and API URL patterns."""
-    urls_path = os.path.join(project_dir, "backend", "urls.py")
+def get_random_secret_key() -> str:
+    """Return a SECRET_KEY in the format `django-admin startproject` uses."""
+    key = "".join(choice(SECRET_KEY_CHARS) for _ in range(50))
+    return f"django-insecure-{key}"
 
-    try:
-        with open(urls_path, "r") as file:
-            lines = file.readlines()
-
-        new_content = [
-            "from django.contrib import admin\n",
-            "from django.urls import path, include\n",
-            "\n",
-            "urlpatterns = [\n",
-            '    path("admin/", admin.site.urls),\n',
-            '    path("api/", include("users.urls")), # Added by django-react-jollof\n',
-            "]\n",
-        ]
-
-        with open(urls_path, "w") as file:
-            file.writelines(new_content)
-
-        click.echo("Successfully modified urls.py")
-
-    except Exception as e:
-        click.echo(f"Error modifying urls.py: {str(e)}")
-        raise
 
+def render_social_providers(social_login: str) -> str:
+    """
+    Return the SOCIALACCOUNT_PROVIDERS block for settings.py.
 
-def update_settings(social_login: str) -> None:
-    """Modify settings.py based on user input to integrate required applications and configurations."""
-    settings_path = os.path.join("backend", "settings.py")
+    Args:
+        social_login (str): The social login option (e.g., "google", "none").
 
-    if not os.path.isfile(settings_path):
-        click.echo(f"Error: '{settings_path}' does not exist.")
-        sys.exit(1)
+    Returns:
+        str: The settings block, or an empty string without social login.
+    """
+    provider = SOCIAL_PROVIDER_SETTINGS.get(social_login.lower())
+    if provider is None:
+        return ""
+    return "\nSOCIALACCOUNT_PROVIDERS = {\n" + indent(provider, "    ") + "}\n"
 
-    try:
-        with open(settings_path, "a") as file:
-            common_config = dedent(
-                """
-                # Set by django-react-jollof
-
-                import os
-
-                INSTALLED_APPS += [
-                    "corsheaders",
-                    "rest_framework",
-                    "allauth",
-                    "allauth.account",
-                    "allauth.socialaccount",
-                ]
-
-                AUTHENTICATION_BACKENDS = [
-                    "allauth.account.auth_backends.AuthenticationBackend",
-                ]
-
-                SITE_ID = 1
-
-                ACCOUNT_EMAIL_REQUIRED = True
-                ACCOUNT_USERNAME_REQUIRED = False
-                ACCOUNT_AUTHENTICATION_METHOD = "email"
-                ACCOUNT_EMAIL_VERIFICATION = "none"
-
-                MIDDLEWARE.insert(0, "corsheaders.middleware.CorsMiddleware")
-                MIDDLEWARE.append("allauth.account.middleware.AccountMiddleware")
-
-                REST_FRAMEWORK = {
-                    "DEFAULT_AUTHENTICATION_CLASSES": [
-                        "rest_framework_simplejwt.authentication.JWTAuthentication",
-                    ],
-                    "DEFAULT_PERMISSION_CLASSES": [
-                        "rest_framework.permissions.IsAuthenticated",
-                    ],
-                }
-
-                CORS_ALLOWED_ORIGINS = [
-                    "http://localhost:5173",  # React frontend
-                ]
-                """
-            )
-            file.write(common_config)
-
-            if social_login != "none":
-                social_config_start = dedent(
-                    """
-                    SOCIALACCOUNT_PROVIDERS = {
-                """
-                )
-                file.write(social_config_start)
-
-                if social_login == "google":
-                    google_config = dedent(
-                        f"""
-                        'google': {{
-                            'SCOPE': [
-                                'profile',
-                                'email',
-                            ],
-                            'AUTH_PARAMS': {{
-                                'access_type': 'online',
-                            }},
-                            'OAUTH_PKCE_ENABLED': True,
-                            'APP': {{
-                                'client_id': os.getenv('GOOGLE_CLIENT_ID', ''),
-                                'secret': os.getenv('GOOGLE_CLIENT_SECRET', ''),
-                                'key': '',
-                            }}
-                        }},
-                        """
-                    )
-                    file.write(google_config)
-
-                file.write("}\n")
-
-            click.echo(f"Updated '{settings_path}' with the selected configurations.")
-
-    except IOError as e:
-        click.echo(f"IOError while writing to '{settings_path}': {e}")
-        sys.exit(1)
+
+def render_password_hashers(password_hasher: str) -> str:
+    """
+    Return the PASSWORD_HASHERS setting of a password hasher profile.
+
+    Args:
+        password_hasher (str): The profile (e.g., "pbkdf2", "argon2").
+    """
+    hashers = PASSWORD_HASHER_PROFILES[password_hasher.lower()]
+    return "PASSWORD_HASHERS = [\n" + "".join(f'    "{h}",\n' for h in hashers) + "]"
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as pip does (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def python_tag(abi: str) -> str:
+    """Return the Python part of an ABI tag, e.g. ``cpython-311``."""
+    return "-".join(abi.split("-")[:2])
 
 
-def scaffold_backend(template_dir: str, social_login: str) -> Optional[Dict[str, str]]:
-    """Set up the Django backend by creating the project, installing dependencies, configuring settings, and applying migrations."""
-    secrets = None
+def requirements_lock_name(python: str) -> str:
+    """Return the name of the shipped lock for a Python, e.g. ``cpython-311``."""
+    return REQUIREMENTS_LOCK.format(python=python)
 
+
+def parse_pins(requirements: str) -> Dict[str, str]:
+    """
+    Return the pinned versions of a requirements file.
+
+    Args:
+        requirements (str): Lines like ``name==1.0 --hash=sha256:...``.
+
+    Returns:
+        Dict[str, str]: Versions by normalized distribution name.
+    """
+    pins = {}
+    for line in requirements.replace("\\\n", " ").splitlines():
+        match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)==(\S+)", line)
+        if match:
+            pins[normalize_name(match[1])] = match[2]
+    return pins
+
+
+@lru_cache(maxsize=None)
+def load_requirements_lock(template_dir: str = TEMPLATE_ROOT) -> Optional[str]:
+    """
+    Return the shipped lock of the backend dependencies for this Python.
+
+    A lock holds the hashes of every published file and the platform
+    markers, so it serves any platform, but its versions were resolved for
+    one Python version, since releases drop support for old ones. One lock
+    ships per supported Python version; an interpreter without one, such
+    as a newer CPython or PyPy, resolves the dependencies itself.
+
+    Returns:
+        Optional[str]: The lock, or None when none is shipped for this
+        Python or it does not pin every entry of `BACKEND_DEPENDENCIES`.
+    """
+    try:
+        python = python_tag(interpreter_abi(PYTHON))
+    except (OSError, subprocess.CalledProcessError):
+        return None  # The wheelhouse step reports why
+
+    name = requirements_lock_name(python)
     try:
-        click.echo("Setting up Django backend...")
+        lock = read_template(os.path.join(template_dir, LOCKFILE_DIR, name)).decode(
+            "utf-8"
+        )
+    except OSError:
+        click.echo(
+            f"No backend requirements lock ships for {python}; "
+            "resolving the backend dependencies instead."
+        )
+        return None
+    if f"{LOCK_PYTHON_HEADER}{python}" not in lock.splitlines():
+        click.echo(
+            f"The shipped {name} was not resolved for {python}; "
+            "resolving the backend dependencies instead."
+        )
+        return None
 
-        # Start Django project
+    missing = {normalize_name(name) for name in BACKEND_DEPENDENCIES} - set(
+        parse_pins(lock)
+    )
+    if missing:
+        click.echo(
+            f"The shipped {name} does not pin {', '.join(sorted(missing))}; "
+            "resolving the backend dependencies instead."
+        )
+        return None
+    return lock
+
+
+def backend_requirements() -> List[str]:
+    """
+    Return what the wheel cache is built from.
+
+    Returns:
+        List[str]: The hash-pinned lines of the shipped lock, or the bare
+        `BACKEND_DEPENDENCIES` when there is no usable lock.
+    """
+    lock = load_requirements_lock()
+    if lock is None:
+        return list(BACKEND_DEPENDENCIES)
+    lines = lock.replace("\\\n", " ").splitlines()
+    return [" ".join(line.split()) for line in lines if parse_pins(line)]
+
+
+def add_backend_files(
+    tree: OutputTree,
+    template_dir: str,
+    social_login: str,
+    secrets: Optional[Dict[str, str]] = None,
+    password_hasher: str = "pbkdf2",
+) -> None:
+    """
+    Add the backend to the project tree.
+
+    The Django project is rendered from the bundled project template
+    instead of running `django-admin startproject`, with urls.py and
+    settings.py in their final form, and the users app is layered on top.
+
+    Args:
+        tree (OutputTree): The project tree.
+        template_dir (str): Root of the bundled templates.
+        social_login (str): The social login option (e.g., "google", "none").
+        secrets (Optional[Dict[str, str]]): Client secrets for the social login provider.
+        password_hasher (str): The password hasher profile (e.g., "pbkdf2", "argon2").
+    """
+    tree.add_directory(os.path.join(template_dir, "django_project"), "backend")
+    tree.add_directory(os.path.join(template_dir, "backend"), "backend")
+    tree.context["SECRET_KEY"] = get_random_secret_key()
+    tree.context["SOCIAL_ACCOUNT_PROVIDERS"] = render_social_providers(social_login)
+    tree.context["PASSWORD_HASHERS"] = render_password_hashers(password_hasher)
+
+    tree.add_text(
+        "backend/requirements.txt",
+        load_requirements_lock(template_dir) or "\n".join(BACKEND_DEPENDENCIES),
+    )
+    if social_login.lower() != "none":
+        tree.add_text("backend/.env", format_env_file(secrets or {}))
+
+
+def build_wheelhouse(path: str, abi: str) -> None:
+    """
+    Download and build wheels for every backend dependency into the cache.
+
+    With a shipped lock, exactly the pinned distributions are downloaded
+    and pip checks each against its locked hash; nothing is resolved.
+    """
+    click.echo("Building wheel cache for backend dependencies...")
+    staging = staging_dir(path)
+    requirements = backend_requirements()
+    try:
+        lock = load_requirements_lock()
+        if lock is None:
+            sources = requirements
+        else:
+            lock_path = os.path.join(staging, requirements_lock_name(python_tag(abi)))
+            with open(lock_path, "w") as file:
+                file.write(lock)
+            sources = ["--no-deps", "--require-hashes", "-r", lock_path]
         run_subprocess_command(
-            ["django-admin", "startproject", "backend"],
-            "Django project 'backend' created successfully.",
-            "Failed to create Django project 'backend'",
+            [PYTHON, "-m", "pip", "wheel", "--wheel-dir", staging] + sources,
+            "Backend dependency wheels built successfully.",
+            "Failed to build backend dependency wheels",
         )
+        write_index(staging, requirements, abi)
+        publish_dir(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
 
-        # Change directory to 'backend'
-        os.chdir("backend")
-        click.echo("Changed directory to 'backend'.")
 
-    except FileNotFoundError:
-        click.echo("Directory 'backend' does not exist.")
-        sys.exit(1)
-    except PermissionError:
-        click.echo("Permission denied while changing directory to 'backend'.")
+def prepare_wheelhouse() -> None:
+    """Make sure the wheel cache for the backend dependencies is populated."""
+    try:
+        abi = interpreter_abi(PYTHON)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        click.echo(f"Failed to inspect the Python interpreter: {e}")
         sys.exit(1)
 
-    # Install backend dependencies
-    click.echo("Installing backend dependencies...")
-    dependencies = [
-        "djangorestframework",
-        "djangorestframework-simplejwt",
-        "django-cors-headers",
-        "django-allauth",
-        "python-decouple",
-    ]
+    path = wheelhouse_path(backend_requirements(), abi)
+    if is_complete(path):
+        click.echo(f"Using cached backend wheels from '{path}'.")
+        return
 
-    run_subprocess_command(
-        ["pip", "install", "--upgrade", "pip"],
-        "Pip upgraded successfully.",
-        "Failed to upgrade pip",
-    )
+    shutil.rmtree(path, ignore_errors=True)
+    build_wheelhouse(path, abi)
 
-    run_subprocess_command(
-        ["pip", "install"] + dependencies,
-        "Backend dependencies installed successfully.",
-        "Failed to install backend dependencies",
-    )
 
-    # Save dependencies to requirements.txt
-    click.echo("Saving dependencies to requirements.txt...")
-    with open("requirements.txt", "w") as f:
-        f.write("\n".join(dependencies))
-    click.echo("Dependencies saved to requirements.txt.")
+def current_base_env() -> str:
+    """
+    Return the base environment matching the current wheel cache.
 
-    try:
-        # Modify backend.urls
-        click.echo("Modifying backend URLs...")
-        modify_urls_py(os.getcwd())
+    Raises:
+        OSError: If the wheel cache has not been built.
+        subprocess.CalledProcessError: If the interpreter cannot be inspected.
+    """
+    abi = interpreter_abi(PYTHON)
+    wheels = wheelhouse_path(backend_requirements(), abi)
+    with open(os.path.join(wheels, REQUIREMENTS_FILE), "r") as file:
+        return base_env_path(file.read(), abi)
 
-    except Exception as e:
-        click.echo(f"Error modifying urls.py: {e}")
-        sys.exit(1)
 
-    # Copy backend templates
+def bundled_pip_dir() -> Optional[str]:
+    """
+    Return the directory of the pip wheel bundled with the interpreter.
+
+    Returns:
+        Optional[str]: None when the interpreter ships without ensurepip,
+        as some Linux distributions package it separately.
+    """
+    try:
+        result = timings.run(
+            [PYTHON, "-c", _BUNDLED_PIP_SCRIPT],
+            check=True,
+            text=True,
+            capture_output=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    path = result.stdout.strip()
+    return path if os.path.isdir(path) else None
+
+
+def build_base_env(path: str, wheels: str) -> None:
+    """
+    Install the wheel cache into a shared base environment.
+
+    pip installs into a plain directory with `--target`, so the interpreter's
+    own environment is left untouched. The cache holds the complete
+    dependency closure, so the install needs no package index and no
+    dependency resolution. Every wheel is pinned to the hash recorded when
+    the cache was built, so pip runs in hash-checking mode and a tampered
+    cache fails the install.
+
+    pip itself is added from the wheel bundled with the interpreter, for
+    the project venvs layered on the base to use.
+    """
+    click.echo("Building the shared backend environment...")
+    staging = staging_dir(path)
     try:
-        backend_template_dir = os.path.join(template_dir, "backend")
-        click.echo(f"Copying backend templates from '{backend_template_dir}'...")
-        copy_templates(backend_template_dir, os.getcwd(), "backend")
-        click.secho("Backend templates generated successfully.", fg="green")
+        run_subprocess_command(
+            [PYTHON, "-m", "pip", "install", "--no-index", "--no-deps"]
+            + ["--require-hashes", "--target", staging, "--find-links", wheels]
+            + ["-r", os.path.join(wheels, REQUIREMENTS_FILE)],
+            "Shared backend environment built successfully.",
+            "Failed to build the shared backend environment",
+        )
+        pip_wheels = bundled_pip_dir()
+        if pip_wheels is None:
+            click.echo(
+                "The interpreter bundles no pip; project environments will have none."
+            )
+        else:
+            run_subprocess_command(
+                [PYTHON, "-m", "pip", "install", "--no-index", "--no-deps"]
+                + ["--target", staging, "--find-links", pip_wheels, "pip"],
+                "Added pip to the shared backend environment.",
+                "Failed to add pip to the shared backend environment",
+            )
+        publish_dir(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
 
-    except FileNotFoundError:
-        click.echo(f"Template directory '{backend_template_dir}' does not exist.")
-        sys.exit(1)
-    except PermissionError:
-        click.echo("Permission denied while copying backend templates.")
+
+def prepare_base_env() -> None:
+    """Make sure the base environment for the backend dependencies exists."""
+    try:
+        path = current_base_env()
+    except (OSError, subprocess.CalledProcessError) as e:
+        click.echo(f"Failed to locate the backend wheel cache: {e}")
         sys.exit(1)
-    except Exception as e:
-        click.echo(f"Error copying backend templates: {e}")
+
+    if os.path.isdir(path):
+        click.echo(f"Using the shared backend environment in '{path}'.")
+        return
+
+    build_base_env(
+        path, wheelhouse_path(backend_requirements(), interpreter_abi(PYTHON))
+    )
+
+
+def create_project_env(backend_dir: str) -> None:
+    """
+    Create the project's virtual environment, layered on the base environment.
+
+    The venv gets no packages of its own: a `.pth` file adds the shared
+    base environment, pip included, to its `sys.path`, and `pip` commands
+    run that pip, which installs into the venv. Creating it takes a
+    fraction of a second and a few dozen kilobytes, whatever the size of
+    the dependencies.
+    """
+    env_dir = os.path.join(backend_dir, ENV_DIR)
+    click.echo("Creating the project virtual environment...")
+    run_subprocess_command(
+        [PYTHON, "-m", "venv", "--without-pip", env_dir],
+        f"Virtual environment created in '{env_dir}'.",
+        "Failed to create the virtual environment",
+    )
+    try:
+        write_overlay(env_dir, current_base_env())
+        write_pip_commands(env_dir)
+    except (OSError, subprocess.CalledProcessError) as e:
+        click.echo(f"Failed to link the virtual environment to its dependencies: {e}")
         sys.exit(1)
 
-    if social_login.lower() != "none":
-        try:
-            # Handle social login
-            click.echo("Prompting for social login client secrets...")
-            secrets = get_client_secrets(social_login)
-            click.secho("Writing secrets to .env file...", fg="yellow")
-            write_env_file(secrets)
-            click.secho(".env file created successfully.", fg="yellow")
-
-            click.secho(
-                "Updating settings.py with social login configurations...", fg="yellow"
-            )
-            update_settings(social_login)
-            click.secho("settings.py updated successfully.", fg="green")
 
-        except Exception as e:
-            click.secho(f"Error handling social login configurations: {e}", fg="red")
-            sys.exit(1)
+def project_python(backend_dir: str) -> str:
+    """Return the interpreter of a project's virtual environment."""
+    return os.path.abspath(env_python(os.path.join(backend_dir, ENV_DIR)))
 
+
+def run_migrations(backend_dir: str) -> None:
+    """Apply the initial database migrations."""
     try:
-        # Apply migrations
         click.secho("Running migrations...", fg="yellow")
-        subprocess.run(
-            ["python", "manage.py", "migrate"],
-            check=True,
-            text=True,
+        run_streaming(
+            [project_python(backend_dir), "manage.py", "migrate"], cwd=backend_dir
         )
         click.secho("Migrations applied successfully.", fg="green")
 
@@ -255,15 +474,154 @@ def scaffold_backend(template_dir: str, social_login: str) -> Optional[Dict[str,
         click.secho(f"Failed to apply migrations.\nError: {e.stderr}", fg="red")
         sys.exit(1)
 
+
+def show_migrations(backend_dir: str) -> str:
+    """Return the output of `manage.py showmigrations --plan`."""
+    result = timings.run(
+        [project_python(backend_dir), "manage.py", "showmigrations", "--plan"],
+        check=True,
+        text=True,
+        capture_output=True,
+        cwd=backend_dir,
+    )
+    return result.stdout
+
+
+def verify_snapshot(key: str, backend_dir: str) -> bool:
+    """
+    Check a restored database against `manage.py showmigrations`.
+
+    The snapshot is good when every migration is applied and the plan is
+    the one recorded when the snapshot was taken.
+    """
     try:
-        # Return to project root
-        os.chdir("..")
-        click.echo("Returned to project root directory.")
-        return secrets
+        plan = show_migrations(backend_dir)
+    except subprocess.CalledProcessError as e:
+        click.secho(f"Failed to list migrations.\nError: {e.stderr}", fg="red")
+        return False
+    return "[ ]" not in plan and plan == db_snapshot.stored_plan(key)
 
-    except FileNotFoundError:
-        click.secho("Project root directory does not exist.", fg="red")
-        sys.exit(1)
-    except PermissionError:
-        click.secho("Permission denied while changing back to project root.", fg="red")
-        sys.exit(1)
+
+def database_key(backend_dir: str) -> str:
+    """Return the snapshot key of the project database."""
+    wheels = list_wheels(
+        wheelhouse_path(backend_requirements(), interpreter_abi(PYTHON))
+    )
+    return db_snapshot.snapshot_key(backend_dir, wheels)
+
+
+def migrate_database(backend_dir: str, verify: bool = False) -> None:
+    """
+    Create the project database, from a snapshot when possible.
+
+    Databases are keyed by the installed apps, the installed packages and
+    the project's migrations. A matching snapshot is copied into place
+    instead of running every migration; otherwise `migrate` runs and its
+    result is stored for the next cook.
+
+    Args:
+        backend_dir (str): The backend directory containing manage.py.
+        verify (bool): Check a restored snapshot with `showmigrations` and
+            fall back to a real migrate if it does not match.
+    """
+    try:
+        key = database_key(backend_dir)
+    except (OSError, ValueError, SyntaxError) as e:
+        click.echo(f"Database snapshots disabled for this project: {e}")
+        run_migrations(backend_dir)
+        return
+
+    if db_snapshot.restore(key, backend_dir):
+        if not verify or verify_snapshot(key, backend_dir):
+            click.secho("Restored the migrated database from a snapshot.", fg="green")
+            return
+        click.secho(
+            "The database snapshot does not match showmigrations, migrating instead.",
+            fg="yellow",
+        )
+        os.remove(os.path.join(backend_dir, db_snapshot.DATABASE_FILE))
+
+    run_migrations(backend_dir)
+
+    try:
+        db_snapshot.save(key, backend_dir, show_migrations(backend_dir))
+    except (OSError, subprocess.CalledProcessError) as e:
+        # The database is already migrated in place; the next cook with
+        # these migrations just runs migrate again
+        click.echo(f"Could not store a database snapshot: {e}")
+
+
+def environment_fingerprint(backend_dir: str) -> Optional[str]:
+    """
+    Fingerprint the project's virtual environment.
+
+    Returns:
+        Optional[str]: None when the venv is missing or not layered on the
+        current base environment.
+    """
+    env_dir = os.path.join(backend_dir, ENV_DIR)
+    if not os.path.isfile(env_python(env_dir)):
+        return None
+    try:
+        base = current_base_env()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if not os.path.isdir(base) or not has_overlay(env_dir, base):
+        return None
+    return fingerprint(["project-env-v1", base])
+
+
+def database_fingerprint(backend_dir: str) -> Optional[str]:
+    """
+    Fingerprint the migrated project database.
+
+    Returns:
+        Optional[str]: None when there is no database to keep.
+    """
+    if not os.path.isfile(os.path.join(backend_dir, db_snapshot.DATABASE_FILE)):
+        return None
+    try:
+        return database_key(backend_dir)
+    except (OSError, ValueError, SyntaxError, subprocess.CalledProcessError):
+        return None
+
+
+def add_backend_tasks(
+    graph: TaskGraph,
+    project_dir: str,
+    verify_db: bool = False,
+    after: Sequence[str] = (),
+    migrate: bool = True,
+) -> None:
+    """
+    Register the backend steps on a task graph.
+
+    The wheel cache and the shared base environment do not touch the project
+    directory, so they are prepared alongside the project being written. The
+    project's venv waits for both, and migrations run in the venv.
+
+    Args:
+        graph (TaskGraph): The graph to add the steps to.
+        project_dir (str): Directory the project is generated in.
+        verify_db (bool): Verify a restored database snapshot with showmigrations.
+        after (Sequence[str]): Steps that write the project files.
+        migrate (bool): Create the database; off when the project files
+            come with one.
+    """
+    backend_dir = os.path.join(project_dir, "backend")
+
+    graph.add("wheelhouse", prepare_wheelhouse)
+    graph.add("base env", prepare_base_env, ["wheelhouse"])
+    graph.add(
+        "venv",
+        lambda: create_project_env(backend_dir),
+        ["base env", *after],
+        fingerprint=lambda: environment_fingerprint(backend_dir),
+    )
+    if migrate:
+        graph.add(
+            "migrate",
+            lambda: migrate_database(backend_dir, verify_db),
+            ["venv"],
+            fingerprint=lambda: database_fingerprint(backend_dir),
+        )
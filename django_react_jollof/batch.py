@@ -0,0 +1,245 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import click
+
+from django_react_jollof.utils import (
+    FRONTEND_CHOICES,
+    PASSWORD_HASHER_CHOICES,
+    SOCIAL_LOGIN_CHOICES,
+)
+
+
+class CookResult(NamedTuple):
+    """Outcome of cooking one project from a manifest."""
+
+    name: str
+    success: bool
+    seconds: float
+    log_path: str
+    error: Optional[str] = None
+
+
+def normalise_choice(value: Any, choices: Dict[int, str], field: str) -> str:
+    """
+    Accept either the menu number or the option name used by `cook`.
+
+    Args:
+        value (Any): The manifest value, e.g. 1, "1" or "bootstrap".
+        choices (Dict[int, str]): Menu numbers mapped to option names.
+        field (str): Manifest field name, used in error messages.
+
+    Returns:
+        str: The option name.
+
+    Raises:
+        ValueError: If the value is not a valid option.
+    """
+    text = str(value).strip().lower()
+    if text.isdigit() and int(text) in choices:
+        return choices[int(text)]
+    if text in choices.values():
+        return text
+    valid = ", ".join(f"{number}/{option}" for number, option in choices.items())
+    raise ValueError(f"Invalid {field} '{value}'. Valid options: {valid}.")
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the projects to cook from a YAML or JSON manifest.
+
+    The manifest is either a list of projects or a mapping with a
+    ``projects`` list and optional ``defaults`` applied to every project::
+
+        defaults:
+          frontend: material
+        projects:
+          - name: workshop-a
+          - name: workshop-b
+            social_login: google
+            secrets:
+              GOOGLE_CLIENT_ID: ...
+
+    Args:
+        path (str): Path of the manifest file.
+
+    Returns:
+        List[Dict[str, Any]]: One normalised spec per project.
+
+    Raises:
+        ValueError: If the manifest is malformed.
+    """
+    with open(path, "r") as file:
+        if path.endswith(".json"):
+            data = json.load(file)
+        else:
+            import yaml
+
+            try:
+                data = yaml.safe_load(file)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Manifest '{path}' is not valid YAML: {e}") from e
+
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        data = data.get("projects")
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"Manifest '{path}' does not list any projects.")
+
+    specs: List[Dict[str, Any]] = []
+    names = set()
+    for entry in data:
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"Every project in '{path}' needs a name: {entry!r}")
+        project = {**defaults, **entry}
+        social_login = project.get("social_login", project.get("social-login", 2))
+        directory = project.get("directory")
+
+        spec = {
+            "name": str(project["name"]),
+            "frontend": normalise_choice(
+                project.get("frontend", 1), FRONTEND_CHOICES, "frontend"
+            ),
+            "social_login": normalise_choice(
+                social_login, SOCIAL_LOGIN_CHOICES, "social_login"
+            ),
+            "password_hasher": normalise_choice(
+                project.get("password_hasher", project.get("password-hasher", 1)),
+                PASSWORD_HASHER_CHOICES,
+                "password_hasher",
+            ),
+            "secrets": dict(project.get("secrets") or {}),
+            "directory": os.path.abspath(directory or os.getcwd()),
+        }
+
+        target = os.path.join(spec["directory"], spec["name"])
+        if target in names:
+            raise ValueError(f"Project '{target}' is listed more than once.")
+        names.add(target)
+        specs.append(spec)
+
+    return specs
+
+
+def cook_project(spec: Dict[str, Any]) -> CookResult:
+    """
+    Cook one manifest project; runs inside a worker process.
+
+    The worker's stdout and stderr, including the output of every child
+    process, are redirected to ``<name>.cook.log`` next to the project.
+
+    Args:
+        spec (Dict[str, Any]): A project spec from `load_manifest`.
+
+    Returns:
+        CookResult: Whether the project was created and how long it took.
+    """
+    from django_react_jollof.cook import scaffold_project
+
+    log_path = os.path.join(spec["directory"], f"{spec['name']}.cook.log")
+    os.makedirs(spec["directory"], exist_ok=True)
+    started = time.perf_counter()
+    error: Optional[str] = None
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = (os.dup(1), os.dup(2))
+    with open(log_path, "w") as log:
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            scaffold_project(
+                spec["name"],
+                spec["frontend"],
+                spec["social_login"],
+                spec["secrets"],
+                spec["directory"],
+                password_hasher=spec["password_hasher"],
+            )
+        except SystemExit as e:
+            error = f"exited with status {e.code}"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+
+    return CookResult(
+        spec["name"], error is None, time.perf_counter() - started, log_path, error
+    )
+
+
+def print_summary(results: List[CookResult], seconds: float) -> None:
+    """Print a per-project success/failure and timing summary."""
+    width = max(len(result.name) for result in results)
+    click.secho("\nBatch summary:", bold=True)
+    for result in results:
+        if result.success:
+            click.secho(
+                f"  ✔ {result.name:<{width}}  {result.seconds:7.1f}s", fg="green"
+            )
+        else:
+            click.secho(
+                f"  ✘ {result.name:<{width}}  {result.seconds:7.1f}s  "
+                f"{result.error} (see {result.log_path})",
+                fg="red",
+            )
+
+    failed = sum(not result.success for result in results)
+    click.secho(
+        f"{len(results) - failed} succeeded, {failed} failed in {seconds:.1f}s",
+        fg="red" if failed else "green",
+        bold=True,
+    )
+
+
+def cook_manifest(path: str, jobs: int) -> List[CookResult]:
+    """
+    Cook every project of a manifest with a pool of worker processes.
+
+    Args:
+        path (str): Path of the manifest file.
+        jobs (int): Number of projects built at the same time.
+
+    Returns:
+        List[CookResult]: Results in manifest order.
+    """
+    try:
+        specs = load_manifest(path)
+    except (OSError, ValueError) as e:
+        click.secho(f"Could not read manifest: {e}", fg="red")
+        sys.exit(1)
+
+    click.secho(
+        f"Cooking {len(specs)} projects with {min(jobs, len(specs))} workers...",
+        fg="yellow",
+    )
+    started = time.perf_counter()
+    results: Dict[str, CookResult] = {}
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(specs))) as executor:
+        futures = {executor.submit(cook_project, spec): spec for spec in specs}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # e.g. a worker process died
+                log_path = os.path.join(spec["directory"], f"{spec['name']}.cook.log")
+                result = CookResult(spec["name"], False, 0.0, log_path, str(e))
+
+            status = "done" if result.success else "failed"
+            click.echo(f"[{status}] {result.name} ({result.seconds:.1f}s)")
+            results[os.path.join(spec["directory"], spec["name"])] = result
+
+    ordered = [results[os.path.join(s["directory"], s["name"])] for s in specs]
+    print_summary(ordered, time.perf_counter() - started)
+    return ordered
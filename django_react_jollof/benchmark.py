@@ -0,0 +1,392 @@
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import click
+
+from django_react_jollof.timings import jollof_version
+from django_react_jollof.utils import FRONTEND_CHOICES, SOCIAL_LOGIN_CHOICES
+
+# Bump when the layout of the results file changes
+RESULTS_VERSION = 2
+
+# Every project variant `cook` can produce, as (frontend, social_login)
+CASES: List[Tuple[str, str]] = [
+    (frontend, social_login)
+    for frontend in FRONTEND_CHOICES.values()
+    for social_login in SOCIAL_LOGIN_CHOICES.values()
+]
+
+# Fake client secrets, so social login cases never prompt
+STUB_SECRETS = {"GOOGLE_CLIENT_ID": "bench-id", "GOOGLE_CLIENT_SECRET": "bench-secret"}
+
+# Stand-ins for the external tools, doing just enough for the next step to
+# succeed. They keep the Python side of a cook (rendering, copying, caches,
+# scheduling) as the only thing being measured.
+STUB_TOOLS = {
+    "python": """\
+#!/bin/sh
+case "$1" in
+    -c) echo "bench-abi" ;;
+    -m)
+        if [ "$2" = "venv" ]; then
+            for env_dir; do :; done
+            mkdir -p "$env_dir/bin" "$env_dir/lib/python3/site-packages"
+            ln -sf "$0" "$env_dir/bin/python"
+        fi
+        while [ $# -gt 0 ]; do
+            if [ "$1" = "--wheel-dir" ]; then
+                mkdir -p "$2" && : > "$2/bench-1.0-py3-none-any.whl"
+            fi
+            shift
+        done ;;
+    manage.py)
+        case "$2" in
+            migrate) : > db.sqlite3 ;;
+            showmigrations) echo "[X]  bench.0001_initial" ;;
+        esac ;;
+esac
+""",
+    "node": """\
+#!/bin/sh
+echo v20.11.0
+""",
+    "npm": """\
+#!/bin/sh
+mkdir -p node_modules/bench && echo '{"name": "bench"}' > node_modules/bench/package.json
+echo '{"lockfileVersion": 3}' > package-lock.json
+""",
+}
+
+
+def write_stub_toolchain(directory: str) -> str:
+    """
+    Write the stub executables into `directory`.
+
+    Returns:
+        str: The directory, to be put first on PATH.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, script in STUB_TOOLS.items():
+        path = os.path.join(directory, name)
+        with open(path, "w") as file:
+            file.write(script)
+        os.chmod(path, 0o755)
+    return directory
+
+
+@contextmanager
+def stub_environment(root: str) -> Iterator[None]:
+    """Run with the stub toolchain on PATH and a private jollof cache."""
+    from django_react_jollof.wheelhouse import interpreter_abi
+
+    saved = {name: os.environ.get(name) for name in ("PATH", "JOLLOF_CACHE_DIR")}
+    stub_dir = write_stub_toolchain(os.path.join(root, "bin"))
+    os.environ["PATH"] = stub_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["JOLLOF_CACHE_DIR"] = os.path.join(root, "cache")
+    interpreter_abi.cache_clear()
+    try:
+        yield
+    finally:
+        interpreter_abi.cache_clear()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def cook_once(
+    frontend: str, social_login: str, root: str, golden: bool = False
+) -> Dict[str, Any]:
+    """
+    Cook one project below `root` and return its timings report.
+
+    Unless `golden` is set, the golden project cache is bypassed, so the
+    cook writes every file and runs npm and migrate.
+
+    Output, including that of the stub tools, goes to ``cook.log`` so it
+    does not distort the measurement.
+
+    Raises:
+        RuntimeError: If the cook fails.
+    """
+    from django_react_jollof.cook import scaffold_project
+
+    work_dir = tempfile.mkdtemp(dir=root)
+    report_path = os.path.join(work_dir, "timings.json")
+    log_path = os.path.join(work_dir, "cook.log")
+    error: Optional[str] = None
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = (os.dup(1), os.dup(2))
+    try:
+        with open(log_path, "w") as log:
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+            try:
+                scaffold_project(
+                    "bench",
+                    frontend,
+                    social_login,
+                    STUB_SECRETS,
+                    work_dir,
+                    timings_json=report_path,
+                    golden_cache=golden,
+                )
+            except SystemExit as e:
+                error = f"exited with status {e.code}"
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.dup2(saved_fds[0], 1)
+                os.dup2(saved_fds[1], 2)
+        if error is not None:
+            with open(log_path, "r") as log:
+                raise RuntimeError(f"{frontend}-{social_login} {error}:\n{log.read()}")
+        with open(report_path, "r") as file:
+            return json.load(file)
+    finally:
+        os.close(saved_fds[0])
+        os.close(saved_fds[1])
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def summarise(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce the reports of repeated cooks to medians."""
+    phases: Dict[str, Dict[str, float]] = {}
+    for name in [phase["name"] for phase in reports[0]["phases"]]:
+        runs = [
+            phase
+            for report in reports
+            for phase in report["phases"]
+            if phase["name"] == name
+        ]
+        phases[name] = {
+            "wall_seconds": statistics.median(p["wall_seconds"] for p in runs),
+            "cpu_seconds": statistics.median(
+                p["cpu_seconds"] + p["child_cpu_seconds"] for p in runs
+            ),
+            "files_written": statistics.median_low(p["files_written"] for p in runs),
+            "bytes_written": statistics.median_low(p["bytes_written"] for p in runs),
+        }
+    return {
+        "wall_seconds": statistics.median(r["total_seconds"] for r in reports),
+        "files_written": sum(p["files_written"] for p in phases.values()),
+        "bytes_written": sum(p["bytes_written"] for p in phases.values()),
+        "phases": phases,
+    }
+
+
+def run_benchmark(
+    repeat: int = 5, cases: Sequence[Tuple[str, str]] = tuple(CASES)
+) -> Dict[str, Any]:
+    """
+    Cook every case against the stub toolchain and collect median timings.
+
+    Each case is cooked once to fill the private cache, as on a developer
+    machine that has cooked before, then `repeat` more times without the
+    golden project cache, so every step is measured. Cloning from a golden
+    project is measured separately, under ``<case>-golden``.
+
+    Args:
+        repeat (int): Measured cooks per case.
+        cases (Sequence[Tuple[str, str]]): (frontend, social_login) pairs.
+
+    Returns:
+        Dict[str, Any]: The results, keyed by ``<frontend>-<social_login>``
+        and ``<frontend>-<social_login>-golden``.
+    """
+    results: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "jollof_version": jollof_version(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "repeat": repeat,
+        "cases": {},
+    }
+    root = tempfile.mkdtemp(prefix="jollof-bench-")
+    try:
+        with stub_environment(root):
+            for frontend, social_login in cases:
+                case = f"{frontend}-{social_login}"
+                for golden in (False, True):
+                    # Warm the cache; with golden, this stores the golden project
+                    cook_once(frontend, social_login, root, golden)
+                    reports = [
+                        cook_once(frontend, social_login, root, golden)
+                        for _ in range(repeat)
+                    ]
+                    results["cases"][case + ("-golden" if golden else "")] = summarise(
+                        reports
+                    )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    slack: float = 0.005,
+) -> List[str]:
+    """
+    List the timings that got slower than the baseline allows.
+
+    A time regresses when it exceeds the baseline by more than `tolerance`
+    (relative) and `slack` seconds (absolute), so millisecond phases do not
+    trip on noise. File counts must match exactly.
+
+    Returns:
+        List[str]: One message per regression; empty when all is well.
+    """
+    regressions: List[str] = []
+
+    def check(label: str, current: float, previous: float) -> None:
+        if current > previous * (1 + tolerance) and current - previous > slack:
+            regressions.append(
+                f"{label}: {current * 1e3:.1f}ms vs {previous * 1e3:.1f}ms baseline"
+            )
+
+    for case, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(case)
+        if previous is None:
+            continue
+        check(case, current["wall_seconds"], previous["wall_seconds"])
+        for name, phase in current["phases"].items():
+            if name in previous["phases"]:
+                check(
+                    f"{case} {name}",
+                    phase["wall_seconds"],
+                    previous["phases"][name]["wall_seconds"],
+                )
+        if current["files_written"] != previous["files_written"]:
+            regressions.append(
+                f"{case}: {current['files_written']} files written, "
+                f"{previous['files_written']} in the baseline"
+            )
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Return a table of the median time of every case and phase."""
+    phase_names: List[str] = []
+    for case in results["cases"].values():
+        phase_names += [name for name in case["phases"] if name not in phase_names]
+
+    rows = [["Case", "Total", *phase_names, "Files", "Written"]]
+    for name, case in results["cases"].items():
+        rows.append(
+            [
+                name,
+                f"{case['wall_seconds'] * 1e3:.1f}ms",
+                *(
+                    (
+                        f"{case['phases'][phase]['wall_seconds'] * 1e3:.1f}ms"
+                        if phase in case["phases"]
+                        else "-"
+                    )
+                    for phase in phase_names
+                ),
+                str(case["files_written"]),
+                f"{case['bytes_written'] / 1e3:.1f} kB",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+@click.command()
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Measured cooks per project variant.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    help="Results file to compare against; written when it does not exist yet.",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="Overwrite the baseline with these results instead of comparing.",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Relative slowdown allowed before a time counts as a regression.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Write the results to a JSON file.",
+)
+def main(
+    repeat: int,
+    baseline: Optional[str],
+    update_baseline: bool,
+    tolerance: float,
+    output: Optional[str],
+) -> None:
+    """Benchmark project generation against a stub toolchain."""
+    if os.name != "posix":
+        click.secho("The benchmark's stub toolchain needs a POSIX shell.", fg="red")
+        sys.exit(1)
+
+    try:
+        results = run_benchmark(repeat)
+    except RuntimeError as e:
+        click.secho(f"Benchmark failed: {e}", fg="red")
+        sys.exit(1)
+    click.echo(format_results(results))
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if not baseline:
+        return
+    if update_baseline or not os.path.exists(baseline):
+        with open(baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        click.echo(f"Baseline written to '{baseline}'.")
+        return
+
+    with open(baseline, "r") as file:
+        previous = json.load(file)
+    if previous.get("version") != RESULTS_VERSION:
+        click.secho(
+            f"The baseline '{baseline}' was written by another version of the "
+            "benchmark; rerun with --update-baseline.",
+            fg="red",
+        )
+        sys.exit(1)
+    regressions = compare(results, previous, tolerance)
+    if regressions:
+        click.secho("Regressions against the baseline:", fg="red", bold=True)
+        for regression in regressions:
+            click.secho(f"  {regression}", fg="red")
+        sys.exit(1)
+    click.secho("No regressions against the baseline.", fg="green")
+
+
+if __name__ == "__main__":
+    main()
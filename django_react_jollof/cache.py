@@ -0,0 +1,73 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Iterable
+
+
+def get_cache_dir(*parts: str) -> str:
+    """
+    Return a directory inside the jollof cache, creating it if needed.
+
+    The cache lives in ``$JOLLOF_CACHE_DIR`` when set, otherwise in
+    ``$XDG_CACHE_HOME/django-react-jollof`` (``~/.cache/django-react-jollof``).
+
+    Args:
+        *parts (str): Path components below the cache root.
+
+    Returns:
+        str: Absolute path of the directory.
+    """
+    root = os.environ.get("JOLLOF_CACHE_DIR")
+    if not root:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        root = os.path.join(base, "django-react-jollof")
+
+    path = os.path.abspath(os.path.join(root, *parts))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def fingerprint(parts: Iterable[str]) -> str:
+    """
+    Hash a sequence of strings into a stable cache key.
+
+    Args:
+        parts (Iterable[str]): The inputs the cached artefact depends on.
+
+    Returns:
+        str: A hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def staging_dir(final_path: str) -> str:
+    """Create an empty directory next to `final_path` to build an entry in."""
+    parent = os.path.dirname(final_path)
+    os.makedirs(parent, exist_ok=True)
+    return tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+
+
+def publish_dir(staging: str, final_path: str) -> None:
+    """
+    Move a fully built cache entry into place.
+
+    The rename is atomic, so readers never see a half-written entry. When
+    another process published the same entry first, ours is discarded.
+
+    Args:
+        staging (str): Directory created by `staging_dir`.
+        final_path (str): Where the entry should live.
+    """
+    try:
+        os.rename(staging, final_path)
+    except OSError:
+        if not os.path.isdir(final_path):
+            raise
+        shutil.rmtree(staging, ignore_errors=True)
@@ -1,105 +1,69 @@
-import os
-import sys
-from typing import Dict, List
-import click
-
-from django_react_jollof.backend import scaffold_backend
-from django_react_jollof.frontend import scaffold_frontend
-from django_react_jollof.utils import validate_choice
-
-
-@click.group()
-def cli() -> None:
-    """Django React Jollof - CLI to scaffold Django + React projects."""
-    pass
+import importlib
+from typing import Dict, List, Optional, Tuple
 
+import click
 
-@cli.command()
-@click.option(
-    "--name",
-    prompt="Please enter your project name",
-    help="The name of your project. This will be used to configure your project setup.",
-)
-@click.option(
-    "--frontend",
-    prompt=(
-        "Choose the frontend framework for your project:\n"
-        "  1. Bootstrap (default)\n"
-        "  2. Material Design\n"
-        "Select 1 or 2 (default is 1): "
+# Commands imported on first use, as name -> ("module:attribute", summary).
+# The summary is what `--help` lists, so listing commands imports nothing.
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "cook": ("django_react_jollof.cook:cook", "Create a new boilerplate project."),
+    "lock": (
+        "django_react_jollof.lock:lock",
+        "Regenerate the bundled dependency lockfiles.",
     ),
-    default="1",
-    help="Choose the frontend framework to use (Bootstrap or Material Design).",
-)
-@click.option(
-    "--social-login",
-    prompt=(
-        "Select the social login providers you want to integrate:\n"
-        "  1. Google\n"
-        "  2. No social login (default)\n"
-        "Select 1 or 2 (default is 2): "
-    ),
-    default="2",
-    help="Select the social login providers to include in your project.",
-)
-def cook(name: str, frontend: str, social_login: str) -> None:
-    """
-    Create a new boilerplate project.
-
-    Args:
-        name (str): The name of the project.
-        frontend (str): The frontend framework choice as a string.
-        social_login (str): The social login option as a string.
-    """
-    # Define valid choices for frontend and social-login options
-    frontend_choices: List[int] = [1, 2]  # 1: Bootstrap, 2: Material Design
-    social_login_choices: List[int] = [1, 2]  # 1: Google, 2: None
+}
 
-    # Validate frontend choice
-    if not validate_choice(frontend, frontend_choices):
-        sys.exit(1)
 
-    # Validate social login choice
-    if not validate_choice(social_login, social_login_choices):
-        sys.exit(1)
-
-    # Map numbers to actual values
-    frontend_map: Dict[int, str] = {1: "bootstrap", 2: "material"}
-    social_login_map: Dict[int, str] = {1: "google", 2: "none"}
-
-    selected_frontend: str = frontend_map[int(frontend)]
-    selected_social_login: str = social_login_map[int(social_login)]
-
-    click.secho(
-        f"Creating project '{name}' with {selected_frontend} frontend and {selected_social_login} social login...",
-        fg="yellow",
-    )
-
-    scaffold_project(name, selected_frontend, selected_social_login)
-
-
-def scaffold_project(name: str, frontend: str, social_login: str) -> None:
+class LazyGroup(click.Group):
     """
-    Scaffold the backend and frontend of the project.
+    A click group whose commands are only imported when they run.
+
+    `cook` pulls in the whole scaffolding stack (subprocess, the caches, the
+    task graph); `help` and `--help` should not pay for it.
 
     Args:
-        name (str): The name of the project.
-        frontend (str): The frontend framework choice (e.g., "bootstrap", "material").
-        social_login (str): The social login option (e.g., "google", "none", "both").
+        lazy_commands (Dict[str, Tuple[str, str]]): Commands to load on
+            demand, see `LAZY_COMMANDS`.
     """
-    template_dir: str = os.path.join(os.path.dirname(__file__), "templates")
 
-    # Create project folder
-    os.makedirs(name, exist_ok=True)
-    os.chdir(name)
-
-    # Scaffold backend
-    secrets = scaffold_backend(template_dir, social_login)
-
-    # Scaffold frontend
-    scaffold_frontend(template_dir, frontend, social_login, name, secrets)
-
-    click.secho(f"Project '{name}' created successfully! 🎉", fg="green", bold=True)
+    def __init__(
+        self,
+        *args,
+        lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, name: str) -> Optional[click.Command]:
+        if name not in self.commands and name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[name][0].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, name)
+        return super().get_command(ctx, name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        rows = []
+        for name in self.list_commands(ctx):
+            command = self.commands.get(name)
+            if command is None:
+                rows.append((name, self.lazy_commands[name][1]))
+            elif not command.hidden:
+                rows.append((name, command.get_short_help_str()))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
+def cli() -> None:
+    """Django React Jollof - CLI to scaffold Django + React projects."""
+    pass
 
 
 @cli.command()
@@ -0,0 +1,385 @@
+import os
+import subprocess
+import sys
+from functools import partial
+from typing import Any, Dict, Optional
+import click
+
+from django_react_jollof import golden
+from django_react_jollof.auth import get_client_secrets
+from django_react_jollof.backend import (
+    PYTHON,
+    add_backend_files,
+    add_backend_tasks,
+    backend_requirements,
+)
+from django_react_jollof.batch import cook_manifest
+from django_react_jollof.cache import fingerprint
+from django_react_jollof.frontend import add_frontend_files, add_frontend_tasks
+from django_react_jollof.journal import Journal
+from django_react_jollof.pipeline import TaskGraph
+from django_react_jollof.runner import live_status
+from django_react_jollof.template_manifest import TEMPLATE_ROOT, load_manifest
+from django_react_jollof.timings import format_table, write_report
+from django_react_jollof.tree import OutputTree
+from django_react_jollof.utils import (
+    FRONTEND_CHOICES,
+    PASSWORD_HASHER_CHOICES,
+    SOCIAL_LOGIN_CHOICES,
+    validate_choice,
+    write_project,
+)
+from django_react_jollof.wheelhouse import interpreter_abi
+
+
+FRONTEND_PROMPT = (
+    "Choose the frontend framework for your project:\n"
+    "  1. Bootstrap (default)\n"
+    "  2. Material Design\n"
+    "Select 1 or 2 (default is 1): "
+)
+SOCIAL_LOGIN_PROMPT = (
+    "Select the social login providers you want to integrate:\n"
+    "  1. Google\n"
+    "  2. No social login (default)\n"
+    "Select 1 or 2 (default is 2): "
+)
+
+
+@click.command()
+@click.option(
+    "--name",
+    help="The name of your project. This will be used to configure your project setup.",
+)
+@click.option(
+    "--frontend",
+    help="Choose the frontend framework to use (Bootstrap or Material Design).",
+)
+@click.option(
+    "--social-login",
+    help="Select the social login providers to include in your project.",
+)
+@click.option(
+    "--password-hasher",
+    type=click.Choice(list(PASSWORD_HASHER_CHOICES.values()), case_sensitive=False),
+    default=PASSWORD_HASHER_CHOICES[1],
+    show_default=True,
+    help="Hasher of new passwords; older hashes are upgraded at the next login.",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="YAML or JSON file listing several projects to cook in one run.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Number of projects built in parallel with --manifest.",
+)
+@click.option(
+    "--verify-db",
+    is_flag=True,
+    help="Check a database restored from a snapshot against `manage.py showmigrations`.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Print the wall time, CPU time, peak RSS and bytes written of every step.",
+)
+@click.option(
+    "--timings-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the per-step timings to a JSON file.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted or failed cook, skipping the steps already done.",
+)
+def cook(
+    name: Optional[str],
+    frontend: Optional[str],
+    social_login: Optional[str],
+    password_hasher: str,
+    manifest: Optional[str],
+    jobs: int,
+    verify_db: bool,
+    timings: bool,
+    timings_json: Optional[str],
+    resume: bool,
+) -> None:
+    """
+    Create a new boilerplate project.
+
+    Args:
+        name (str): The name of the project.
+        frontend (str): The frontend framework choice as a string.
+        social_login (str): The social login option as a string.
+        password_hasher (str): The password hasher profile.
+        manifest (str): Path of a manifest describing several projects.
+        jobs (int): Number of parallel workers used with a manifest.
+        verify_db (bool): Verify a restored database snapshot.
+        timings (bool): Print per-step timings.
+        timings_json (str): Path of a JSON file to write per-step timings to.
+        resume (bool): Continue a previous cook of the project.
+    """
+    if manifest and (timings or timings_json or resume):
+        click.secho(
+            "--timings, --timings-json and --resume cannot be used with --manifest.",
+            fg="red",
+        )
+        sys.exit(1)
+
+    if manifest:
+        results = cook_manifest(manifest, jobs)
+        if not all(result.success for result in results):
+            sys.exit(1)
+        return
+
+    # Prompt for anything not given on the command line
+    if name is None:
+        name = click.prompt("Please enter your project name")
+
+    if resume:
+        resume_project(
+            name, verify_db=verify_db, timings=timings, timings_json=timings_json
+        )
+        return
+
+    if frontend is None:
+        frontend = click.prompt(FRONTEND_PROMPT, default="1")
+    if social_login is None:
+        social_login = click.prompt(SOCIAL_LOGIN_PROMPT, default="2")
+
+    # Validate frontend choice
+    if not validate_choice(frontend, list(FRONTEND_CHOICES)):
+        sys.exit(1)
+
+    # Validate social login choice
+    if not validate_choice(social_login, list(SOCIAL_LOGIN_CHOICES)):
+        sys.exit(1)
+
+    # Map numbers to actual values
+    selected_frontend: str = FRONTEND_CHOICES[int(frontend)]
+    selected_social_login: str = SOCIAL_LOGIN_CHOICES[int(social_login)]
+
+    click.secho(
+        f"Creating project '{name}' with {selected_frontend} frontend and {selected_social_login} social login...",
+        fg="yellow",
+    )
+
+    scaffold_project(
+        name,
+        selected_frontend,
+        selected_social_login,
+        password_hasher=password_hasher.lower(),
+        verify_db=verify_db,
+        timings=timings,
+        timings_json=timings_json,
+    )
+
+
+def project_fingerprint(
+    name: str, frontend: str, social_login: str, password_hasher: str
+) -> str:
+    """Fingerprint the project files generated for a set of options."""
+    return fingerprint(
+        ["project-files-v1", name, frontend, social_login, password_hasher]
+        + [f"{entry.path}:{entry.sha256}" for entry in load_manifest(TEMPLATE_ROOT)]
+    )
+
+
+def golden_key(tree: OutputTree, frontend: str, social_login: str) -> Optional[str]:
+    """
+    Return the key of the golden project for a tree.
+
+    Returns:
+        Optional[str]: None when the interpreter cannot be inspected; the
+        wheelhouse step reports why.
+    """
+    try:
+        abi = interpreter_abi(PYTHON)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return golden.snapshot_key(
+        tree, frontend, social_login, backend_requirements(), abi
+    )
+
+
+def save_golden(key: str, project_dir: str, tree: OutputTree) -> None:
+    """Store the cooked project as the golden project for its options."""
+    try:
+        golden.save(key, project_dir, golden.project_paths(tree))
+    except OSError as e:
+        # Runs after every other step succeeded, so only the next cook with
+        # these options is affected: it is cooked in full instead of cloned
+        click.echo(f"Could not store a golden copy of the project: {e}")
+
+
+def resume_project(name: str, directory: Optional[str] = None, **options: Any) -> None:
+    """
+    Continue a previous cook with the options recorded in its journal.
+
+    Args:
+        name (str): The name of the project.
+        directory (Optional[str]): Parent directory of the project.
+        **options: Passed on to `scaffold_project`.
+    """
+    project_dir: str = os.path.join(directory, name) if directory else name
+    journal = Journal(project_dir)
+    if not journal.load() or not {"frontend", "social_login"} <= set(journal.options):
+        click.secho(f"There is no cook of '{name}' to resume.", fg="red")
+        sys.exit(1)
+
+    click.secho(f"Resuming project '{name}'...", fg="yellow")
+    scaffold_project(
+        name,
+        journal.options["frontend"],
+        journal.options["social_login"],
+        password_hasher=journal.options.get(
+            "password_hasher", PASSWORD_HASHER_CHOICES[1]
+        ),
+        directory=directory,
+        resume=True,
+        **options,
+    )
+
+
+def scaffold_project(
+    name: str,
+    frontend: str,
+    social_login: str,
+    secrets: Optional[Dict[str, str]] = None,
+    directory: Optional[str] = None,
+    verify_db: bool = False,
+    timings: bool = False,
+    timings_json: Optional[str] = None,
+    resume: bool = False,
+    password_hasher: str = PASSWORD_HASHER_CHOICES[1],
+    golden_cache: bool = True,
+) -> None:
+    """
+    Scaffold the backend and frontend of the project.
+
+    Nothing here depends on the current working directory, so several
+    projects can be generated side by side from worker processes.
+
+    Args:
+        name (str): The name of the project.
+        frontend (str): The frontend framework choice (e.g., "bootstrap", "material").
+        social_login (str): The social login option (e.g., "google", "none", "both").
+        secrets (Optional[Dict[str, str]]): Social login client secrets. Prompted for when not given.
+        directory (Optional[str]): Parent directory of the project, defaults to the current one.
+        verify_db (bool): Verify a database restored from a snapshot with showmigrations.
+        timings (bool): Print the resources used by every step.
+        timings_json (Optional[str]): Write the resources used by every step to this JSON file.
+        resume (bool): Skip the steps a previous cook of the project finished.
+        password_hasher (str): The password hasher profile (e.g., "pbkdf2", "argon2").
+        golden_cache (bool): Clone the project from a golden copy of its options, and store one after a full cook.
+    """
+    template_dir: str = os.path.join(os.path.dirname(__file__), "templates")
+    project_dir: str = os.path.join(directory, name) if directory else name
+    files_fingerprint = project_fingerprint(
+        name, frontend, social_login, password_hasher
+    )
+
+    journal = Journal(project_dir)
+    journal.options = {
+        "frontend": frontend,
+        "social_login": social_login,
+        "password_hasher": password_hasher,
+    }
+    if resume:
+        # The files are not regenerated, so they must be exactly what this
+        # version of jollof would write; the other steps check themselves
+        if not journal.load() or not journal.is_done(
+            "project files", files_fingerprint
+        ):
+            click.secho(
+                f"'{project_dir}' was not generated by this version of "
+                "django-react-jollof with these options and cannot be resumed.",
+                fg="red",
+            )
+            sys.exit(1)
+        tree = OutputTree()
+        key = None
+    else:
+        # Ask for client secrets up front, the steps below run concurrently
+        if social_login.lower() != "none" and secrets is None:
+            click.echo("Prompting for social login client secrets...")
+            secrets = get_client_secrets(social_login)
+
+        # Lay out every project file in memory, then write them in one step
+        tree = OutputTree()
+        add_backend_files(tree, template_dir, social_login, secrets, password_hasher)
+        add_frontend_files(tree, template_dir, frontend, social_login, name, secrets)
+        key = golden_key(tree, frontend, social_login) if golden_cache else None
+
+    # A project cooked before with the same options is cloned, with only
+    # its own files rendered on top; node_modules and the database come
+    # with it
+    hit = key is not None and golden.is_stored(key)
+    seed = None
+    if hit:
+        click.echo("Cloning the project from a golden copy of these options...")
+        tree = golden.project_tree(tree)
+        seed = partial(golden.restore, key)
+
+    # Install dependencies while the files are written, then migrate and npm install
+    graph = TaskGraph(journal=journal)
+
+    def write_files() -> None:
+        write_project(tree, project_dir, seed)
+        journal.start()
+
+    graph.add(
+        "project files",
+        write_files,
+        fingerprint=lambda: (files_fingerprint if os.path.isdir(project_dir) else None),
+    )
+    add_backend_tasks(
+        graph,
+        project_dir,
+        verify_db,
+        after=["project files"],
+        migrate=not hit or verify_db,
+    )
+    if not hit:
+        add_frontend_tasks(graph, project_dir, after=["project files"])
+    if key is not None and not hit:
+        graph.add(
+            "golden",
+            lambda: save_golden(key, project_dir, tree),
+            list(graph.tasks),
+        )
+    succeeded = False
+    try:
+        with live_status():
+            graph.run()
+        succeeded = True
+    finally:
+        # Report failed cooks too, they are the ones worth looking at
+        if timings:
+            click.echo(format_table(graph.phases()))
+        if timings_json:
+            path, total = graph.critical_path()
+            write_report(
+                timings_json,
+                graph.phases(),
+                project=name,
+                frontend=frontend,
+                social_login=social_login,
+                succeeded=succeeded,
+                total_seconds=round(total, 6),
+                critical_path=path,
+            )
+            click.echo(f"Timings written to '{timings_json}'.")
+        if not succeeded and os.path.isfile(journal.path):
+            click.echo(
+                f"Run `django-react-jollof cook --name {name} --resume` to continue."
+            )
+    graph.report_critical_path()
+
+    click.secho(f"Project '{name}' created successfully! 🎉", fg="green", bold=True)
@@ -0,0 +1,143 @@
+import ast
+import glob
+import os
+import shutil
+from typing import List, Optional
+
+from django_react_jollof import timings
+from django_react_jollof.cache import (
+    fingerprint,
+    get_cache_dir,
+    publish_dir,
+    staging_dir,
+)
+from django_react_jollof.fastcopy import Cloner
+
+DATABASE_FILE = "db.sqlite3"
+PLAN_FILE = "showmigrations.txt"
+
+
+def installed_apps(settings_path: str) -> List[str]:
+    """
+    Read INSTALLED_APPS from a settings.py without importing it.
+
+    Args:
+        settings_path (str): Path of the project's settings.py.
+
+    Returns:
+        List[str]: The app labels, in order.
+
+    Raises:
+        ValueError: If INSTALLED_APPS is not a plain list of strings.
+    """
+    with open(settings_path, "r") as file:
+        tree = ast.parse(file.read(), settings_path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "INSTALLED_APPS"
+            for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+
+    raise ValueError(f"INSTALLED_APPS not found in '{settings_path}'.")
+
+
+def snapshot_key(backend_dir: str, packages: List[str]) -> str:
+    """
+    Return the snapshot key for a backend project.
+
+    The key covers everything that decides the migrated schema: the
+    installed apps, the installed package versions (which ship the
+    third-party migrations) and the project's own migration files. The
+    rest of settings.py, including SECRET_KEY, does not affect it.
+
+    Args:
+        backend_dir (str): The backend directory containing manage.py.
+        packages (List[str]): Names of the installed distributions, e.g. wheel
+            file names, which include their versions.
+    """
+    parts = ["db-snapshot-v1"]
+    parts += installed_apps(os.path.join(backend_dir, "backend", "settings.py"))
+    parts += sorted(os.path.basename(package) for package in packages)
+
+    pattern = os.path.join(backend_dir, "*", "migrations", "*.py")
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r") as file:
+            parts += [os.path.relpath(path, backend_dir), file.read()]
+
+    return fingerprint(parts)
+
+
+def snapshot_path(key: str) -> str:
+    """Return the snapshot directory for a key; it may not exist yet."""
+    return os.path.join(get_cache_dir("db_snapshots"), key)
+
+
+def is_stored(key: str) -> bool:
+    """Check whether a migrated database is stored for a key."""
+    return os.path.isfile(os.path.join(snapshot_path(key), DATABASE_FILE))
+
+
+def stored_plan(key: str) -> Optional[str]:
+    """Return the `showmigrations --plan` output recorded with a snapshot."""
+    try:
+        with open(os.path.join(snapshot_path(key), PLAN_FILE), "r") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def restore(key: str, backend_dir: str) -> bool:
+    """
+    Copy the stored database into a backend project.
+
+    The project writes to its database, so it gets its own copy (a
+    copy-on-write reflink where the filesystem supports it), never a
+    hardlink into the store.
+
+    Args:
+        key (str): Snapshot key from `snapshot_key`.
+        backend_dir (str): The backend directory containing manage.py.
+
+    Returns:
+        bool: True if a snapshot was restored, False on a miss.
+    """
+    if not is_stored(key):
+        return False
+
+    target = os.path.join(backend_dir, DATABASE_FILE)
+    if os.path.exists(target):
+        os.remove(target)
+    Cloner(link=False).clone_file(
+        os.path.join(snapshot_path(key), DATABASE_FILE), target
+    )
+    timings.record_files(1, os.path.getsize(target))
+    return True
+
+
+def save(key: str, backend_dir: str, plan: str) -> None:
+    """
+    Store a freshly migrated database.
+
+    Args:
+        key (str): Snapshot key from `snapshot_key`.
+        backend_dir (str): The backend directory after `manage.py migrate`.
+        plan (str): Output of `manage.py showmigrations --plan` for the database.
+    """
+    if is_stored(key):
+        return
+
+    entry = snapshot_path(key)
+    staging = staging_dir(entry)
+    try:
+        shutil.copy2(
+            os.path.join(backend_dir, DATABASE_FILE),
+            os.path.join(staging, DATABASE_FILE),
+        )
+        with open(os.path.join(staging, PLAN_FILE), "w") as file:
+            file.write(plan)
+        publish_dir(staging, entry)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
@@ -0,0 +1,108 @@
+import glob
+import os
+
+from django_react_jollof.cache import fingerprint, get_cache_dir
+
+# Virtual environment of a generated project, inside its backend directory
+ENV_DIR = ".venv"
+
+# Path configuration file layering the shared base environment below the
+# project's own site-packages
+OVERLAY_FILE = "_jollof_base.pth"
+
+# Commands a venv gets for the pip of its base environment
+PIP_COMMANDS = ("pip", "pip3")
+
+
+def base_env_path(requirements: str, abi: str) -> str:
+    """
+    Return the cache directory of a shared base environment.
+
+    A base environment is a plain site-packages directory holding one set
+    of wheels. It is keyed by the hash-pinned requirements of those wheels,
+    so it is rebuilt whenever any of them changes.
+
+    Args:
+        requirements (str): The requirements file of the wheelhouse it is
+            installed from, one wheel per line with its hash.
+        abi (str): Interpreter ABI tag from `interpreter_abi`.
+
+    Returns:
+        str: Path of the base environment, which may not exist yet.
+    """
+    key = fingerprint(["base-env-v2", abi, requirements])
+    return os.path.join(get_cache_dir("envs"), key)
+
+
+def env_python(env_dir: str) -> str:
+    """Return the interpreter of a virtual environment."""
+    if os.name == "nt":
+        return os.path.join(env_dir, "Scripts", "python.exe")
+    return os.path.join(env_dir, "bin", "python")
+
+
+def site_packages(env_dir: str) -> str:
+    """
+    Return the site-packages directory of a virtual environment.
+
+    Raises:
+        FileNotFoundError: If the environment has none.
+    """
+    if os.name == "nt":
+        candidates = [os.path.join(env_dir, "Lib", "site-packages")]
+    else:
+        candidates = sorted(
+            glob.glob(os.path.join(env_dir, "lib", "*", "site-packages"))
+        )
+    for path in candidates:
+        if os.path.isdir(path):
+            return path
+    raise FileNotFoundError(f"No site-packages directory in '{env_dir}'.")
+
+
+def overlay(base: str) -> str:
+    """
+    Return the `.pth` line that layers a base environment into a venv.
+
+    `site.addsitedir` also processes the `.pth` files of the base, which a
+    bare path line would not. The base comes after the venv's own
+    site-packages on `sys.path`, so packages installed into the project
+    take precedence.
+    """
+    return f"import site; site.addsitedir({base!r})\n"
+
+
+def write_overlay(env_dir: str, base: str) -> None:
+    """Layer the base environment `base` into the virtual environment."""
+    with open(os.path.join(site_packages(env_dir), OVERLAY_FILE), "w") as file:
+        file.write(overlay(base))
+
+
+def has_overlay(env_dir: str, base: str) -> bool:
+    """Check that a virtual environment is layered on the base environment `base`."""
+    try:
+        with open(os.path.join(site_packages(env_dir), OVERLAY_FILE), "r") as file:
+            return file.read() == overlay(base)
+    except OSError:
+        return False
+
+
+def write_pip_commands(env_dir: str) -> None:
+    """
+    Add `pip` commands to a virtual environment that run `python -m pip`.
+
+    pip itself comes from the base environment through the overlay and
+    installs into the venv, so an activated venv's `pip` never falls
+    through to the one on PATH.
+    """
+    bin_dir = os.path.dirname(env_python(env_dir))
+    for name in PIP_COMMANDS:
+        if os.name == "nt":
+            path = os.path.join(bin_dir, f"{name}.bat")
+            script = '@"%~dp0python.exe" -m pip %*\n'
+        else:
+            path = os.path.join(bin_dir, name)
+            script = '#!/bin/sh\nexec "$(dirname "$0")/python" -m pip "$@"\n'
+        with open(path, "w") as file:
+            file.write(script)
+        os.chmod(path, 0o755)
@@ -0,0 +1,175 @@
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, Iterable, List, Tuple
+
+from django_react_jollof import timings
+
+# ioctl request number of Linux FICLONE (copy-on-write clone of a whole file)
+FICLONE = 0x40049409
+
+# Errors that mean "this filesystem cannot do that", not "this file is broken"
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+    errno.ENOSYS,
+}
+
+
+def reflink_file(src: str, dst: str) -> None:
+    """Clone a file with a copy-on-write reflink (btrfs, XFS, ...)."""
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.remove(dst)
+            raise
+    shutil.copymode(src, dst)
+
+
+def copy_range_file(src: str, dst: str) -> None:
+    """Copy a file inside the kernel with copy_file_range (Linux)."""
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            remaining = os.fstat(source.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            target.close()
+            os.remove(dst)
+            raise
+    shutil.copymode(src, dst)
+
+
+def hardlink_file(src: str, dst: str) -> None:
+    """Link a file to the same inode; both paths then share their contents."""
+    os.link(src, dst)
+
+
+def copy_file(src: str, dst: str) -> None:
+    """Copy a file with its metadata."""
+    shutil.copy2(src, dst)
+
+
+class Cloner:
+    """
+    Clone files with the cheapest primitive the filesystem supports.
+
+    Methods are tried in order. A method that fails because the
+    filesystem does not support it (e.g. hardlinks across devices) is
+    dropped for the rest of the run, so the probing cost is paid once.
+
+    Args:
+        link (bool): Allow hardlinks. Only safe when neither side is edited in place.
+    """
+
+    def __init__(self, link: bool = True) -> None:
+        self.methods: List[Tuple[str, Callable[[str, str], None]]] = []
+        if os.name == "posix":
+            self.methods.append(("reflink", reflink_file))
+        if link:
+            self.methods.append(("hardlink", hardlink_file))
+        if hasattr(os, "copy_file_range"):
+            self.methods.append(("copy_file_range", copy_range_file))
+        self.methods.append(("copy", copy_file))
+
+    def clone_file(self, src: str, dst: str) -> str:
+        """
+        Clone one file.
+
+        Returns:
+            str: Name of the method that was used.
+        """
+        for name, method in list(self.methods):
+            if name == "copy":
+                break
+            try:
+                method(src, dst)
+                return name
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                try:
+                    self.methods.remove((name, method))
+                except ValueError:  # Already dropped by another thread
+                    pass
+
+        copy_file(src, dst)
+        return "copy"
+
+    def clone_tree(
+        self, src: str, dst: str, skip: Collection[str] = ()
+    ) -> Tuple[int, int]:
+        """
+        Recreate a directory tree, cloning every file and symlink.
+
+        Args:
+            src (str): Existing directory.
+            dst (str): Target directory; created if missing.
+            skip (Collection[str]): "/"-separated paths, relative to `src`,
+                of files and directories to leave out.
+
+        Returns:
+            Tuple[int, int]: Number of files and bytes cloned.
+        """
+        files = 0
+        size = 0
+        stack = [(src, dst, "")]
+        while stack:
+            source_dir, target_dir, prefix = stack.pop()
+            os.makedirs(target_dir, exist_ok=True)
+            with os.scandir(source_dir) as entries:
+                for entry in entries:
+                    path = f"{prefix}{entry.name}"
+                    if path in skip:
+                        continue
+                    target = os.path.join(target_dir, entry.name)
+                    if entry.is_symlink():
+                        os.symlink(os.readlink(entry.path), target)
+                    elif entry.is_dir():
+                        stack.append((entry.path, target, f"{path}/"))
+                    else:
+                        self.clone_file(entry.path, target)
+                        files += 1
+                        size += entry.stat().st_size
+        timings.record_files(files, size)
+        return files, size
+
+    def clone_files(
+        self, files: Iterable[Tuple[str, str, int]], max_workers: int = 8
+    ) -> None:
+        """
+        Clone many files concurrently.
+
+        Every target directory is created up front, so the workers only
+        copy file contents.
+
+        Args:
+            files (Iterable[Tuple[str, str, int]]): Source path, target path
+                and permission bits of each file.
+            max_workers (int): Number of copying threads.
+        """
+        files = list(files)
+        for directory in sorted({os.path.dirname(dst) for _, dst, _ in files}):
+            os.makedirs(directory, exist_ok=True)
+
+        def clone(job: Tuple[str, str, int]) -> None:
+            src, dst, mode = job
+            if self.clone_file(src, dst) != "hardlink":  # A link shares the inode
+                os.chmod(dst, mode)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # Consume the results so the first failure is raised here
+            for _ in pool.map(clone, files):
+                pass
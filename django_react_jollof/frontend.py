@@ -1,30 +1,42 @@
 import json
 import os
-import shutil
 import subprocess
 import sys
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Sequence
 
 import click
 import logging
 
-from django_react_jollof.utils import FRONTEND_DEPENDENCIES, copy_templates, delete_file
+from django_react_jollof import node_store, timings
+from django_react_jollof.pipeline import TaskGraph
+from django_react_jollof.runner import run_streaming
+from django_react_jollof.template_manifest import read_template
+from django_react_jollof.tree import OutputTree
+from django_react_jollof.utils import FRONTEND_DEPENDENCIES, LOCKFILE_DIR
 
-# Set up logging for better traceability
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Define constants for npm commands
-NPM_CREATE_VITE_CMD = [
-    "npm",
-    "create",
-    "vite@4.4.0",
-    "frontend",
-    "--",
-    "--template",
-    "react",
-]
 NPM_INSTALL_CMD = ["npm", "install"]
+NPM_CI_CMD = ["npm", "ci", "--no-audit", "--no-fund"]
+
+# Helper templates layered over the base frontend, by framework
+FRAMEWORK_OVERLAYS = {
+    "material": {
+        "mui/mui_main.jsx": "frontend/src/main.jsx",
+        "mui/mui_main.css": "frontend/src/styles/main.css",
+        "mui/Login.jsx": "frontend/src/pages/Login.jsx",
+        "mui/Register.jsx": "frontend/src/pages/Register.jsx",
+    },
+}
+
+# Helper templates for the project root and frontend configuration
+PROJECT_FILES = {
+    "gitignore.txt": ".gitignore",
+    "LICENSE": "LICENSE",
+    "README.md": "README.md",
+    "eslintrc.json": "frontend/.eslintrc.json",
+}
 
 
 def check_node_version() -> None:
@@ -34,7 +46,7 @@ def check_node_version() -> None:
     """
     try:
         # Get the installed Node.js version
-        result: subprocess.CompletedProcess = subprocess.run(
+        result: subprocess.CompletedProcess = timings.run(
             ["node", "--version"], capture_output=True, text=True, check=True
         )
         version_str: str = result.stdout.strip().lstrip("v")
@@ -53,275 +65,225 @@ def check_node_version() -> None:
         sys.exit(1)
 
 
-def replace_placeholder_in_file(
-    file_path: str, placeholder: str, replacement: str
-) -> None:
-    """Replace a placeholder in a file with a replacement string."""
-    if not os.path.isfile(file_path):
-        click.echo(f"File '{file_path}' does not exist for placeholder replacement.")
-        raise FileNotFoundError(f"File '{file_path}' does not exist.")
+def render_package_json(template_dir: str, frontend: str) -> str:
+    """
+    Return package.json with the dependencies of the selected framework.
 
+    Args:
+        template_dir (str): Root of the bundled templates.
+        frontend (str): The frontend framework choice (e.g., "bootstrap", "material").
+    """
+    template_path = os.path.join(template_dir, "frontend", "package.json")
     try:
-        with open(file_path, "r") as file:
-            content: str = file.read()
-
-        if placeholder not in content:
-            click.echo(
-                f"Placeholder '{placeholder}' not found in '{file_path}'. No replacement made."
-            )
-            return
-
-        updated_content: str = content.replace(placeholder, replacement)
-
-        with open(file_path, "w") as file:
-            file.write(updated_content)
+        package_data = json.loads(read_template(template_path))
+    except json.JSONDecodeError as e:
+        click.secho(f"Invalid JSON in package.json: {e}", fg="red", bold=True)
+        raise
 
+    if frontend.lower() in FRONTEND_DEPENDENCIES:
+        package_data.setdefault("dependencies", {}).update(
+            FRONTEND_DEPENDENCIES[frontend.lower()]
+        )
+    else:
         click.echo(
-            f"Replaced placeholder '{placeholder}' with '{replacement}' in '{file_path}'."
+            f"Unknown frontend framework '{frontend}'. Skipping additional dependencies."
         )
-    except Exception as e:
-        click.echo(f"Error replacing placeholder in '{file_path}': {e}")
-        raise
+    return json.dumps(package_data, indent=2)
 
 
-def copy_template_file(
-    template_path: str, destination_path: str, description: str
-) -> None:
-    """Copy a template file to the destination and handle errors."""
-    try:
-        shutil.copy(template_path, destination_path)
-        click.echo(f"{description} generated successfully.")
-    except FileNotFoundError as e:
-        click.echo(f"Error: Template file not found - {template_path}: {e}")
-        sys.exit(1)
-    except PermissionError as e:
-        click.echo(f"Permission denied while copying {description}: {e}")
-        sys.exit(1)
-    except Exception as e:
-        click.echo(f"Unexpected error while copying {description}: {e}")
-        sys.exit(1)
+def lockfile_name(frontend: str) -> str:
+    """Return the name of the shipped lockfile of a frontend framework."""
+    return f"frontend-{frontend.lower()}.{node_store.LOCKFILE}"
 
 
-def scaffold_frontend(
-    template_dir: str,
-    frontend: str,
-    social_login: str,
-    project_name: str,
-    secrets: Optional[Dict[str, str]] = None,
-) -> None:
-    """Scaffold the React frontend and install necessary dependencies."""
-    try:
-        # Step 1: Check Node.js version
-        click.echo("Checking Node.js version...")
-        check_node_version()
-        click.echo("Node.js version is sufficient.")
+def load_lockfile(template_dir: str, frontend: str, package_json: str) -> Optional[str]:
+    """
+    Return the shipped lockfile of a frontend framework.
 
-        # Step 2: Create a new Vite project with React template
-        click.echo("Setting up React frontend with Vite...")
-        subprocess.run(NPM_CREATE_VITE_CMD, check=True, text=True)
-        click.echo("Vite React project 'frontend' created successfully.")
+    Social login does not change package.json, so one lockfile covers both
+    variants of a framework.
 
-    except subprocess.CalledProcessError as e:
-        click.echo(f"Failed to create Vite React project.\nError: {e.stderr.strip()}")
-        sys.exit(1)
+    Args:
+        template_dir (str): Root of the bundled templates.
+        frontend (str): The frontend framework choice.
+        package_json (str): The project's package.json.
 
+    Returns:
+        Optional[str]: The lockfile, or None when none is shipped or it was
+        resolved for other dependencies than `package_json` lists.
+    """
+    path = os.path.join(template_dir, LOCKFILE_DIR, lockfile_name(frontend))
     try:
-        # Step 3: Replace default package.json
-        os.chdir("frontend")
-        frontend_template_dir: str = os.path.join(template_dir, "frontend")
-
-        click.echo("Copying frontend templates...")
-        copy_templates(frontend_template_dir, os.getcwd(), "frontend")
-
-        # Step 4: Delete unnecessary files
-        delete_file(os.path.join(os.getcwd(), ".gitignore"))
-        delete_file(os.path.join(os.getcwd(), ".eslintrc.cjs"))
-        delete_file(os.path.join(os.getcwd(), "src", "App.css"))
-        delete_file(os.path.join(os.getcwd(), "src", "index.css"))
-
-        # Step 5: Add frontend dependencies
-        if frontend.lower() in FRONTEND_DEPENDENCIES:
-            frontend_dependencies = FRONTEND_DEPENDENCIES[frontend.lower()]
-            update_package_json("package.json", frontend_dependencies)
-        else:
-            click.echo(
-                f"Unknown frontend framework '{frontend}'. Skipping additional dependencies."
+        lockfile = read_template(path).decode("utf-8")
+        root = json.loads(lockfile)["packages"][""]
+    except (OSError, ValueError, KeyError):
+        return None
+
+    package_data = json.loads(package_json)
+    for field in ("dependencies", "devDependencies"):
+        if root.get(field, {}) != package_data.get(field, {}):
+            logger.warning(
+                "The shipped %s is out of date, falling back to npm install.",
+                lockfile_name(frontend),
             )
+            return None
+    return lockfile
 
-        # Step 6: Install frontend dependencies
-        click.echo("Installing frontend dependencies from package.json...")
-        subprocess.run(NPM_INSTALL_CMD, check=True, text=True)
-        click.echo("Frontend dependencies installed successfully.")
-
-        # Step 7: Replace Project name in index.html and NavBar.jsx
-        # based on the selected framework
-        click.echo(
-            f"Generating index.html and Navbar based on selected frontend framework: {frontend}..."
-        )
-
-        replace_placeholder_in_file(
-            os.path.join(os.getcwd(), "index.html"), "{{ PROJECT_NAME }}", project_name
-        )
-
-        components_dir: str = os.path.join("src", "components")
-        os.makedirs(components_dir, exist_ok=True)
 
-        # Set project name in NavBar.jsx
-        navbar_template: str = os.path.join(
-            template_dir, "helper_files", "navbar", f"{frontend.title()}Navbar.jsx"
+def render_frontend_env(social_login: str, secrets: Optional[Dict[str, str]]) -> str:
+    """Return the frontend .env file with the social login information."""
+    lines = [f"VITE_SOCIAL_LOGIN={social_login}\n"]
+    if social_login == "google" and secrets:
+        lines.append(f'VITE_GOOGLE_CLIENT_ID={secrets.get("GOOGLE_CLIENT_ID", "")}\n')
+        lines.append(
+            f'VITE_GOOGLE_CLIENT_SECRET={secrets.get("VITE_GOOGLE_CLIENT_SECRET", "")}\n'
         )
-        dest_navbar: str = os.path.join(components_dir, "Navbar.jsx")
-        shutil.copy(navbar_template, dest_navbar)
-        replace_placeholder_in_file(dest_navbar, "{{ PROJECT_NAME }}", project_name)
-
-        click.echo("Navbar component generated successfully.")
-
-        # Step 8: Handle social login buttons if applicable
-        if social_login != "none":
-            click.echo(
-                "Setting up authentication buttons based on social login choice..."
-            )
-            setup_auth_buttons(template_dir, social_login)
-
-        # Step 9: Write social_login value into .env file
-        write_to_env_file(social_login, secrets)
+    return "".join(lines)
 
-        # Step 10: Finalize setup with additional files (.gitignore, LICENSE, README.md)
-        finalise_setup(template_dir, frontend)
 
-    except Exception as e:
-        click.echo(f"Unexpected error during frontend scaffolding: {e}")
-        sys.exit(1)
-
-
-def setup_auth_buttons(template_dir: str, social_login: str) -> None:
-    """Handle setup of social login buttons."""
+def add_auth_buttons(tree: OutputTree, template_dir: str, social_login: str) -> None:
+    """Add the social login buttons to the project tree."""
     auth_buttons_template_dir: str = os.path.join(
         template_dir, "helper_files", "auth_buttons"
     )
-    dest_auth_buttons_dir: str = os.path.join("src", "components", "auth_buttons")
-    os.makedirs(dest_auth_buttons_dir, exist_ok=True)
-
-    main_auth_button_template: str = os.path.join(
-        auth_buttons_template_dir, "AuthButtons.jsx"
-    )
-    shutil.copy(
-        main_auth_button_template,
-        os.path.join(dest_auth_buttons_dir, "AuthButtons.jsx"),
-    )
-
-    social_login_button_template: str = os.path.join(
-        auth_buttons_template_dir, f"{social_login.title()}LoginButton.jsx"
-    )
-    shutil.copy(
-        social_login_button_template,
-        os.path.join(dest_auth_buttons_dir, f"{social_login.title()}LoginButton.jsx"),
-    )
-    click.echo(f"{social_login} login button set up.")
-
-
-def write_to_env_file(social_login: str, secrets: Optional[Dict[str, str]]) -> None:
-    """Write the social login information to the .env file."""
-    with open(".env", "w") as env_file:
-        env_file.write(f"VITE_SOCIAL_LOGIN={social_login}\n")
+    for name in ["AuthButtons.jsx", f"{social_login.title()}LoginButton.jsx"]:
+        tree.add_file(
+            os.path.join(auth_buttons_template_dir, name),
+            f"frontend/src/components/auth_buttons/{name}",
+        )
 
-        if social_login == "google" and secrets:
-            env_file.write(
-                f'VITE_GOOGLE_CLIENT_ID={secrets.get("GOOGLE_CLIENT_ID", "")}\n'
-            )
-            env_file.write(
-                f'VITE_GOOGLE_CLIENT_SECRET={secrets.get("VITE_GOOGLE_CLIENT_SECRET", "")}\n'
-            )
 
-    click.echo(".env file created with social_login configuration.")
+def add_frontend_files(
+    tree: OutputTree,
+    template_dir: str,
+    frontend: str,
+    social_login: str,
+    project_name: str,
+    secrets: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Add the frontend to the project tree.
+
+    The bundled templates hold the complete Vite + React skeleton. The
+    framework and social login overlays replace base files in the tree,
+    before anything is written, instead of overwriting copied files.
+
+    Args:
+        tree (OutputTree): The project tree.
+        template_dir (str): Root of the bundled templates.
+        frontend (str): The frontend framework choice (e.g., "bootstrap", "material").
+        social_login (str): The social login option (e.g., "google", "none").
+        project_name (str): The name of the project.
+        secrets (Optional[Dict[str, str]]): Client secrets for the social login provider.
+    """
+    helper_files_dir = os.path.join(template_dir, "helper_files")
 
-    os.chdir("..")
-    click.echo("Returned to the project root directory.")
+    tree.add_directory(os.path.join(template_dir, "frontend"), "frontend")
+    tree.context["PROJECT_NAME"] = project_name
+    package_json = render_package_json(template_dir, frontend)
+    tree.add_text("frontend/package.json", package_json)
+    lockfile = load_lockfile(template_dir, frontend, package_json)
+    if lockfile is not None:
+        tree.add_text(f"frontend/{node_store.LOCKFILE}", lockfile)
+
+    # Framework overlays
+    tree.add_file(
+        os.path.join(helper_files_dir, "navbar", f"{frontend.title()}Navbar.jsx"),
+        "frontend/src/components/Navbar.jsx",
+    )
+    for src, path in FRAMEWORK_OVERLAYS.get(frontend, {}).items():
+        tree.add_file(os.path.join(helper_files_dir, *src.split("/")), path)
 
+    # Social login overlays
+    if social_login != "none":
+        add_auth_buttons(tree, template_dir, social_login)
+    tree.add_text("frontend/.env", render_frontend_env(social_login, secrets))
 
-def finalise_setup(template_dir: str, frontend: str) -> None:
-    """Finalize the project setup by generating necessary files."""
-    click.echo("Generating .gitignore, LICENSE, and README.md files...")
+    for src, path in PROJECT_FILES.items():
+        tree.add_file(os.path.join(helper_files_dir, src), path)
 
-    current_dir = os.getcwd()
-    src_dir = os.path.join(current_dir, "frontend", "src")
-    helper_files_dir = os.path.join(template_dir, "helper_files")
 
-    # Generate .gitignore
-    copy_template_file(
-        os.path.join(helper_files_dir, "gitignore.txt"),
-        os.path.join(current_dir, ".gitignore"),
-        ".gitignore file",
-    )
+def install_frontend_dependencies(frontend_dir: str) -> None:
+    """
+    Install the frontend dependencies.
 
-    # Generate LICENSE
-    copy_template_file(
-        os.path.join(helper_files_dir, "LICENSE"),
-        os.path.join(current_dir, "LICENSE"),
-        "LICENSE file",
-    )
+    node_modules is restored from the local store when the same package.json
+    and lockfile were installed before. Otherwise `npm ci` installs exactly
+    what the shipped lockfile lists, without resolving anything; projects
+    without one fall back to `npm install`. The result is stored.
+    """
+    key = node_store.store_key(frontend_dir)
+    restored = node_store.restore(key, frontend_dir)
+    if restored:
+        click.echo(f"Restored node_modules from the local store: {restored}.")
+        return
+
+    if os.path.isfile(os.path.join(frontend_dir, node_store.LOCKFILE)):
+        click.echo(f"Installing frontend dependencies from {node_store.LOCKFILE}...")
+        command = NPM_CI_CMD
+    else:
+        click.echo("Installing frontend dependencies from package.json...")
+        command = NPM_INSTALL_CMD
+    try:
+        run_streaming(command, cwd=frontend_dir)
+    except subprocess.CalledProcessError as e:
+        click.echo(f"Failed to install frontend dependencies: {e.stderr.strip()}")
+        sys.exit(1)
+    click.echo("Frontend dependencies installed successfully.")
 
-    # Generate README.md
-    copy_template_file(
-        os.path.join(helper_files_dir, "README.md"),
-        os.path.join(current_dir, "README.md"),
-        "README.md file",
-    )
+    try:
+        node_store.save(key, frontend_dir)
+    except OSError as e:
+        # node_modules is already in the project; the next cook of this
+        # package.json installs it with npm instead of hardlinking it
+        logger.warning("Could not add node_modules to the local store: %s", e)
 
-    # Generate ESLint file
-    copy_template_file(
-        os.path.join(helper_files_dir, "eslintrc.json"),
-        os.path.join(current_dir, "frontend", ".eslintrc.json"),
-        ".eslintrc.json file",
-    )
 
-    # Replace main.jsx if bootstrap framework
-    # was selected
-    if frontend == "material":
-        # Copy files for material framework
-        copy_template_file(
-            os.path.join(helper_files_dir, "mui", "mui_main.jsx"),
-            os.path.join(src_dir, "main.jsx"),
-            "main.jsx file",
-        )
+def node_modules_fingerprint(frontend_dir: str) -> Optional[str]:
+    """
+    Fingerprint the installed node_modules by the package.json it came from.
 
-        copy_template_file(
-            os.path.join(helper_files_dir, "mui", "mui_main.css"),
-            os.path.join(src_dir, "styles", "main.css"),
-            "main.css file",
-        )
+    Returns:
+        Optional[str]: None when nothing is installed.
+    """
+    if not os.path.isdir(os.path.join(frontend_dir, "node_modules")):
+        return None
+    try:
+        return node_store.store_key(frontend_dir)
+    except (OSError, ValueError):
+        return None
 
-        copy_template_file(
-            os.path.join(helper_files_dir, "mui", "Login.jsx"),
-            os.path.join(src_dir, "pages", "Login.jsx"),
-            "Login.jsx file",
-        )
 
-        copy_template_file(
-            os.path.join(helper_files_dir, "mui", "Register.jsx"),
-            os.path.join(src_dir, "pages", "Register.jsx"),
-            "Register.jsx file",
-        )
+def frontend_step(func: Callable[[], None]) -> Callable[[], None]:
+    """Wrap a frontend step so unexpected errors abort the cook with a message."""
 
+    def run() -> None:
+        try:
+            func()
+        except Exception as e:
+            click.echo(f"Unexpected error during frontend scaffolding: {e}")
+            sys.exit(1)
 
-def update_package_json(file_path: str, updates: dict) -> None:
-    """Update specific fields in package.json."""
-    try:
-        with open(file_path, "r") as file:
-            package_data = json.load(file)
+    return run
 
-        # Update dependencies
-        if "dependencies" not in package_data:
-            package_data["dependencies"] = {}
-        package_data["dependencies"].update(updates)
 
-        with open(file_path, "w") as file:
-            json.dump(package_data, file, indent=2)
+def add_frontend_tasks(
+    graph: TaskGraph, project_dir: str, after: Sequence[str] = ()
+) -> None:
+    """
+    Register the frontend steps on a task graph.
 
-        click.secho("package.json updated successfully.", fg="green", bold=True)
-    except json.JSONDecodeError as e:
-        click.secho(f"Invalid JSON in package.json: {e}", fg="red", bold=True)
-        raise
-    except Exception as e:
-        click.secho(f"Error updating package.json: {e}", fg="red", bold=True)
-        raise
+    Args:
+        graph (TaskGraph): The graph to add the steps to.
+        project_dir (str): Directory the project is generated in.
+        after (Sequence[str]): Steps that write the project files.
+    """
+    frontend_dir = os.path.join(project_dir, "frontend")
+
+    graph.add("node check", check_node_version)
+    graph.add(
+        "npm install",
+        frontend_step(lambda: install_frontend_dependencies(frontend_dir)),
+        ["node check", *after],
+        fingerprint=lambda: node_modules_fingerprint(frontend_dir),
+    )
@@ -0,0 +1,159 @@
+import os
+import platform
+import shutil
+import sys
+from typing import Iterable, List, Set
+
+from django_react_jollof.cache import (
+    fingerprint,
+    get_cache_dir,
+    publish_dir,
+    staging_dir,
+)
+from django_react_jollof.db_snapshot import DATABASE_FILE
+from django_react_jollof.environments import ENV_DIR
+from django_react_jollof.fastcopy import Cloner
+from django_react_jollof.journal import STATE_DIR
+from django_react_jollof.node_store import LOCKFILE
+from django_react_jollof.template_manifest import TEMPLATE_ROOT, load_manifest
+from django_react_jollof.tree import OutputTree
+
+# Installed packages, linked rather than copied like in the node_modules store
+NODE_MODULES = "frontend/node_modules"
+
+# Generated files that decide what npm and migrate produce. Other generated
+# files, such as the .env files, hold secrets and never enter the key.
+BUILD_INPUTS = (
+    "backend/requirements.txt",
+    "frontend/package.json",
+    f"frontend/{LOCKFILE}",
+)
+
+# Per-machine state that is recreated for every project
+NOT_STORED = (f"backend/{ENV_DIR}", STATE_DIR)
+
+# What a golden project saves the cook from building
+BUILT = (f"backend/{DATABASE_FILE}", NODE_MODULES)
+
+
+def snapshot_key(
+    tree: OutputTree,
+    frontend: str,
+    social_login: str,
+    requirements: List[str],
+    abi: str,
+) -> str:
+    """
+    Return the key of the golden project for a set of options.
+
+    The key covers everything that shapes a cooked project apart from its
+    name and secrets: the options, every bundled template, the backend and
+    frontend dependencies with their lockfiles, and the interpreter and
+    platform the packages were installed for. A change to any of them
+    selects a new golden project.
+
+    Args:
+        tree (OutputTree): The project tree.
+        frontend (str): The frontend framework.
+        social_login (str): The social login option.
+        requirements (List[str]): What the backend wheel cache is built from.
+        abi (str): Interpreter ABI tag from `interpreter_abi`.
+    """
+    parts = ["golden-v1", frontend, social_login, abi, sys.platform]
+    parts += [platform.machine(), *requirements]
+    parts += [f"{entry.path}:{entry.sha256}" for entry in load_manifest(TEMPLATE_ROOT)]
+    for path in BUILD_INPUTS:
+        file = tree.files.get(path)
+        parts += [path, (file.content or "") if file else ""]
+    return fingerprint(parts)
+
+
+def project_paths(tree: OutputTree) -> Set[str]:
+    """
+    Return the files of a tree that differ from project to project.
+
+    Those are the templates with placeholders, such as the project name
+    and SECRET_KEY, and the generated files, such as the .env files.
+    """
+    return {
+        path
+        for path, file in tree.files.items()
+        if file.placeholders or file.content is not None
+    }
+
+
+def project_tree(tree: OutputTree) -> OutputTree:
+    """Return the part of a tree written on top of a golden project."""
+    paths = project_paths(tree)
+    result = OutputTree()
+    result.files = {path: file for path, file in tree.files.items() if path in paths}
+    result.context = tree.context
+    return result
+
+
+def snapshot_path(key: str) -> str:
+    """Return the golden project directory for a key; it may not exist yet."""
+    return os.path.join(get_cache_dir("golden"), key)
+
+
+def is_stored(key: str) -> bool:
+    """Check whether a golden project is stored for a key."""
+    return os.path.isdir(snapshot_path(key))
+
+
+def clone(src: str, dst: str, skip: Iterable[str] = ()) -> None:
+    """
+    Clone a project tree, linking node_modules.
+
+    Files are reflinked where the filesystem supports it and copied
+    otherwise, as the project edits them. node_modules is hardlinked, as
+    for the node_modules store.
+    """
+    Cloner(link=False).clone_tree(src, dst, skip={*skip, NODE_MODULES})
+    modules = os.path.join(src, *NODE_MODULES.split("/"))
+    if os.path.isdir(modules):
+        Cloner(link=True).clone_tree(
+            modules, os.path.join(dst, *NODE_MODULES.split("/"))
+        )
+
+
+def restore(key: str, dest: str) -> None:
+    """
+    Lay down the golden project in a directory.
+
+    The files of `project_paths` are not stored, the project tree writes
+    them on top.
+
+    Args:
+        key (str): Key from `snapshot_key`.
+        dest (str): The new project's directory.
+    """
+    clone(snapshot_path(key), dest)
+
+
+def save(key: str, project_dir: str, paths: Iterable[str]) -> None:
+    """
+    Store a freshly cooked project as the golden project for its options.
+
+    Args:
+        key (str): Key from `snapshot_key`.
+        project_dir (str): The project, after every step succeeded.
+        paths (Iterable[str]): Its files from `project_paths`, left out.
+
+    Raises:
+        FileNotFoundError: If the project lacks its database or node_modules.
+    """
+    if is_stored(key):
+        return
+    for path in BUILT:
+        if not os.path.exists(os.path.join(project_dir, *path.split("/"))):
+            raise FileNotFoundError(f"'{project_dir}' has no {path}.")
+
+    entry = snapshot_path(key)
+    staging = staging_dir(entry)
+    try:
+        clone(project_dir, staging, skip={*paths, *NOT_STORED})
+        publish_dir(staging, entry)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
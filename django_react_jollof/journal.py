@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict
+
+# Directory inside a generated project holding jollof's own state
+STATE_DIR = ".jollof"
+JOURNAL_FILE = "journal.json"
+JOURNAL_VERSION = 1
+
+
+class Journal:
+    """
+    Record of the cook steps completed in a project.
+
+    Every finished step is stored with a fingerprint of its inputs, so a
+    resumed cook can skip the steps that are done and still valid. The
+    journal lives in ``<project>/.jollof/journal.json``. It is kept in
+    memory until `start` is called once the project files are written, so
+    nothing is left behind in a directory jollof did not generate.
+
+    Args:
+        project_dir (str): The project directory.
+    """
+
+    def __init__(self, project_dir: str) -> None:
+        self.project_dir = project_dir
+        self.path = os.path.join(project_dir, STATE_DIR, JOURNAL_FILE)
+        self.options: Dict[str, Any] = {}
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.started = False
+
+    def load(self) -> bool:
+        """
+        Read the journal from the project.
+
+        Returns:
+            bool: False if there is no readable journal.
+        """
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != JOURNAL_VERSION:
+            return False
+
+        self.options = data.get("options") or {}
+        self.steps = data.get("steps") or {}
+        self.started = True
+        return True
+
+    def start(self) -> None:
+        """Start writing the journal to the project."""
+        with self.lock:
+            self.started = True
+            self.save()
+
+    def is_done(self, step: str, fingerprint: str) -> bool:
+        """Check whether a step finished with the same inputs."""
+        entry = self.steps.get(step) or {}
+        return entry.get("status") == "done" and entry.get("fingerprint") == fingerprint
+
+    def record(self, step: str, fingerprint: str) -> None:
+        """Mark a step as finished with the given inputs."""
+        self.update(step, {"status": "done", "fingerprint": fingerprint})
+
+    def record_failure(self, step: str, error: str) -> None:
+        """Mark a step as failed, so it runs again on resume."""
+        self.update(step, {"status": "failed", "error": error})
+
+    def update(self, step: str, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            self.steps[step] = {**entry, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            self.save()
+
+    def save(self) -> None:
+        """Write the journal atomically; a no-op until started."""
+        if not self.started:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(
+                {
+                    "version": JOURNAL_VERSION,
+                    "options": self.options,
+                    "steps": self.steps,
+                },
+                file,
+                indent=2,
+            )
+        os.replace(temporary, self.path)
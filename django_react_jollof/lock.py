@@ -0,0 +1,337 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import urllib.request
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import click
+
+from django_react_jollof.backend import (
+    BACKEND_DEPENDENCIES,
+    LOCK_PYTHON_HEADER,
+    PYTHON,
+    normalize_name,
+    python_tag,
+    requirements_lock_name,
+)
+from django_react_jollof.frontend import lockfile_name, render_package_json
+from django_react_jollof.node_store import LOCKFILE
+from django_react_jollof.runner import run_streaming
+from django_react_jollof.template_manifest import TEMPLATE_ROOT, load_bundle
+from django_react_jollof.utils import FRONTEND_CHOICES, LOCKFILE_DIR
+from django_react_jollof.wheelhouse import interpreter_abi
+
+# Resolves the dependency tree into package-lock.json without installing it
+NPM_LOCK_CMD = [
+    "npm",
+    "install",
+    "--package-lock-only",
+    "--ignore-scripts",
+    "--no-audit",
+    "--no-fund",
+]
+
+
+# Resolves the backend dependencies into a JSON report without installing
+# them, run by the interpreter the lock is for
+PIP_LOCK_CMD = [
+    "-m",
+    "pip",
+    "install",
+    "--dry-run",
+    "--ignore-installed",
+    "--quiet",
+]
+
+
+# Lists the files published for every release of a distribution. Unlike
+# the per-release endpoint, PyPI mirrors serve it too.
+PYPI_PROJECT_URL = "https://pypi.org/pypi/{name}/json"
+
+# Environment marker variables that only depend on the interpreter. The lock
+# is only used by the Python it was resolved with, so pip settled them.
+INTERPRETER_MARKERS = re.compile(r"python|implementation|extra")
+
+
+def distribution_hash(item: Dict[str, Any]) -> str:
+    """Return the sha256 of the distribution a pip report entry resolved to."""
+    archive = item["download_info"]["archive_info"]
+    hashes = archive.get("hashes") or {}
+    if "sha256" in hashes:
+        return hashes["sha256"]
+    algorithm, _, digest = archive.get("hash", "").partition("=")
+    if algorithm != "sha256":
+        raise ValueError(f"pip reported no sha256 for {item['metadata']['name']}.")
+    return digest
+
+
+def published_hashes(name: str, version: str) -> Set[str]:
+    """
+    Return the sha256 of every file PyPI publishes for a release.
+
+    Those are the sdist and the wheels of every platform and Python, so the
+    lock verifies whichever file pip picks on the machine of a cook.
+
+    Raises:
+        OSError: If PyPI cannot be reached.
+        ValueError: If PyPI does not list the release.
+    """
+    url = PYPI_PROJECT_URL.format(name=name)
+    with urllib.request.urlopen(url, timeout=30) as response:
+        files = json.load(response)["releases"].get(version)
+    if not files:
+        raise ValueError(f"PyPI lists no files for {name} {version}.")
+    return {file["digests"]["sha256"] for file in files}
+
+
+def resolve(requirements: List[str], work: str, python: str) -> List[Dict[str, Any]]:
+    """
+    Resolve requirements for an interpreter with its pip.
+
+    Returns:
+        List[Dict[str, Any]]: The `install` entries of pip's report.
+
+    Raises:
+        subprocess.CalledProcessError: If pip cannot resolve them.
+    """
+    report_path = os.path.join(work, "report.json")
+    run_streaming(
+        [python] + PIP_LOCK_CMD + ["--report", report_path] + requirements,
+        label="lock backend",
+    )
+    with open(report_path, "r") as file:
+        return json.load(file)["install"]
+
+
+def skipped_requirements(
+    items: List[Dict[str, Any]], resolved: Set[str]
+) -> Dict[str, str]:
+    """
+    Return the dependencies pip left out for this platform.
+
+    A requirement such as Django's ``tzdata; sys_platform == "win32"`` is
+    not in the report of a Linux machine, but cooks on Windows need it.
+
+    Args:
+        items (List[Dict[str, Any]]): Entries of a pip report.
+        resolved (Set[str]): Normalized names already in the lock.
+
+    Returns:
+        Dict[str, str]: The environment marker of each left out requirement,
+        by requirement specifier. A requirement left out under several
+        markers is needed where any of them holds.
+    """
+    specs: Dict[str, str] = {}
+    markers: Dict[str, List[str]] = {}
+    for item in items:
+        for requirement in item["metadata"].get("requires_dist") or []:
+            spec, _, marker = (part.strip() for part in requirement.partition(";"))
+            name = normalize_name(re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", spec)[0])
+            if (
+                marker
+                and name not in resolved
+                and not INTERPRETER_MARKERS.search(marker)
+            ):
+                specs.setdefault(name, spec)
+                if marker not in markers.setdefault(name, []):
+                    markers[name].append(marker)
+
+    return {
+        specs[name]: (
+            found[0] if len(found) == 1 else " or ".join(f"({m})" for m in found)
+        )
+        for name, found in markers.items()
+    }
+
+
+def format_requirements_lock(
+    items: List[Dict[str, Any]],
+    abi: str,
+    markers: Dict[str, str],
+    hashes: Dict[str, Set[str]],
+) -> str:
+    """
+    Turn resolved distributions into a hash-pinned requirements file.
+
+    Args:
+        items (List[Dict[str, Any]]): Entries of pip reports.
+        abi (str): Interpreter ABI tag the dependencies were resolved for.
+        markers (Dict[str, str]): Environment markers by normalized name,
+            for the distributions only some platforms install.
+        hashes (Dict[str, Set[str]]): The sha256 of every published file by
+            normalized name, on top of the one pip resolved to.
+    """
+    lines = [
+        "# Backend dependencies pinned with the hashes of their published files.",
+        "# Generated by `django-react-jollof lock` from: "
+        + ", ".join(BACKEND_DEPENDENCIES),
+        f"{LOCK_PYTHON_HEADER}{python_tag(abi)}",
+    ]
+    for item in sorted(
+        items, key=lambda item: normalize_name(item["metadata"]["name"])
+    ):
+        name = normalize_name(item["metadata"]["name"])
+        pin = f"{name}=={item['metadata']['version']}"
+        if name in markers:
+            pin += f" ; {markers[name]}"
+        digests = {distribution_hash(item), *hashes.get(name, ())}
+        lines.append(
+            " \\\n".join([pin] + [f"    --hash=sha256:{d}" for d in sorted(digests)])
+        )
+    return "\n".join(lines) + "\n"
+
+
+def lock_backend(template_dir: str = TEMPLATE_ROOT, python: str = PYTHON) -> str:
+    """
+    Resolve the backend dependencies into the shipped lock for a Python.
+
+    pip resolves for the given interpreter. Dependencies that other
+    platforms need are resolved on top and keep their environment markers,
+    and every release is pinned with the hashes of all its files, so the
+    lock installs on any platform running the same Python version.
+
+    Args:
+        template_dir (str): Root of the templates the lock is written to.
+        python (str): Interpreter to resolve for.
+
+    Returns:
+        str: Path of the lock.
+
+    Raises:
+        subprocess.CalledProcessError: If pip cannot resolve the dependencies.
+        ValueError: If pip reports a distribution without a sha256.
+        OSError: If PyPI cannot be reached.
+    """
+    abi = interpreter_abi(python)
+    target = os.path.join(
+        template_dir, LOCKFILE_DIR, requirements_lock_name(python_tag(abi))
+    )
+    markers: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as work:
+        items = resolve(BACKEND_DEPENDENCIES, work, python)
+        pending = items
+        while pending:
+            resolved = {normalize_name(item["metadata"]["name"]) for item in items}
+            pending = []
+            for spec, marker in skipped_requirements(items, resolved).items():
+                for item in resolve([spec], work, python):
+                    name = normalize_name(item["metadata"]["name"])
+                    if name not in resolved:
+                        resolved.add(name)
+                        markers[name] = marker
+                        pending.append(item)
+            items = items + pending
+
+    hashes = {
+        normalize_name(item["metadata"]["name"]): published_hashes(
+            item["metadata"]["name"], item["metadata"]["version"]
+        )
+        for item in items
+    }
+    lock = format_requirements_lock(items, abi, markers, hashes)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "w") as file:
+        file.write(lock)
+    return target
+
+
+def lock_frontend(frontend: str, template_dir: str = TEMPLATE_ROOT) -> str:
+    """
+    Resolve the dependencies of a frontend framework into its shipped lockfile.
+
+    Args:
+        frontend (str): The frontend framework (e.g., "bootstrap", "material").
+        template_dir (str): Root of the templates the lockfile is written to.
+
+    Returns:
+        str: Path of the lockfile.
+
+    Raises:
+        subprocess.CalledProcessError: If npm cannot resolve the dependencies.
+    """
+    target = os.path.join(template_dir, LOCKFILE_DIR, lockfile_name(frontend))
+    with tempfile.TemporaryDirectory() as work:
+        with open(os.path.join(work, "package.json"), "w") as file:
+            file.write(render_package_json(template_dir, frontend))
+        run_streaming(NPM_LOCK_CMD, cwd=work, label=f"lock {frontend}")
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(work, LOCKFILE), target)
+    return target
+
+
+@click.command()
+@click.option(
+    "--frontend",
+    "frontends",
+    multiple=True,
+    type=click.Choice(list(FRONTEND_CHOICES.values())),
+    help="Refresh the lockfile of this framework; may be repeated.",
+)
+@click.option(
+    "--backend/--no-backend",
+    default=None,
+    help="Refresh the backend requirements lock. On unless --frontend is given.",
+)
+@click.option(
+    "--python",
+    "pythons",
+    multiple=True,
+    default=[PYTHON],
+    show_default=True,
+    help="Interpreter to lock the backend for; may be repeated, once per "
+    "supported Python version.",
+)
+def lock(
+    frontends: Sequence[str], backend: Optional[bool], pythons: Sequence[str]
+) -> None:
+    """
+    Regenerate the bundled dependency lockfiles.
+
+    A maintainer command: it resolves the current dependency ranges against
+    the package registries and writes the result into the source checkout,
+    to be committed. Cooks then install the backend with
+    `pip --require-hashes` and the frontend with `npm ci`. Lock the backend
+    once per supported Python version with `--python`. No frontend lockfile
+    ships yet; until one is committed, cooks of that framework resolve with
+    `npm install`.
+
+    Args:
+        frontends (Sequence[str]): Frameworks to lock; all by default.
+        backend (Optional[bool]): Lock the backend; by default only when no
+            framework is selected.
+        pythons (Sequence[str]): Interpreters to lock the backend for.
+    """
+    if load_bundle() is not None:
+        click.secho(
+            "Lockfiles can only be regenerated from a source checkout.", fg="red"
+        )
+        sys.exit(1)
+
+    jobs: List[Tuple[str, Callable[[], str]]] = []
+    if backend if backend is not None else not frontends:
+        jobs += [
+            (f"backend ({python})", partial(lock_backend, python=python))
+            for python in pythons
+        ]
+    jobs += [
+        (frontend, partial(lock_frontend, frontend))
+        for frontend in (
+            frontends if frontends or backend else FRONTEND_CHOICES.values()
+        )
+    ]
+
+    for job, run in jobs:
+        click.echo(f"Resolving the {job} dependencies...")
+        try:
+            path = run()
+        except (subprocess.CalledProcessError, ValueError, OSError) as e:
+            detail = e.stderr if isinstance(e, subprocess.CalledProcessError) else e
+            click.secho(f"Failed to lock the {job} dependencies: {detail}", fg="red")
+            sys.exit(1)
+        click.secho(f"Wrote {os.path.relpath(path)}.", fg="green")
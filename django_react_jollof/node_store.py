@@ -0,0 +1,106 @@
+import os
+import platform
+import shutil
+import sys
+from typing import Optional
+
+from django_react_jollof.cache import (
+    fingerprint,
+    get_cache_dir,
+    publish_dir,
+    staging_dir,
+)
+from django_react_jollof.fastcopy import Cloner
+
+LOCKFILE = "package-lock.json"
+
+
+def store_key(frontend_dir: str) -> str:
+    """
+    Return the store key for a frontend's final package.json and lockfile.
+
+    The platform is part of the key because some packages (e.g. esbuild)
+    ship native binaries.
+
+    Args:
+        frontend_dir (str): Directory containing package.json.
+    """
+    parts = ["node-modules-v1", sys.platform, platform.machine()]
+    for name in ("package.json", LOCKFILE):
+        try:
+            with open(os.path.join(frontend_dir, name), "r") as file:
+                parts.append(file.read())
+        except FileNotFoundError:
+            if name == "package.json":
+                raise
+    return fingerprint(parts)
+
+
+def store_path(key: str) -> str:
+    """Return the store directory for a key; it may not exist yet."""
+    return os.path.join(get_cache_dir("node_modules"), key)
+
+
+def is_stored(key: str) -> bool:
+    """Check whether the store holds node_modules for a key."""
+    return os.path.isdir(os.path.join(store_path(key), "node_modules"))
+
+
+def restore(key: str, frontend_dir: str) -> Optional[str]:
+    """
+    Recreate frontend/node_modules from the store.
+
+    Files are reflinked where the filesystem supports it and hardlinked
+    otherwise (falling back to a copy across devices), so a restore takes
+    almost no time and no extra disk. As with pnpm's store, hardlinked
+    packages share their inodes with the store and must not be edited in
+    place.
+
+    Args:
+        key (str): Store key from `store_key`.
+        frontend_dir (str): The project's frontend directory.
+
+    Returns:
+        Optional[str]: A summary of what was restored, or None on a store miss.
+    """
+    if not is_stored(key):
+        return None
+
+    entry = store_path(key)
+    target = os.path.join(frontend_dir, "node_modules")
+    shutil.rmtree(target, ignore_errors=True)
+
+    cloner = Cloner(link=True)
+    files, size = cloner.clone_tree(os.path.join(entry, "node_modules"), target)
+    lockfile = os.path.join(entry, LOCKFILE)
+    if os.path.isfile(lockfile):
+        shutil.copy2(lockfile, os.path.join(frontend_dir, LOCKFILE))
+
+    return f"{files} files ({size / 1e6:.1f} MB) via {cloner.methods[0][0]}"
+
+
+def save(key: str, frontend_dir: str) -> None:
+    """
+    Add a freshly installed node_modules to the store.
+
+    Args:
+        key (str): Store key from `store_key`.
+        frontend_dir (str): The project's frontend directory after `npm install`.
+    """
+    if is_stored(key):
+        return
+
+    entry = store_path(key)
+    staging = staging_dir(entry)
+    try:
+        Cloner(link=True).clone_tree(
+            os.path.join(frontend_dir, "node_modules"),
+            os.path.join(staging, "node_modules"),
+        )
+        lockfile = os.path.join(frontend_dir, LOCKFILE)
+        if os.path.isfile(lockfile):
+            shutil.copy2(lockfile, os.path.join(staging, LOCKFILE))
+        publish_dir(staging, entry)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
@@ -0,0 +1,226 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import click
+
+from django_react_jollof import timings
+from django_react_jollof.journal import Journal
+from django_react_jollof.timings import Phase
+
+
+class Task:
+    """A named step of the cook pipeline and the steps it has to wait for."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        deps: Iterable[str] = (),
+        fingerprint: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.deps: List[str] = list(deps)
+        self.fingerprint = fingerprint
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.phase: Optional[Phase] = None
+        self.skipped = False
+
+    @property
+    def duration(self) -> float:
+        """Wall time spent running the task, in seconds."""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class TaskGraph:
+    """
+    Run the steps of the cook pipeline as a dependency graph.
+
+    Every task starts as soon as all of its dependencies have finished, so
+    independent steps (e.g. ``pip install`` and ``npm install``) overlap.
+    The first failure stops new tasks from being scheduled; tasks that are
+    already running are allowed to finish before the failure is re-raised.
+    Each task runs inside a `timings.phase`, see `phases`.
+
+    With a journal, tasks that have a fingerprint are recorded when they
+    finish and skipped when the journal shows them done with the same
+    fingerprint.
+
+    Args:
+        max_workers (int): Number of tasks run at the same time.
+        journal (Optional[Journal]): Journal of the project being cooked.
+    """
+
+    def __init__(self, max_workers: int = 8, journal: Optional[Journal] = None) -> None:
+        self.max_workers = max_workers
+        self.journal = journal
+        self.tasks: Dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], None],
+        deps: Iterable[str] = (),
+        fingerprint: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        """
+        Register a task.
+
+        Args:
+            name (str): Unique task name, used for dependencies and reporting.
+            func (Callable[[], None]): The work to run.
+            deps (Iterable[str]): Names of tasks that must finish first.
+            fingerprint (Optional[Callable[[], Optional[str]]]): Returns a
+                hash of the task's inputs, or None while its outputs are
+                missing. Called before the task runs, to skip it, and after,
+                to record it.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Task '{name}' is already defined.")
+        self.tasks[name] = Task(name, func, deps, fingerprint)
+
+    def order(self) -> List[str]:
+        """
+        Return the task names in a valid execution order.
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle.
+        """
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(
+                        f"Task '{task.name}' depends on unknown task '{dep}'."
+                    )
+
+        ordered: List[str] = []
+        remaining = {name: set(task.deps) for name, task in self.tasks.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"Dependency cycle between tasks: {', '.join(sorted(remaining))}"
+                )
+            for name in ready:
+                ordered.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return ordered
+
+    def run(self) -> None:
+        """Execute every task, running independent tasks concurrently."""
+        self.order()  # Validate before starting anything
+
+        pending = {name: set(task.deps) for name, task in self.tasks.items()}
+        running: Dict[Future, Task] = {}
+        failure: Optional[BaseException] = None
+        origin = time.perf_counter()
+
+        def execute(task: Task) -> None:
+            task.started = time.perf_counter() - origin
+            try:
+                with timings.phase(task.name, task.started) as record:
+                    task.phase = record
+                    self.run_task(task)
+            finally:
+                task.finished = time.perf_counter() - origin
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if failure is None:
+                    for name in [n for n, deps in pending.items() if not deps]:
+                        del pending[name]
+                        task = self.tasks[name]
+                        running[executor.submit(execute, task)] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    for deps in pending.values():
+                        deps.discard(task.name)
+
+        if failure is not None:
+            raise failure
+
+    def run_task(self, task: Task) -> None:
+        """Run one task, consulting and updating the journal."""
+        journal = self.journal
+        if journal is None:
+            task.func()
+            return
+
+        if task.fingerprint:
+            fingerprint = task.fingerprint()
+            if fingerprint is not None and journal.is_done(task.name, fingerprint):
+                task.skipped = True
+                click.echo(f"Skipping {task.name}: already done.")
+                return
+
+        try:
+            task.func()
+        except SystemExit as e:
+            journal.record_failure(task.name, f"exited with status {e.code}")
+            raise
+        except Exception as e:
+            journal.record_failure(task.name, str(e) or type(e).__name__)
+            raise
+
+        # Taken again now that the task's outputs exist
+        fingerprint = task.fingerprint() if task.fingerprint else None
+        if fingerprint is not None:
+            journal.record(task.name, fingerprint)
+
+    def phases(self) -> List[Phase]:
+        """Return the resources used by every task that ran, in start order."""
+        return sorted(
+            (task.phase for task in self.tasks.values() if task.phase is not None),
+            key=lambda record: record.started,
+        )
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Return the chain of tasks that determined the total run time.
+
+        Starting from the task that finished last, walk back through the
+        dependency that finished last at each step.
+
+        Returns:
+            Tuple[List[str], float]: The task names in order and the total wall time.
+        """
+        finished = [t for t in self.tasks.values() if t.finished is not None]
+        if not finished:
+            return [], 0.0
+
+        task = max(finished, key=lambda t: t.finished)
+        total = task.finished
+        path = [task.name]
+        while task.deps:
+            task = max(
+                (self.tasks[dep] for dep in task.deps),
+                key=lambda t: t.finished or 0.0,
+            )
+            path.append(task.name)
+        path.reverse()
+        return path, total
+
+    def report_critical_path(self) -> None:
+        """Print the critical path with per-task timings."""
+        path, total = self.critical_path()
+        if not path:
+            return
+        steps = " -> ".join(
+            f"{name} ({self.tasks[name].duration:.1f}s)" for name in path
+        )
+        click.secho(f"Critical path ({total:.1f}s): {steps}", fg="cyan")
@@ -0,0 +1,75 @@
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+
+from django_react_jollof.template_manifest import PLACEHOLDER_PATTERN, read_template
+
+
+class UnknownPlaceholderError(KeyError):
+    """Raised when templates use placeholders the context does not define."""
+
+    def __init__(self, names: List[str]) -> None:
+        super().__init__(names)
+        self.names = names
+
+    def __str__(self) -> str:
+        return f"Unknown template placeholders: {', '.join(self.names)}"
+
+
+class Renderer:
+    """
+    Render `{{ NAME }}` placeholders from a fixed context.
+
+    All placeholders are matched by one compiled pattern, so every template
+    is scanned once however many variables the context holds.
+
+    Args:
+        context (Dict[str, str]): Placeholder names and their values.
+    """
+
+    def __init__(self, context: Dict[str, str]) -> None:
+        self.context = context
+
+    def check(self, names: Iterable[str]) -> None:
+        """
+        Make sure the context defines every placeholder a set of templates uses.
+
+        Args:
+            names (Iterable[str]): Placeholder names, e.g. from the template manifest.
+
+        Raises:
+            UnknownPlaceholderError: Listing every undefined placeholder at once.
+        """
+        unknown = sorted(set(names) - set(self.context))
+        if unknown:
+            raise UnknownPlaceholderError(unknown)
+
+    def render(self, text: str) -> str:
+        """
+        Substitute every placeholder in a template.
+
+        Raises:
+            UnknownPlaceholderError: If the template uses an undefined placeholder.
+        """
+        self.check(PLACEHOLDER_PATTERN.findall(text))
+        return PLACEHOLDER_PATTERN.sub(lambda match: self.context[match[1]], text)
+
+    def render_file(self, src: str, dst: str, mode: Optional[int] = None) -> None:
+        """
+        Render a template straight into its destination.
+
+        The destination is written once, with the template's permission bits.
+
+        Args:
+            src (str): Template path; read from the template bundle when it holds it.
+            dst (str): Output path.
+            mode (Optional[int]): Permission bits, defaults to those of `src`.
+        """
+        content = self.render(read_template(src).decode("utf-8"))
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        with open(dst, "w", encoding="utf-8") as file:
+            file.write(content)
+        if mode is None:
+            shutil.copymode(src, dst)
+        else:
+            os.chmod(dst, mode)
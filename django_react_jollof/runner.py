@@ -0,0 +1,220 @@
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Sequence, TextIO
+
+from django_react_jollof import timings
+from django_react_jollof.cache import get_cache_dir
+
+# Lines of recent output kept in memory for error messages
+TAIL_LINES = 40
+
+# Longest line kept for the tail and the status line; the log has everything
+MAX_LINE = 500
+
+# Logs older than this are removed when a new one is started
+LOG_RETENTION_SECONDS = 14 * 24 * 3600
+
+_board: Optional["StatusBoard"] = None
+
+
+class StatusBoard:
+    """
+    Live status lines at the bottom of the terminal, one per running step.
+
+    Other output is written above the board: the board is erased, the text
+    is written and the board is redrawn below it.
+
+    Args:
+        stream (TextIO): The terminal stream the board is drawn on.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.lines: Dict[str, str] = {}
+        self.drawn = 0
+        self.lock = threading.RLock()
+
+    def update(self, step: str, line: str) -> None:
+        """Show `line` as the latest output of `step`."""
+        with self.lock:
+            self.lines[step] = line
+            self.redraw()
+
+    def remove(self, step: str) -> None:
+        """Drop the status line of a finished step."""
+        with self.lock:
+            self.lines.pop(step, None)
+            self.redraw()
+
+    def write(self, stream: TextIO, text: str) -> None:
+        """Write other output above the board."""
+        with self.lock:
+            self.erase()
+            stream.write(text)
+            stream.flush()
+            if text.endswith("\n"):
+                self.draw()
+
+    def redraw(self) -> None:
+        self.erase()
+        self.draw()
+
+    def erase(self) -> None:
+        self.stream.write("\x1b[1A\x1b[2K" * self.drawn)
+        self.drawn = 0
+
+    def draw(self) -> None:
+        width = shutil.get_terminal_size().columns - 1
+        for step, line in self.lines.items():
+            self.stream.write(f"  ▸ {step}: {line}"[:width] + "\n")
+        self.drawn = len(self.lines)
+        self.stream.flush()
+
+
+class _BoardStream(io.TextIOBase):
+    """A stdout/stderr stand-in that writes above the status board."""
+
+    def __init__(self, board: StatusBoard, stream: TextIO) -> None:
+        self.board = board
+        self.stream = stream
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return self.stream.encoding
+
+    @property
+    def errors(self) -> Optional[str]:  # type: ignore[override]
+        return self.stream.errors
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def write(self, text: str) -> int:
+        self.board.write(self.stream, text)
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+@contextmanager
+def live_status() -> Iterator[None]:
+    """
+    Show the progress of streaming commands while the block runs.
+
+    Only on a terminal; elsewhere (CI, batch cooks) output goes to the log
+    files alone.
+    """
+    global _board
+    if _board is not None or not sys.stdout.isatty():
+        yield
+        return
+
+    saved = (sys.stdout, sys.stderr)
+    _board = StatusBoard(sys.stdout)
+    sys.stdout = _BoardStream(_board, saved[0])
+    sys.stderr = _BoardStream(_board, saved[1])
+    try:
+        yield
+    finally:
+        with _board.lock:
+            _board.lines.clear()
+            _board.redraw()
+        sys.stdout, sys.stderr = saved
+        _board = None
+
+
+def log_path(label: str) -> str:
+    """Return a new log file path for a command, pruning old logs."""
+    directory = get_cache_dir("logs")
+    now = time.time()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > LOG_RETENTION_SECONDS:
+                    os.remove(entry.path)
+            except OSError:
+                pass  # Removed by a concurrent cook
+
+    slug = re.sub(r"[^a-z0-9]+", "-", label.lower()).strip("-") or "command"
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    return os.path.join(directory, f"{slug}-{stamp}-{os.getpid()}.log")
+
+
+def run_streaming(
+    command: Sequence[str], cwd: Optional[str] = None, label: Optional[str] = None
+) -> str:
+    """
+    Run a command, streaming its output instead of buffering it.
+
+    stdout and stderr are read line by line as the command runs. Every
+    line goes to a log file; the latest one is shown on the live status
+    board, and only the last `TAIL_LINES` lines are kept in memory.
+
+    Args:
+        command (Sequence[str]): The command to run.
+        cwd (Optional[str]): Working directory of the command.
+        label (Optional[str]): Name shown on the status board; defaults to
+            the current timings phase.
+
+    Returns:
+        str: Path of the log file.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails. Its `stderr`
+            holds the tail of the output and the path of the log.
+    """
+    phase = timings.current()
+    label = label or (phase.name if phase else os.path.basename(command[0]))
+    path = log_path(label)
+    tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    board = _board
+
+    with open(path, "wb") as log:
+        log.write(f"$ {' '.join(command)}\n".encode())
+        log.flush()
+        process = subprocess.Popen(
+            command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        try:
+            assert process.stdout is not None
+            with process.stdout:
+                while True:
+                    raw = process.stdout.readline(64 * 1024)
+                    if not raw:
+                        break
+                    log.write(raw)
+                    # Progress bars redraw with \r; the last frame is current
+                    text = raw.decode("utf-8", "replace").rstrip().split("\r")[-1]
+                    if text:
+                        tail.append(text[:MAX_LINE])
+                        if board is not None:
+                            board.update(label, text[:MAX_LINE])
+            returncode = timings.wait(process)
+        except BaseException:
+            process.kill()
+            timings.wait(process)
+            raise
+        finally:
+            if board is not None:
+                board.remove(label)
+
+    if returncode:
+        raise subprocess.CalledProcessError(
+            returncode, command, None, "\n".join(tail) + f"\n(full log: {path})"
+        )
+    return path
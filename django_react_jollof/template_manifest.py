@@ -0,0 +1,303 @@
+# Index of the bundled templates, written into the package at build time.
+# setup.py loads this module by path, so it only uses the standard library.
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import re
+import stat
+import sys
+from functools import lru_cache
+from importlib import resources
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+
+# Installed packages ship every template packed into this one file, next to
+# this module: the magic, the length of the JSON index as 8 little-endian
+# bytes, the index and then the contents of every file back to back.
+PACKAGE = "django_react_jollof"
+BUNDLE_FILE = "templates.bundle"
+BUNDLE_MAGIC = b"JOLLOFB1"
+
+# Template variables look like {{ PROJECT_NAME }}; JSX objects such as
+# style={{ color: "red" }} never match because names are upper case.
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ ?([A-Z][A-Z0-9_]*) ?\}\}")
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Build artefacts that must never end up in a generated project
+IGNORED_DIRS = {"__pycache__"}
+IGNORED_SUFFIXES = (".pyc",)
+
+
+class ManifestEntry(NamedTuple):
+    """One template file, with its path relative to the manifest root."""
+
+    path: str
+    size: int
+    sha256: str
+    mode: int
+    placeholders: Tuple[str, ...] = ()
+
+
+def find_placeholders(content: bytes) -> Tuple[str, ...]:
+    """Return the sorted placeholder names used in a template's contents."""
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return ()  # Binary files are copied verbatim
+    return tuple(sorted(set(PLACEHOLDER_PATTERN.findall(text))))
+
+
+def index_file(path: str, relative: str) -> ManifestEntry:
+    """Build the manifest entry of one file, recorded under `relative`."""
+    with open(path, "rb") as file:
+        content = file.read()
+    info = os.stat(path)
+    return ManifestEntry(
+        relative,
+        info.st_size,
+        hashlib.sha256(content).hexdigest(),
+        stat.S_IMODE(info.st_mode),
+        find_placeholders(content),
+    )
+
+
+def scan(root: str) -> List[ManifestEntry]:
+    """
+    Index every template file below a directory.
+
+    Args:
+        root (str): The template directory.
+
+    Returns:
+        List[ManifestEntry]: The files, sorted by path.
+    """
+    entries = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [name for name in dirs if name not in IGNORED_DIRS]
+        for name in files:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            if relative == MANIFEST_FILE or name.endswith(IGNORED_SUFFIXES):
+                continue
+
+            entries.append(index_file(path, relative))
+    return sorted(entries)
+
+
+def write_manifest(root: str) -> str:
+    """
+    Write the manifest of a template directory into it.
+
+    Args:
+        root (str): The template directory.
+
+    Returns:
+        str: Path of the manifest file.
+    """
+    manifest_path = os.path.join(root, MANIFEST_FILE)
+    manifest: Dict = {
+        "version": MANIFEST_VERSION,
+        "files": [entry._asdict() for entry in scan(root)],
+    }
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file, indent=1)
+    return manifest_path
+
+
+class TemplateBundle:
+    """
+    Every template packed into one buffer, indexed by manifest entries.
+
+    Args:
+        data (Any): The bundle file as bytes or a memory map.
+
+    Raises:
+        ValueError: If `data` is not a bundle of this manifest version.
+    """
+
+    def __init__(self, data: Any) -> None:
+        header = len(BUNDLE_MAGIC) + 8
+        if bytes(data[: len(BUNDLE_MAGIC)]) != BUNDLE_MAGIC:
+            raise ValueError("Not a template bundle.")
+        length = int.from_bytes(data[len(BUNDLE_MAGIC) : header], "little")
+        index = json.loads(bytes(data[header : header + length]))
+        if index.get("version") != MANIFEST_VERSION:
+            raise ValueError("Template bundle of another version.")
+
+        self.data = memoryview(data)
+        self.entries: List[ManifestEntry] = []
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        start = header + length
+        for item in index["files"]:
+            offset = item.pop("offset")
+            entry = ManifestEntry(
+                **dict(item, placeholders=tuple(item["placeholders"]))
+            )
+            self.entries.append(entry)
+            self.spans[entry.path] = (start + offset, start + offset + entry.size)
+
+    def read(self, path: str) -> Optional[memoryview]:
+        """Return the contents of a packed template, without copying them."""
+        span = self.spans.get(path)
+        if span is None:
+            return None
+        return self.data[span[0] : span[1]]
+
+
+def write_bundle(root: str, path: str) -> str:
+    """
+    Pack every template below a directory into one bundle file.
+
+    Args:
+        root (str): The template directory.
+        path (str): The bundle file to write.
+
+    Returns:
+        str: `path`.
+    """
+    entries = scan(root)
+    files = []
+    offset = 0
+    for entry in entries:
+        files.append(dict(entry._asdict(), offset=offset))
+        offset += entry.size
+    index = json.dumps({"version": MANIFEST_VERSION, "files": files}).encode()
+
+    with open(path, "wb") as bundle:
+        bundle.write(BUNDLE_MAGIC + len(index).to_bytes(8, "little") + index)
+        for entry in entries:
+            with open(os.path.join(root, *entry.path.split("/")), "rb") as file:
+                bundle.write(file.read())
+    return path
+
+
+@lru_cache(maxsize=None)
+def load_bundle() -> Optional[TemplateBundle]:
+    """
+    Return the template bundle shipped with the package.
+
+    The bundle is found through `importlib.resources`, so it also loads
+    from a zipapp or a zipimported install. On disk it is memory-mapped;
+    otherwise it is read in one go.
+
+    Returns:
+        Optional[TemplateBundle]: None in a source checkout, where the
+        loose template files are used.
+    """
+    try:
+        resource = resources.files(PACKAGE).joinpath(BUNDLE_FILE)
+        if not resource.is_file():
+            return None
+        if isinstance(resource, pathlib.Path):
+            with open(resource, "rb") as file:
+                return TemplateBundle(
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        return TemplateBundle(resource.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def bundled(path: str) -> Optional[memoryview]:
+    """Return the contents of a template from the bundle, if it holds it."""
+    bundle = load_bundle()
+    if bundle is None:
+        return None
+    relative = os.path.relpath(os.path.abspath(path), TEMPLATE_ROOT)
+    return bundle.read(relative.replace(os.sep, "/"))
+
+
+def read_template(path: str) -> bytes:
+    """Return the contents of a template, from the bundle when possible."""
+    data = bundled(path)
+    if data is not None:
+        return bytes(data)
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@lru_cache(maxsize=None)
+def load_manifest(root: str) -> List[ManifestEntry]:
+    """
+    Return the entries of a template directory.
+
+    The bundled templates are indexed by the bundle, other directories by
+    their manifest when present; otherwise the directory is scanned.
+
+    Args:
+        root (str): The template directory.
+    """
+    bundle = load_bundle() if root == TEMPLATE_ROOT else None
+    if bundle is not None:
+        return bundle.entries
+
+    try:
+        with open(os.path.join(root, MANIFEST_FILE), "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return scan(root)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return scan(root)
+    return [
+        ManifestEntry(**dict(entry, placeholders=tuple(entry["placeholders"])))
+        for entry in manifest["files"]
+    ]
+
+
+@lru_cache(maxsize=None)
+def _index(root: str) -> Dict[str, ManifestEntry]:
+    return {entry.path: entry for entry in load_manifest(root)}
+
+
+def describe(path: str) -> ManifestEntry:
+    """
+    Return the manifest entry of a single template file.
+
+    Args:
+        path (str): Path of the template.
+
+    Returns:
+        ManifestEntry: The entry, with `path` relative to its directory.
+    """
+    path = os.path.abspath(path)
+    name = os.path.basename(path)
+    relative = os.path.relpath(path, TEMPLATE_ROOT).replace(os.sep, "/")
+    entry = _index(TEMPLATE_ROOT).get(relative)
+    if entry is None:  # Not a bundled template
+        return index_file(path, name)
+    return entry._replace(path=name)
+
+
+def entries_for(src: str) -> List[ManifestEntry]:
+    """
+    Return the template files below `src`, relative to `src`.
+
+    Directories inside the bundled templates are served from the package
+    manifest; any other directory is scanned.
+
+    Args:
+        src (str): A template directory.
+    """
+    src = os.path.abspath(src)
+    if os.path.commonpath([src, TEMPLATE_ROOT]) != TEMPLATE_ROOT:
+        return scan(src)
+
+    prefix = os.path.relpath(src, TEMPLATE_ROOT).replace(os.sep, "/") + "/"
+    if prefix == "./":
+        return list(load_manifest(TEMPLATE_ROOT))
+    return [
+        entry._replace(path=entry.path[len(prefix) :])
+        for entry in load_manifest(TEMPLATE_ROOT)
+        if entry.path.startswith(prefix)
+    ]
+
+
+if __name__ == "__main__":
+    print(write_manifest(sys.argv[1] if len(sys.argv) > 1 else TEMPLATE_ROOT))
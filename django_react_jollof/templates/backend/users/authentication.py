@@ -0,0 +1,76 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from users.tokens import ROLE_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """
+    The user described by a verified access token.
+
+    Built from the token's claims instead of the `User` row: `id`,
+    `is_staff` and `is_superuser` as in `TokenUser`, plus the `role` minted
+    by `RoleRefreshToken`.
+    """
+
+    @property
+    def role(self):
+        return self.token.get(ROLE_CLAIM)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates requests from the access token alone, without a database query.
+
+    `request.user` is a `ClaimsUser`, not a `User` instance. Use it for
+    views that only need to know who the caller is and what role they have;
+    views that read or change the user's data need `JWTAuthentication`.
+    """
+
+    def get_user(self, validated_token):
+        super().get_user(validated_token)  # Rejects tokens without a user id
+        return ClaimsUser(validated_token)
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates requests like `JWTAuthentication`, loading the user's
+    profile in the same query.
+
+    `request.user` is a `User` whose `profile` is already fetched, so role
+    checks on it cost no further query.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = (
+            self.user_model.objects.select_related("profile")
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
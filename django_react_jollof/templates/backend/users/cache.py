@@ -0,0 +1,75 @@
+import time
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from users.serializers import UserSerializer
+
+# Serialized profiles are dropped, and their versions moved forward, by the
+# signals in users/signals.py when their user or profile changes. The
+# timeout bounds how long another process's local-memory cache, or a change
+# made with `QuerySet.update()`, which sends no signal, can serve a stale
+# profile or ETag.
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+
+def profile_cache_key(user_id):
+    return f"users:profile:{user_id}"
+
+
+def profile_version_key(user_id):
+    return f"users:profile-version:{user_id}"
+
+
+def profile_version(user_id):
+    """
+    Return the version of a user's profile, a nanosecond timestamp.
+
+    The version moves forward whenever the profile is invalidated. When it
+    expires or is evicted, a new one starts at the current time, after
+    every version handed out before, so an old ETag cannot match it.
+    """
+    key = profile_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, PROFILE_CACHE_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def profile_etag(request, *args, **kwargs):
+    """Return the ETag of the requesting user's profile, without reading it."""
+    user_id = request.user.id
+    return f"profile-{user_id}-{profile_version(user_id)}"
+
+
+def profile_last_modified(request, *args, **kwargs):
+    """Return when the requesting user's profile last changed, roughly."""
+    version = profile_version(request.user.id)
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+def get_profile(user_id):
+    """
+    Return the serialized profile of an active user, cached per user.
+
+    Raises:
+        User.DoesNotExist: If there is no such active user.
+    """
+    key = profile_cache_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        user = User.objects.select_related("profile").get(pk=user_id, is_active=True)
+        data = dict(UserSerializer(user).data)
+        cache.set(key, data, PROFILE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_profile(user_id):
+    """Drop the cached profile of a user and move its version forward."""
+    cache.delete(profile_cache_key(user_id))
+    key = profile_version_key(user_id)
+    version = max(time.time_ns(), cache.get(key, 0) + 1)
+    cache.set(key, version, PROFILE_CACHE_TIMEOUT)
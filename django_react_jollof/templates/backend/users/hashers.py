@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    make_password,
+    verify_password,
+)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id sized for a web server: 19 MiB and two passes on one lane.
+
+    Django's defaults take 100 MiB on eight lanes per hash, so a burst of
+    logins takes all of the memory and every core at once. With one lane a
+    hash keeps to one core, and `hash_pool` bounds how many run together.
+
+    The hashes keep the "argon2" algorithm name, so a change to these costs
+    rehashes each password at its user's next login.
+    """
+
+    time_cost = 2
+    memory_cost = 19 * 1024  # KiB
+    parallelism = 1
+
+
+@lru_cache(maxsize=None)
+def hash_pool():
+    """
+    Return the threads that hash passwords for the async login view.
+
+    The hashers release the GIL while hashing, so each of the
+    PASSWORD_HASH_WORKERS threads keeps a core busy. Logins beyond that
+    wait for a thread instead of overloading the CPU.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        thread_name_prefix="password-hash",
+    )
+
+
+async def acheck_password(user, password):
+    """
+    Check a user's password on `hash_pool`, without blocking the event loop.
+
+    Like `User.acheck_password`, a correct password hashed by another
+    hasher or with other parameters is rehashed and saved. Without a user,
+    a password is hashed anyway, so an unknown username takes as long as a
+    wrong password.
+    """
+    loop = asyncio.get_running_loop()
+    if user is None:
+        await loop.run_in_executor(hash_pool(), make_password, password)
+        return False
+
+    is_correct, must_update = await loop.run_in_executor(
+        hash_pool(), verify_password, password, user.password
+    )
+    if is_correct and must_update:
+        user.password = await loop.run_in_executor(hash_pool(), make_password, password)
+        await user.asave(update_fields=["password"])
+    return is_correct
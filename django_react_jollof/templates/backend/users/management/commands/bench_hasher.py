@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+PASSWORD = "correct horse battery staple"
+
+
+class Command(BaseCommand):
+    help = "Measure the password hashes per second, per core, of the configured hasher."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=3.0,
+            help="How long each measurement hashes for (default: 3).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PASSWORD_HASH_WORKERS,
+            help="Threads hashing at once (default: PASSWORD_HASH_WORKERS).",
+        )
+
+    def handle(self, *args, seconds, workers, **options):
+        hasher = get_hasher()
+        summary = hasher.safe_summary(hasher.encode(PASSWORD, hasher.salt()))
+        parameters = ", ".join(
+            f"{name} {value}"
+            for name, value in summary.items()
+            if name not in ("algorithm", "salt", "hash")
+        )
+        self.stdout.write(f"{hasher.algorithm}: {parameters}")
+
+        cores = min(workers, os.cpu_count() or 1)
+        for threads in sorted({1, workers}):
+            rate = self.measure(hasher, threads, seconds)
+            per_core = rate / min(threads, cores)
+            self.stdout.write(
+                f"{threads} thread(s): {rate:.1f} hashes/s, "
+                f"{per_core:.1f} hashes/s per core, "
+                f"{1000 / per_core:.1f} ms per hash"
+            )
+
+    def measure(self, hasher, threads, seconds):
+        """Return the hashes per second of `threads` threads hashing at once."""
+        counts = [0] * threads
+        deadline = time.perf_counter() + seconds
+
+        def work(index):
+            while True:
+                hasher.encode(PASSWORD, hasher.salt())
+                counts[index] += 1
+                if time.perf_counter() >= deadline:
+                    return
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        return sum(counts) / (time.perf_counter() - started)
@@ -11,3 +11,14 @@ class Profile(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.role}"
+
+
+def get_role(user):
+    """
+    Return the role of a user, or None if the user has no profile.
+
+    Users created through `save()` get a profile from users/signals.py, but
+    not those from `bulk_create`, raw fixtures or rows older than this app.
+    """
+    profile = getattr(user, "profile", None)
+    return profile.role if profile is not None else None
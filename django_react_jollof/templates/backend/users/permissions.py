@@ -1,5 +1,8 @@
 from rest_framework.permissions import BasePermission
 
+from users.models import get_role
+from users.tokens import ROLE_CLAIM, STAFF_CLAIM
+
 
 class IsAdmin(BasePermission):
     """
@@ -7,11 +10,7 @@ class IsAdmin(BasePermission):
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and hasattr(request.user, "profile")
-            and request.user.profile.role == "admin"
-        )
+        return request.user.is_authenticated and get_role(request.user) == "admin"
 
 
 class IsUser(BasePermission):
@@ -20,8 +19,45 @@ class IsUser(BasePermission):
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and hasattr(request.user, "profile")
-            and request.user.profile.role == "user"
-        )
+        return request.user.is_authenticated and get_role(request.user) == "user"
+
+
+class HasRoleClaim(BasePermission):
+    """
+    Allows access only to tokens whose role claim is `role`.
+
+    Reads the verified token in `request.auth` and never the database.
+    Requests authenticated without a token, e.g. by session, are denied.
+    """
+
+    role = None
+
+    def has_permission(self, request, view):
+        token = request.auth
+        return token is not None and token.get(ROLE_CLAIM) == self.role
+
+
+class IsAdminClaim(HasRoleClaim):
+    """
+    Allows access only to admin users, from their token.
+    """
+
+    role = "admin"
+
+
+class IsUserClaim(HasRoleClaim):
+    """
+    Allows access only to regular users, from their token.
+    """
+
+    role = "user"
+
+
+class IsStaffClaim(BasePermission):
+    """
+    Allows access only to staff users, from their token.
+    """
+
+    def has_permission(self, request, view):
+        token = request.auth
+        return token is not None and token.get(STAFF_CLAIM) is True
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.cache import invalidate_profile
+from users.models import Profile
+
+
+@receiver(post_save, sender=User)
+def create_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Give every user created through `save()` a profile.
+
+    Superusers start as admins and everyone else as regular users. Fixtures
+    (`raw`) bring their own profiles.
+    """
+    if created and not raw:
+        Profile.objects.create(
+            user=instance, role="admin" if instance.is_superuser else "user"
+        )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    """Drop the cached profile of a changed or deleted user."""
+    invalidate_profile(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_of_profile(sender, instance, **kwargs):
+    """Drop the cached profile when the profile itself changes."""
+    invalidate_profile(instance.user_id)
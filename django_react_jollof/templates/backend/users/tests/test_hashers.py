@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from users.hashers import acheck_password
+
+HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+
+@override_settings(PASSWORD_HASHERS=HASHERS)
+class AsyncPasswordCheckTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="password")
+
+    async def test_check_password(self):
+        self.assertTrue(await acheck_password(self.user, "password"))
+        self.assertFalse(await acheck_password(self.user, "wrongpassword"))
+        self.assertFalse(await acheck_password(None, "password"))
+
+    async def test_rehash_on_login(self):
+        self.user.password = make_password("password", hasher="md5")
+        await self.user.asave()
+
+        self.assertTrue(await acheck_password(self.user, "password"))
+
+        await self.user.arefresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(await acheck_password(self.user, "password"))
+
+    async def test_async_login_view(self):
+        response = await self.async_client.post(
+            reverse("login-async"),
+            {"username": "user", "password": "password"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.json())
+
+        response = await self.async_client.post(
+            reverse("login-async"),
+            {"username": "user", "password": "wrongpassword"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = await self.async_client.post(
+            reverse("login-async"), "[]", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BenchHasherCommandTest(TestCase):
+    @override_settings(PASSWORD_HASHERS=HASHERS)
+    def test_bench_hasher(self):
+        out = StringIO()
+        call_command("bench_hasher", seconds=0.01, workers=2, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("pbkdf2_sha256: iterations", output)
+        self.assertIn("1 thread(s):", output)
+        self.assertIn("2 thread(s):", output)
+        self.assertIn("hashes/s per core", output)
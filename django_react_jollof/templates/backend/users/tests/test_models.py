@@ -6,7 +6,7 @@ from users.models import Profile
 class ProfileModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username="testuser", password="password")
-        self.profile = Profile.objects.create(user=self.user, role="user")
+        self.profile = self.user.profile
 
     def test_profile_creation(self):
         self.assertEqual(self.profile.user.username, "testuser")
@@ -14,3 +14,12 @@ class ProfileModelTest(TestCase):
 
     def test_profile_str(self):
         self.assertEqual(str(self.profile), "testuser - user")
+
+    def test_profile_created_once(self):
+        self.user.email = "testuser@example.com"
+        self.user.save()
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+
+    def test_superuser_profile_is_admin(self):
+        admin = User.objects.create_superuser(username="root", password="password")
+        self.assertEqual(Profile.objects.get(user=admin).role, "admin")
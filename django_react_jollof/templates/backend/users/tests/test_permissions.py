@@ -1,7 +1,15 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
-from users.models import Profile
-from users.permissions import IsAdmin, IsUser
+from rest_framework.test import APIRequestFactory
+from users.authentication import ProfileJWTAuthentication
+from users.permissions import (
+    IsAdmin,
+    IsAdminClaim,
+    IsStaffClaim,
+    IsUser,
+    IsUserClaim,
+)
+from users.tokens import RoleRefreshToken
 
 
 class PermissionTest(TestCase):
@@ -9,12 +17,12 @@ class PermissionTest(TestCase):
         self.admin_user = User.objects.create_user(
             username="admin", password="password"
         )
-        Profile.objects.create(user=self.admin_user, role="admin")
+        self.admin_user.profile.role = "admin"
+        self.admin_user.profile.save()
 
         self.regular_user = User.objects.create_user(
             username="user", password="password"
         )
-        Profile.objects.create(user=self.regular_user, role="user")
 
     def test_is_admin_permission(self):
         request = self.client.get("/admin/")
@@ -31,3 +39,76 @@ class PermissionTest(TestCase):
 
         request.user = self.admin_user
         self.assertFalse(IsUser().has_permission(request, None))
+
+    def test_user_without_profile_is_denied(self):
+        # bulk_create skips the signal that creates profiles
+        User.objects.bulk_create([User(username="bulk")])
+        request = APIRequestFactory().get("/")
+        request.user = User.objects.get(username="bulk")
+
+        self.assertFalse(IsAdmin().has_permission(request, None))
+        self.assertFalse(IsUser().has_permission(request, None))
+
+    def test_role_check_uses_loaded_profile(self):
+        token = RoleRefreshToken.for_user(self.admin_user).access_token
+        request = APIRequestFactory().get("/")
+        request.user = ProfileJWTAuthentication().get_user(token)
+        with self.assertNumQueries(0):
+            self.assertTrue(IsAdmin().has_permission(request, None))
+            self.assertFalse(IsUser().has_permission(request, None))
+
+
+class ClaimPermissionTest(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(
+            username="admin", password="password", is_staff=True
+        )
+        self.admin_user.profile.role = "admin"
+        self.admin_user.profile.save()
+
+        self.regular_user = User.objects.create_user(
+            username="user", password="password"
+        )
+
+    def request_with_token(self, user):
+        request = APIRequestFactory().get("/")
+        request.auth = RoleRefreshToken.for_user(user).access_token
+        return request
+
+    def test_role_claims(self):
+        admin = self.request_with_token(self.admin_user)
+        user = self.request_with_token(self.regular_user)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(IsAdminClaim().has_permission(admin, None))
+            self.assertFalse(IsAdminClaim().has_permission(user, None))
+            self.assertTrue(IsUserClaim().has_permission(user, None))
+            self.assertFalse(IsUserClaim().has_permission(admin, None))
+
+    def test_staff_claim(self):
+        self.assertTrue(
+            IsStaffClaim().has_permission(
+                self.request_with_token(self.admin_user), None
+            )
+        )
+        self.assertFalse(
+            IsStaffClaim().has_permission(
+                self.request_with_token(self.regular_user), None
+            )
+        )
+
+    def test_user_without_profile_has_no_role(self):
+        User.objects.bulk_create([User(username="bulk")])
+        request = self.request_with_token(User.objects.get(username="bulk"))
+
+        self.assertIsNone(request.auth.get("role"))
+        self.assertFalse(IsAdminClaim().has_permission(request, None))
+        self.assertFalse(IsUserClaim().has_permission(request, None))
+
+    def test_no_token(self):
+        request = APIRequestFactory().get("/")
+        request.auth = None
+
+        self.assertFalse(IsAdminClaim().has_permission(request, None))
+        self.assertFalse(IsUserClaim().has_permission(request, None))
+        self.assertFalse(IsStaffClaim().has_permission(request, None))
@@ -1,24 +1,38 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from users.models import Profile
+from rest_framework_simplejwt.tokens import AccessToken
+from users.tokens import RoleRefreshToken
 
 
 class ViewTest(TestCase):
+    # Queries an authenticated request costs before the view runs: loading
+    # the user and profile, unless authorized from the token's claims
+    auth_queries = 1
+
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.admin_user = User.objects.create_user(
             username="admin", password="password"
         )
-        self.admin_profile = Profile.objects.create(user=self.admin_user, role="admin")
+        self.admin_profile = self.admin_user.profile
+        self.admin_profile.role = "admin"
+        self.admin_profile.save()
 
         self.user = User.objects.create_user(username="user", password="password")
-        self.user_profile = Profile.objects.create(user=self.user, role="user")
+        self.user_profile = self.user.profile
+
+    def authenticate(self, user):
+        token = RoleRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
 
     def test_register_view(self):
         response = self.client.post(
-            "/register/",
+            reverse("register"),
             {
                 "username": "newuser",
                 "email": "newuser@example.com",
@@ -30,40 +44,148 @@ class ViewTest(TestCase):
 
     def test_login_view(self):
         response = self.client.post(
-            "/login/",
+            reverse("login"),
             {"username": "user", "password": "password"},
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("access", response.data)
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["role"], "user")
+        self.assertFalse(token["is_staff"])
 
         response = self.client.post(
-            "/login/",
+            reverse("login"),
             {"username": "user", "password": "wrongpassword"},
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_profile_view(self):
         self.client.force_authenticate(user=self.user)
-        response = self.client.get("/profile/")
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "user")
+
+    def test_profile_view_is_cached(self):
+        self.authenticate(self.user)
+        with self.assertNumQueries(self.auth_queries + 1):
+            response = self.client.get(reverse("profile"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["username"], "user")
 
+        with self.assertNumQueries(self.auth_queries):
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["username"], "user")
+
+    def test_profile_cache_invalidation(self):
+        self.authenticate(self.user)
+        self.client.get(reverse("profile"))
+
+        self.user.email = "user@example.com"
+        self.user.save()
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["email"], "user@example.com")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_cache_invalidated_by_profile(self):
+        self.authenticate(self.user)
+        self.client.get(reverse("profile"))
+
+        self.user_profile.save()
+        with self.assertNumQueries(self.auth_queries + 1):
+            self.client.get(reverse("profile"))
+
+    def test_profile_view_conditional_get(self):
+        self.authenticate(self.user)
+        response = self.client.get(reverse("profile"))
+        etag = response["ETag"]
+        self.assertIn("Authorization", response["Vary"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        with self.assertNumQueries(self.auth_queries):
+            response = self.client.get(reverse("profile"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        self.user.email = "user@example.com"
+        self.user.save()
+        response = self.client.get(reverse("profile"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["email"], "user@example.com")
+
+    def test_profile_etag_is_per_user(self):
+        self.authenticate(self.user)
+        etag = self.client.get(reverse("profile"))["ETag"]
+
+        self.authenticate(self.admin_user)
+        response = self.client.get(reverse("profile"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "admin")
+
     def test_admin_only_view(self):
-        self.client.force_authenticate(user=self.admin_user)
-        response = self.client.get("/admin/")
+        self.authenticate(self.admin_user)
+        with self.assertNumQueries(self.auth_queries):
+            response = self.client.get(reverse("admin-only"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["message"], "Welcome, admin!")
 
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get("/admin/")
+        self.authenticate(self.user)
+        response = self.client.get(reverse("admin-only"))
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_user_only_view(self):
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get("/user/")
+        self.authenticate(self.user)
+        with self.assertNumQueries(self.auth_queries):
+            response = self.client.get(reverse("user-only"))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["message"], "Welcome, regular user!")
 
-        self.client.force_authenticate(user=self.admin_user)
-        response = self.client.get("/user/")
+        self.authenticate(self.admin_user)
+        response = self.client.get(reverse("user-only"))
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_role_views_need_a_token(self):
+        response = self.client.get(reverse("admin-only"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_applies_to_next_request(self):
+        self.authenticate(self.admin_user)
+        self.admin_profile.role = "user"
+        self.admin_profile.save()
+
+        response = self.client.get(reverse("admin-only"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivation_applies_to_next_request(self):
+        self.authenticate(self.user)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse("user-only"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(JWT_STATELESS_ROLES=True)
+class StatelessViewTest(ViewTest):
+    auth_queries = 0
+
+    def test_role_change_applies_to_next_request(self):
+        # The token keeps the role it was issued with until it expires
+        self.authenticate(self.admin_user)
+        self.admin_profile.role = "user"
+        self.admin_profile.save()
+
+        response = self.client.get(reverse("admin-only"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deactivation_applies_to_next_request(self):
+        self.authenticate(self.user)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse("user-only"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -2,6 +2,7 @@ from django.urls import include, path
 from users.views import (
     RegisterView,
     LoginView,
+    AsyncLoginView,
     ProfileView,
     AdminOnlyView,
     UserOnlyView,
@@ -13,5 +14,6 @@ urlpatterns = [
     path("user/", UserOnlyView.as_view(), name="user-only"),
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
+    path("login/async/", AsyncLoginView.as_view(), name="login-async"),
     path("profile/", ProfileView.as_view(), name="profile"),
 ]
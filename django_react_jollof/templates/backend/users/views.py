@@ -1,12 +1,26 @@
+import json
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from django.conf import settings
 from django.contrib.auth.models import User
-
-from users.serializers import UserSerializer, RegisterSerializer
-from users.permissions import IsAdmin, IsUser
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+
+from users.authentication import StatelessJWTAuthentication
+from users.cache import get_profile, profile_etag, profile_last_modified
+from users.hashers import acheck_password
+from users.serializers import RegisterSerializer
+from users.permissions import IsAdmin, IsAdminClaim, IsUser, IsUserClaim
+from users.tokens import RoleRefreshToken
 
 
 class RegisterView(APIView):
@@ -15,7 +29,7 @@ class RegisterView(APIView):
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            serializer.save()
             return Response({"message": "User registered successfully."})
         return Response(serializer.errors, status=400)
 
@@ -26,9 +40,9 @@ class LoginView(APIView):
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
-        user = User.objects.filter(username=username).first()
+        user = User.objects.select_related("profile").filter(username=username).first()
         if user and user.check_password(password):
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             return Response(
                 {
                     "refresh": str(refresh),
@@ -38,23 +52,99 @@ class LoginView(APIView):
         return Response({"error": "Invalid credentials"}, status=400)
 
 
-class ProfileView(APIView):
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncLoginView(View):
+    """
+    LoginView for ASGI servers.
+
+    The password is checked on the bounded thread pool of users/hashers.py,
+    so hashing never blocks the event loop and a burst of logins queues for
+    the pool instead of taking every core.
+    """
+
+    async def post(self, request):
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body)
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                return JsonResponse({"error": "Invalid JSON"}, status=400)
+        else:
+            data = request.POST
+
+        user = (
+            await User.objects.select_related("profile")
+            .filter(username=data.get("username"))
+            .afirst()
+        )
+        if await acheck_password(user, data.get("password")):
+            refresh = RoleRefreshToken.for_user(user)
+            return JsonResponse(
+                {
+                    "refresh": str(refresh),
+                    "access": str(refresh.access_token),
+                }
+            )
+        return JsonResponse({"error": "Invalid credentials"}, status=400)
+
+
+class ClaimsAuthMixin:
+    """
+    Authorizes from the access token's claims when `JWT_STATELESS_ROLES` is on.
+
+    By default the view authenticates against the `User` row, so a changed
+    role or a deactivated user applies from the next request. With the
+    setting on, it authenticates with `StatelessJWTAuthentication` and
+    checks `claims_permission_classes`, without a database query; a changed
+    role or a deactivated user then keeps access until the token expires.
+    """
+
+    # Replace permission_classes when authorizing from claims
+    claims_permission_classes = None
+
+    def stateless(self):
+        return getattr(settings, "JWT_STATELESS_ROLES", False)
+
+    def get_authenticators(self):
+        if self.stateless():
+            return [StatelessJWTAuthentication()]
+        return super().get_authenticators()
+
+    def get_permissions(self):
+        if self.stateless() and self.claims_permission_classes is not None:
+            return [permission() for permission in self.claims_permission_classes]
+        return super().get_permissions()
+
+
+class ProfileView(ClaimsAuthMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    # Answers If-None-Match with 304 from the profile's version alone,
+    # before the profile is read or serialized
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(vary_on_headers("Authorization"))
+    @method_decorator(
+        condition(etag_func=profile_etag, last_modified_func=profile_last_modified)
+    )
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        try:
+            return Response(get_profile(request.user.id))
+        except User.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
 
 
-class AdminOnlyView(APIView):
+class AdminOnlyView(ClaimsAuthMixin, APIView):
     permission_classes = [IsAdmin]
+    claims_permission_classes = [IsAdminClaim]
 
     def get(self, request):
         return Response({"message": "Welcome, admin!"})
 
 
-class UserOnlyView(APIView):
+class UserOnlyView(ClaimsAuthMixin, APIView):
     permission_classes = [IsUser]
+    claims_permission_classes = [IsUserClaim]
 
     def get(self, request):
         return Response({"message": "Welcome, regular user!"})
@@ -1,4 +1,4 @@
-import API from "../services/api";
+import API, { clearResponseCache } from "../services/api";
 
 /**
  * Log in the user and store the access token.
@@ -26,6 +26,7 @@ export const login = async (username, password, login) => {
 
 export const logout = async (logout) => {
     localStorage.removeItem("drjToken");
+    clearResponseCache();
     logout();
 };
 
@@ -4,6 +4,16 @@ const API = axios.create({
     baseURL: "http://127.0.0.1:8000/api/",
 });
 
+// Bodies of GET responses that came with an ETag, by URL. Repeat requests
+// send the ETag back and reuse the stored, already parsed body when the
+// server answers 304 Not Modified.
+const responseCache = new Map();
+
+/**
+ * Forget every stored response, e.g. when the user logs out.
+ */
+export const clearResponseCache = () => responseCache.clear();
+
 // Request interceptor
 API.interceptors.request.use(
     (config) => {
@@ -21,6 +31,15 @@ API.interceptors.request.use(
             }
         }
 
+        // Revalidate stored responses instead of downloading them again
+        const cached =
+            config.method === "get" ? responseCache.get(config.url) : undefined;
+        if (cached) {
+            config.headers["If-None-Match"] = cached.etag;
+            config.validateStatus = (status) =>
+                (status >= 200 && status < 300) || status === 304;
+        }
+
         return config;
     },
     (error) => {
@@ -31,13 +50,32 @@ API.interceptors.request.use(
 
 // Response interceptor
 API.interceptors.response.use(
-    (response) => response, // Pass successful responses
+    (response) => {
+        if (response.config.method !== "get") {
+            return response;
+        }
+        const url = response.config.url;
+
+        // Unchanged: hand back the stored body without parsing anything
+        if (response.status === 304 && responseCache.has(url)) {
+            return { ...response, status: 200, data: responseCache.get(url).data };
+        }
+
+        const etag = response.headers.etag;
+        if (etag) {
+            responseCache.set(url, { etag, data: response.data });
+        } else {
+            responseCache.delete(url);
+        }
+        return response;
+    },
     (error) => {
         const status = error.response?.status;
 
         if (status === 401 || status === 403) {
-            // Remove token from localStorage if it exists
+            // Remove token from localStorage if it exists, and stored responses
             localStorage.removeItem("drjToken");
+            clearResponseCache();
 
             // Redirect the user to the login page
             window.location.href = "/login"; // Update this if your login page is different
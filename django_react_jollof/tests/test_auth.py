@@ -1,59 +1,28 @@
 import unittest
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 
 import click
 
-from django_react_jollof.auth import get_client_secrets, write_env_file
+from django_react_jollof.auth import format_env_file, get_client_secrets
 
 
 class TestAuthFunctions(unittest.TestCase):
 
-    @patch("builtins.open", new_callable=mock_open)
-    def test_write_env_file(self, mock_file):
-        # Sample secrets dictionary
+    def test_format_env_file(self):
         secrets = {
             "GOOGLE_CLIENT_ID": "fake-google-client-id",
             "GOOGLE_CLIENT_SECRET": "fake-google-client-secret",
         }
 
-        # Call the function to write the .env file
-        write_env_file(secrets)
-
-        # Assert file was opened correctly
-        mock_file.assert_called_once_with(".env", "w")
-
-        # Get the handle to the file
-        handle = mock_file()
-
-        # Get all write calls
-        write_calls = handle.write.call_args_list
-        print(f"Debug - Write calls made: {write_calls}")
-
-        # Convert the calls to actual strings that were written
-        actual_writes = [args[0][0] for args in write_calls]
-        print(f"Debug - Actual writes: {actual_writes}")
-
-        # Expected writes (in any order)
-        expected_writes = [
-            "GOOGLE_CLIENT_ID=fake-google-client-id\n",
-            "GOOGLE_CLIENT_SECRET=fake-google-client-secret\n",
-        ]
-
-        # Compare as sets to ignore order
         self.assertEqual(
-            set(expected_writes),
-            set(actual_writes),
-            f"\nExpected writes: {expected_writes}\nActual writes: {actual_writes}",
+            format_env_file(secrets),
+            "GOOGLE_CLIENT_ID=fake-google-client-id\n"
+            "GOOGLE_CLIENT_SECRET=fake-google-client-secret\n",
         )
 
-    @patch("builtins.open", new_callable=mock_open)
-    def test_write_env_file_empty_secrets(self, mock_file):
-        secrets = {}
-        write_env_file(secrets)
-
-        mock_file.assert_called_once_with(".env", "w")
-        handle = mock_file()
-        self.assertEqual(handle.write.call_count, 0)
+    def test_format_env_file_empty_secrets(self):
+        self.assertEqual(format_env_file({}), "")
+        self.assertEqual(format_env_file({"GOOGLE_CLIENT_ID": ""}), "")
 
     @patch("click.prompt")
     def test_get_client_secrets_google(self, mock_prompt):
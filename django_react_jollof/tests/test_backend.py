@@ -1,12 +1,29 @@
 import os
+import shutil
+import tempfile
 import unittest
-from unittest.mock import ANY, patch, mock_open, MagicMock, call
+from unittest.mock import patch, MagicMock
 import subprocess
 from django_react_jollof.backend import (
+    add_backend_files,
     run_subprocess_command,
-    modify_urls_py,
-    update_settings,
-    scaffold_backend,
+    add_backend_tasks,
+    build_base_env,
+    create_project_env,
+    environment_fingerprint,
+    migrate_database,
+    prepare_wheelhouse,
+    backend_requirements,
+    load_requirements_lock,
+    normalize_name,
+    parse_pins,
+    BACKEND_DEPENDENCIES,
+)
+from django_react_jollof.environments import env_python
+from django_react_jollof.tree import OutputTree
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
 )
 
 
@@ -17,150 +34,390 @@ class TestBackendFunctions(unittest.TestCase):
         self.success_msg = "Success"
         self.error_msg = "Error"
 
-    def test_run_subprocess_command_success(self):
+    @patch("django_react_jollof.backend.run_streaming")
+    def test_run_subprocess_command_success(self, mock_run_streaming):
         """Test successful subprocess command execution"""
-        mock_result = MagicMock()
-        mock_result.stdout = "Command output"
+        with patch("click.echo") as mock_echo:
+            run_subprocess_command(self.test_command, self.success_msg, self.error_msg)
+
+        mock_run_streaming.assert_called_once_with(self.test_command, cwd=None)
+        mock_echo.assert_called_once_with(self.success_msg)
+
+    @patch("django_react_jollof.backend.run_streaming")
+    def test_run_subprocess_command_failure(self, mock_run_streaming):
+        """Test subprocess command failure"""
+        mock_error = subprocess.CalledProcessError(1, self.test_command)
+        mock_error.stderr = "Error output\n(full log: /logs/test.log)"
+        mock_run_streaming.side_effect = mock_error
 
-        with patch("subprocess.run", return_value=mock_result) as mock_run:
-            with patch("click.echo") as mock_echo:
+        with patch("click.echo") as mock_echo:
+            with patch("sys.exit") as mock_exit:
                 run_subprocess_command(
                     self.test_command, self.success_msg, self.error_msg
                 )
 
-                mock_run.assert_called_once_with(
-                    self.test_command, check=True, text=True, capture_output=True
-                )
-                mock_echo.assert_has_calls(
-                    [call(self.success_msg), call("Command output")]
-                )
+        mock_echo.assert_called_once_with(
+            f"{self.error_msg}: Error output\n(full log: /logs/test.log)"
+        )
+        mock_exit.assert_called_once_with(1)
 
-    def test_run_subprocess_command_failure(self):
-        """Test subprocess command failure"""
-        mock_error = subprocess.CalledProcessError(1, self.test_command)
-        mock_error.stderr = "Error output"
-
-        with patch("subprocess.run", side_effect=mock_error) as mock_run:
-            with patch("click.echo") as mock_echo:
-                with patch("sys.exit") as mock_exit:
-                    run_subprocess_command(
-                        self.test_command, self.success_msg, self.error_msg
-                    )
-
-                    mock_echo.assert_called_once_with(f"{self.error_msg}: Error output")
-                    mock_exit.assert_called_once_with(1)
-
-    @patch("os.path.join", return_value="mocked_path/urls.py")
-    @patch("builtins.open", new_callable=mock_open)
-    def test_modify_urls_py_success(self, mock_open, mock_path_join):
-        """Test successful modification of urls.py"""
-        # Existing content in urls.py
-        mock_content = "Original content"
-
-        # Expected content to be written
-        expected_content = [
-            "from django.contrib import admin\n",
-            "from django.urls import path, include\n",
-            "\n",
-            "urlpatterns = [\n",
-            '    path("admin/", admin.site.urls),\n',
-            '    path("api/", include("users.urls")), # Added by django-react-jollof\n',
-            "]\n",
-        ]
+    def render_project(self, social_login, secrets=None, password_hasher="pbkdf2"):
+        """Write the backend files into a temporary directory."""
+        project_dir = os.path.join(tempfile.mkdtemp(), "project")
+        self.addCleanup(shutil.rmtree, os.path.dirname(project_dir))
+        tree = OutputTree()
+        add_backend_files(tree, TEMPLATE_DIR, social_login, secrets, password_hasher)
+        with patch("click.echo"):
+            tree.commit(project_dir)
+        return os.path.join(project_dir, "backend")
+
+    def read(self, *path):
+        with open(os.path.join(*path), "r") as file:
+            return file.read()
+
+    def render_for_python(self, abi):
+        """Render the project as the interpreter with this ABI would."""
+        load_requirements_lock.cache_clear()
+        self.addCleanup(load_requirements_lock.cache_clear)
+        with patch("django_react_jollof.backend.interpreter_abi", return_value=abi):
+            with patch("click.echo"):
+                return self.render_project("none")
 
-        # Mock the file read to return existing content
-        mock_open.return_value.read.return_value = mock_content
-        mock_open.return_value.readlines.return_value = mock_content.splitlines()
-
-        # Call the function
-        modify_urls_py("test_project")
-
-        # Verify open was called correctly
-        mock_open.assert_any_call("mocked_path/urls.py", "r")  # Reading the file
-        mock_open.assert_any_call("mocked_path/urls.py", "w")  # Writing the file
-
-        # Get the file handle for write operations
-        file_handle = mock_open()
-
-        # Verify write calls
-        file_handle.writelines.assert_called_once_with(expected_content)
-
-    def test_modify_urls_py_error(self):
-        """Test error handling in modify_urls_py"""
-        with patch("builtins.open", side_effect=Exception("Test error")):
-            with patch("click.echo") as mock_echo:
-                with self.assertRaises(Exception):
-                    modify_urls_py("test_dir")
-                    mock_echo.assert_called_with("Error modifying urls.py: Test error")
-
-    def test_update_settings_no_social_login(self):
-        """Test settings update without social login"""
-        with patch("os.path.isfile", return_value=True):
-            with patch("builtins.open", mock_open()) as mock_file:
-                with patch("click.echo") as mock_echo:
-                    update_settings("none")
-
-                    # Verify file was opened in append mode
-                    mock_file.assert_called_once_with("backend/settings.py", "a")
-
-                    # Verify content written
-                    handle = mock_file()
-                    self.assertTrue(handle.write.called)
-                    # Verify required content is in the writes
-                    written_content = "".join(
-                        call_args[0][0] for call_args in handle.write.call_args_list
-                    )
-                    self.assertIn("INSTALLED_APPS", written_content)
-                    self.assertNotIn("SOCIALACCOUNT_PROVIDERS", written_content)
-
-    @patch("os.chdir")
-    @patch("subprocess.run")
-    @patch("click.echo")
+    def test_add_backend_files(self):
+        """The project is generated with final urls.py and settings.py"""
+        backend_dir = self.render_for_python("cpython-311-linux-x86_64")
+
+        for path in [
+            "manage.py",
+            os.path.join("backend", "__init__.py"),
+            os.path.join("backend", "asgi.py"),
+            os.path.join("backend", "settings.py"),
+            os.path.join("backend", "urls.py"),
+            os.path.join("backend", "wsgi.py"),
+        ]:
+            content = self.read(backend_dir, path)
+            compile(content, path, "exec")  # Every file is valid Python
+
+        self.assertTrue(os.access(os.path.join(backend_dir, "manage.py"), os.X_OK))
+        self.assertTrue(os.path.isfile(os.path.join(backend_dir, "users", "views.py")))
+        self.assertFalse(os.path.exists(os.path.join(backend_dir, ".env")))
+        requirements = self.read(backend_dir, "requirements.txt")
+        self.assertIn("# Resolved for: cpython-311", requirements)
+        self.assertLessEqual(
+            {normalize_name(name) for name in BACKEND_DEPENDENCIES},
+            set(parse_pins(requirements)),
+        )
+        self.assertIn("--hash=sha256:", requirements)
+        self.assertIn(
+            'path("api/", include("users.urls"))',
+            self.read(backend_dir, "backend", "urls.py"),
+        )
+
+        settings = self.read(backend_dir, "backend", "settings.py")
+        self.assertIn('"corsheaders"', settings)
+        self.assertIn('"corsheaders.middleware.CorsMiddleware"', settings)
+        self.assertIn("REST_FRAMEWORK", settings)
+        self.assertIn('SECRET_KEY = "django-insecure-', settings)
+        self.assertNotIn("SOCIALACCOUNT_PROVIDERS", settings)
+
+    def test_add_backend_files_without_lock(self):
+        """A Python no lock ships for gets the bare dependency names"""
+        backend_dir = self.render_for_python("pypy-39-linux-x86_64")
+
+        self.assertEqual(
+            self.read(backend_dir, "requirements.txt").split("\n"),
+            BACKEND_DEPENDENCIES,
+        )
+
+    def test_add_backend_files_social_login(self):
+        """The provider settings and the client secrets are written"""
+        backend_dir = self.render_project("google", {"GOOGLE_CLIENT_ID": "test_id"})
+        settings = self.read(backend_dir, "backend", "settings.py")
+
+        namespace = {"__file__": "settings.py"}
+        exec(compile(settings, "settings.py", "exec"), namespace)
+        self.assertIn("google", namespace["SOCIALACCOUNT_PROVIDERS"])
+        self.assertEqual(
+            namespace["MIDDLEWARE"][0], "corsheaders.middleware.CorsMiddleware"
+        )
+        self.assertEqual(self.read(backend_dir, ".env"), "GOOGLE_CLIENT_ID=test_id\n")
+
+    def test_add_backend_files_password_hasher(self):
+        """The chosen profile hashes new passwords, the others still verify"""
+        backend_dir = self.render_project("none", password_hasher="argon2")
+        settings = self.read(backend_dir, "backend", "settings.py")
+
+        namespace = {"__file__": "settings.py"}
+        exec(compile(settings, "settings.py", "exec"), namespace)
+        hashers = namespace["PASSWORD_HASHERS"]
+        self.assertEqual(hashers[0], "users.hashers.TunedArgon2PasswordHasher")
+        self.assertIn("django.contrib.auth.hashers.PBKDF2PasswordHasher", hashers)
+        self.assertGreaterEqual(namespace["PASSWORD_HASH_WORKERS"], 1)
+
+    def test_add_backend_files_unique_secret_key(self):
+        """Every project gets its own secret key"""
+        first = self.read(self.render_project("none"), "backend", "settings.py")
+        second = self.read(self.render_project("none"), "backend", "settings.py")
+
+        self.assertNotEqual(first, second)
+
+    @patch("django_react_jollof.backend.build_wheelhouse")
+    @patch("django_react_jollof.backend.is_complete", return_value=True)
+    @patch("django_react_jollof.backend.interpreter_abi", return_value="cp-test")
+    def test_prepare_wheelhouse_cache_hit(
+        self, mock_abi, mock_is_complete, mock_build_wheelhouse
+    ):
+        """A complete wheelhouse is reused without touching the index"""
+        with patch("click.echo"):
+            prepare_wheelhouse()
+
+        mock_build_wheelhouse.assert_not_called()
+
+    @patch("django_react_jollof.backend.build_wheelhouse")
+    @patch("django_react_jollof.backend.is_complete", return_value=False)
+    @patch("django_react_jollof.backend.interpreter_abi", return_value="cp-test")
+    @patch("django_react_jollof.backend.wheelhouse_path", return_value="/cache/key")
+    def test_prepare_wheelhouse_cache_miss(
+        self, mock_path, mock_abi, mock_is_complete, mock_build_wheelhouse
+    ):
+        """A missing wheelhouse is built for the current interpreter"""
+        prepare_wheelhouse()
+
+        mock_build_wheelhouse.assert_called_once_with("/cache/key", "cp-test")
+
+    @patch("django_react_jollof.backend.bundled_pip_dir", return_value="/py/_bundled")
+    @patch("django_react_jollof.backend.publish_dir")
+    @patch("django_react_jollof.backend.staging_dir", return_value="/cache/.tmp")
     @patch("django_react_jollof.backend.run_subprocess_command")
-    @patch("django_react_jollof.backend.copy_templates")
-    @patch("django_react_jollof.backend.get_client_secrets")
-    @patch("django_react_jollof.backend.modify_urls_py")
-    @patch("django_react_jollof.backend.update_settings")
-    def test_scaffold_backend_success(
-        self,
-        mock_update_settings,
-        mock_modify_urls,
-        mock_get_secrets,
-        mock_copy_templates,
-        mock_run_command,
-        mock_echo,
-        mock_subprocess_run,
-        mock_chdir,
+    def test_build_base_env_offline(
+        self, mock_run_command, mock_staging, mock_publish, mock_bundled_pip_dir
     ):
-        """Test successful backend scaffolding."""
-        # Mock subprocess.run to simulate successful Django project creation
-        mock_subprocess_run.return_value = MagicMock()
-
-        # Mock get_client_secrets to simulate user-provided secrets
-        mock_get_secrets.return_value = {"GOOGLE_CLIENT_ID": "test_id"}
-
-        # Execute the scaffold_backend function
-        result = scaffold_backend("template_dir", "google")
-
-        # Assertions
-        # mock_subprocess_run.assert_any_call(
-        #     ["django-admin", "startproject", "backend"],
-        #     "Django project 'backend' created successfully.",
-        #     "Failed to create Django project 'backend'",
-        # )
-        mock_chdir.assert_has_calls([call("backend"), call("..")])
-        mock_modify_urls.assert_called_once()
-        mock_copy_templates.assert_called_once_with(
-            os.path.join("template_dir", "backend"), ANY, "backend"
+        """The base environment is installed from cached wheels, checked against their hashes"""
+        with patch("click.echo"):
+            build_base_env("/cache/env", "/cache/wheels")
+
+        command = mock_run_command.call_args_list[0][0][0]
+        self.assertEqual(
+            command[:6], ["python", "-m", "pip", "install", "--no-index", "--no-deps"]
+        )
+        self.assertEqual(
+            command[6:],
+            [
+                "--require-hashes",
+                "--target",
+                "/cache/.tmp",
+                "--find-links",
+                "/cache/wheels",
+                "-r",
+                os.path.join("/cache/wheels", "requirements.txt"),
+            ],
+        )
+        # pip comes from the interpreter's own bundled wheel
+        self.assertEqual(
+            mock_run_command.call_args_list[1][0][0][6:],
+            ["--target", "/cache/.tmp", "--find-links", "/py/_bundled", "pip"],
+        )
+        mock_publish.assert_called_once_with("/cache/.tmp", "/cache/env")
+
+        mock_run_command.reset_mock()
+        mock_bundled_pip_dir.return_value = None
+        with patch("click.echo"):
+            build_base_env("/cache/env", "/cache/wheels")
+        mock_run_command.assert_called_once()
+
+    @patch("django_react_jollof.backend.current_base_env", return_value="/cache/env")
+    @patch("django_react_jollof.backend.run_subprocess_command")
+    def test_create_project_env(self, mock_run_command, mock_base_env):
+        """The project venv has no packages of its own, only the base overlay"""
+        backend_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, backend_dir)
+        env_dir = os.path.join(backend_dir, ".venv")
+        site_packages = os.path.join(env_dir, "lib", "python3.11", "site-packages")
+        if os.name == "nt":
+            site_packages = os.path.join(env_dir, "Lib", "site-packages")
+        bin_dir = os.path.dirname(env_python(env_dir))
+        mock_run_command.side_effect = lambda *args: [
+            os.makedirs(path) for path in (site_packages, bin_dir)
+        ]
+
+        with patch("click.echo"):
+            create_project_env(backend_dir)
+
+        self.assertEqual(
+            mock_run_command.call_args[0][0],
+            ["python", "-m", "venv", "--without-pip", env_dir],
+        )
+        with open(os.path.join(site_packages, "_jollof_base.pth")) as f:
+            self.assertEqual(f.read(), "import site; site.addsitedir('/cache/env')\n")
+        self.assertEqual(
+            sorted(os.listdir(bin_dir)),
+            ["pip.bat", "pip3.bat"] if os.name == "nt" else ["pip", "pip3"],
         )
-        mock_update_settings.assert_called_once_with("google")
-        self.assertEqual(result, {"GOOGLE_CLIENT_ID": "test_id"})
 
-        # Ensure migrations were mocked
-        mock_subprocess_run.assert_any_call(
-            ["python", "manage.py", "migrate"], check=True, text=True
+        with patch("os.path.isdir", return_value=True), patch(
+            "django_react_jollof.backend.env_python", return_value=__file__
+        ):
+            self.assertIsNotNone(environment_fingerprint(backend_dir))
+            mock_base_env.return_value = "/cache/other-env"
+            self.assertIsNone(environment_fingerprint(backend_dir))
+
+    def test_parse_pins(self):
+        """Pins are read across line continuations, with normalized names"""
+        pins = parse_pins(
+            "# header\n"
+            "Django==5.1.4 \\\n    --hash=sha256:aaa\n"
+            "django_allauth==65.3.0 --hash=sha256:bbb\n"
+            "pyjwt>=2\n"
         )
 
+        self.assertEqual(pins, {"django": "5.1.4", "django-allauth": "65.3.0"})
+
+    @patch("django_react_jollof.backend.run_migrations")
+    @patch("django_react_jollof.backend.db_snapshot")
+    @patch("django_react_jollof.backend.interpreter_abi", return_value="cp-test")
+    @patch("django_react_jollof.backend.list_wheels", return_value=[])
+    def test_migrate_database_snapshot_hit(
+        self, mock_list_wheels, mock_abi, mock_db_snapshot, mock_run_migrations
+    ):
+        """A matching snapshot replaces the migrate run"""
+        mock_db_snapshot.restore.return_value = True
+
+        with patch("click.secho"):
+            migrate_database("backend")
+
+        mock_run_migrations.assert_not_called()
+        mock_db_snapshot.save.assert_not_called()
+
+    @patch("os.remove")
+    @patch("django_react_jollof.backend.show_migrations")
+    @patch("django_react_jollof.backend.run_migrations")
+    @patch("django_react_jollof.backend.db_snapshot")
+    @patch("django_react_jollof.backend.interpreter_abi", return_value="cp-test")
+    @patch("django_react_jollof.backend.list_wheels", return_value=[])
+    def test_migrate_database_verify_mismatch(
+        self,
+        mock_list_wheels,
+        mock_abi,
+        mock_db_snapshot,
+        mock_run_migrations,
+        mock_show_migrations,
+        mock_remove,
+    ):
+        """A snapshot that fails verification falls back to a real migrate"""
+        mock_db_snapshot.restore.return_value = True
+        mock_db_snapshot.stored_plan.return_value = "[X]  auth.0001_initial\n"
+        mock_db_snapshot.DATABASE_FILE = "db.sqlite3"
+        mock_show_migrations.return_value = "[ ]  auth.0001_initial\n"
+
+        with patch("click.secho"):
+            migrate_database("backend", verify=True)
+
+        mock_remove.assert_called_once_with(os.path.join("backend", "db.sqlite3"))
+        mock_run_migrations.assert_called_once_with("backend")
+        mock_db_snapshot.save.assert_called_once()
+
+    def test_add_backend_tasks_orders_migrate_last(self):
+        """Migrations run in the project venv, which waits for the base and the files."""
+        graph = MagicMock()
+        add_backend_tasks(graph, "project", after=["project files"])
+
+        deps = {
+            c.args[0]: (c.args[2] if len(c.args) > 2 else [])
+            for c in graph.add.call_args_list
+        }
+        self.assertEqual(deps["migrate"], ["venv"])
+        self.assertEqual(set(deps["venv"]), {"base env", "project files"})
+        self.assertEqual(deps["base env"], ["wheelhouse"])
+        self.assertEqual(deps["wheelhouse"], [])
+
+
+class TestRequirementsLock(unittest.TestCase):
+
+    def setUp(self):
+        self.templates = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.templates)
+        os.makedirs(os.path.join(self.templates, "lockfiles"))
+        load_requirements_lock.cache_clear()
+        self.addCleanup(load_requirements_lock.cache_clear)
+        abi = patch(
+            "django_react_jollof.backend.interpreter_abi",
+            return_value="cpython-311-linux-x86_64",
+        )
+        abi.start()
+        self.addCleanup(abi.stop)
+
+    def write_lock(self, names, python="cpython-311", header=None):
+        with open(
+            os.path.join(
+                self.templates, "lockfiles", f"backend-{python}.requirements.txt"
+            ),
+            "w",
+        ) as file:
+            file.write(f"# Resolved for: {header or python}\n")
+            for name in names:
+                file.write(f"{name}==1.0 \\\n    --hash=sha256:{name}\n")
+
+    def test_lock_in_sync(self):
+        """A lock pinning every dependency is used as is"""
+        self.write_lock(BACKEND_DEPENDENCIES + ["sqlparse"])
+
+        lock = load_requirements_lock(self.templates)
+
+        self.assertEqual(parse_pins(lock)["sqlparse"], "1.0")
+
+    def test_stale_lock_is_ignored(self):
+        """A lock missing a dependency falls back to resolving"""
+        self.write_lock(BACKEND_DEPENDENCIES[1:])
+
+        with patch("click.echo") as mock_echo:
+            self.assertIsNone(load_requirements_lock(self.templates))
+
+        self.assertIn(BACKEND_DEPENDENCIES[0], mock_echo.call_args[0][0])
+
+    def test_lock_of_this_python_is_chosen(self):
+        """Of the locks shipped per Python, the one of the interpreter is used"""
+        self.write_lock(BACKEND_DEPENDENCIES, python="cpython-310")
+        self.write_lock(BACKEND_DEPENDENCIES + ["sqlparse"])
+
+        lock = load_requirements_lock(self.templates)
+
+        self.assertIn("# Resolved for: cpython-311", lock)
+        self.assertIn("sqlparse", parse_pins(lock))
+
+    def test_python_without_lock_resolves(self):
+        """An interpreter no lock ships for falls back to resolving"""
+        self.write_lock(BACKEND_DEPENDENCIES, python="cpython-310")
+        self.write_lock(BACKEND_DEPENDENCIES, python="cpython-312")
+
+        with patch("click.echo") as mock_echo:
+            self.assertIsNone(load_requirements_lock(self.templates))
+
+        self.assertIn("cpython-311", mock_echo.call_args[0][0])
+
+    def test_lock_for_other_python_is_ignored(self):
+        """A lock whose header names another Python falls back to resolving"""
+        self.write_lock(BACKEND_DEPENDENCIES, header="cpython-312")
+
+        with patch("click.echo") as mock_echo:
+            self.assertIsNone(load_requirements_lock(self.templates))
+
+        self.assertIn("cpython-311", mock_echo.call_args[0][0])
+
+    def test_missing_lock(self):
+        """Without a lock the bare dependency names are used"""
+        with patch("click.echo"):
+            self.assertIsNone(load_requirements_lock(self.templates))
+
+    @patch("django_react_jollof.backend.load_requirements_lock")
+    def test_backend_requirements_from_lock(self, mock_load):
+        """The wheel cache is built from one hash-pinned line per distribution"""
+        mock_load.return_value = "# header\ndjango==5.1.4 \\\n    --hash=sha256:aaa\n"
+
+        self.assertEqual(backend_requirements(), ["django==5.1.4 --hash=sha256:aaa"])
+
+        mock_load.return_value = None
+        self.assertEqual(backend_requirements(), BACKEND_DEPENDENCIES)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_react_jollof.batch import (
+    CookResult,
+    cook_manifest,
+    cook_project,
+    load_manifest,
+    normalise_choice,
+)
+from django_react_jollof.cli import cli
+from django_react_jollof.utils import FRONTEND_CHOICES
+
+
+class InlineExecutor:
+    """Stand-in for ProcessPoolExecutor that runs jobs in the calling process."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write_manifest(self, name, content):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_normalise_choice(self):
+        """Menu numbers and option names are both accepted"""
+        self.assertEqual(normalise_choice(2, FRONTEND_CHOICES, "frontend"), "material")
+        self.assertEqual(
+            normalise_choice("Bootstrap", FRONTEND_CHOICES, "frontend"), "bootstrap"
+        )
+        with self.assertRaises(ValueError):
+            normalise_choice("tailwind", FRONTEND_CHOICES, "frontend")
+
+    def test_load_yaml_manifest_with_defaults(self):
+        """Defaults apply to every project and can be overridden"""
+        path = self.write_manifest(
+            "projects.yaml",
+            "defaults:\n"
+            "  frontend: material\n"
+            f"  directory: {self.tmp}\n"
+            "projects:\n"
+            "  - name: alpha\n"
+            "  - name: beta\n"
+            "    frontend: 1\n"
+            "    social_login: google\n"
+            "    password_hasher: argon2\n"
+            "    secrets:\n"
+            "      GOOGLE_CLIENT_ID: abc\n",
+        )
+
+        specs = load_manifest(path)
+
+        self.assertEqual([s["name"] for s in specs], ["alpha", "beta"])
+        self.assertEqual(specs[0]["frontend"], "material")
+        self.assertEqual(specs[0]["social_login"], "none")
+        self.assertEqual(specs[1]["frontend"], "bootstrap")
+        self.assertEqual(specs[1]["social_login"], "google")
+        self.assertEqual(specs[0]["password_hasher"], "pbkdf2")
+        self.assertEqual(specs[1]["password_hasher"], "argon2")
+        self.assertEqual(specs[1]["secrets"], {"GOOGLE_CLIENT_ID": "abc"})
+        self.assertEqual(specs[0]["directory"], self.tmp)
+
+    def test_load_json_manifest_list(self):
+        """A JSON list of projects is accepted"""
+        path = self.write_manifest(
+            "projects.json", json.dumps([{"name": "alpha", "frontend": "2"}])
+        )
+        specs = load_manifest(path)
+        self.assertEqual(specs[0]["frontend"], "material")
+        self.assertTrue(os.path.isabs(specs[0]["directory"]))
+
+    def test_load_manifest_rejects_duplicates(self):
+        """The same project cannot be cooked twice in one run"""
+        path = self.write_manifest("projects.yaml", "- name: alpha\n- name: alpha\n")
+        with self.assertRaises(ValueError):
+            load_manifest(path)
+
+    def test_load_manifest_rejects_malformed_yaml(self):
+        """A manifest that does not parse is reported as malformed"""
+        path = self.write_manifest("projects.yaml", "projects:\n  - name: [alpha\n")
+        with self.assertRaises(ValueError):
+            load_manifest(path)
+
+    def test_load_manifest_requires_names(self):
+        """Every project needs a name"""
+        path = self.write_manifest("projects.yaml", "- frontend: 1\n")
+        with self.assertRaises(ValueError):
+            load_manifest(path)
+
+    @patch("django_react_jollof.cook.scaffold_project")
+    def test_cook_project_reports_failure(self, mock_scaffold_project):
+        """A failing project is reported instead of stopping the batch"""
+        mock_scaffold_project.side_effect = SystemExit(1)
+        spec = {
+            "name": "alpha",
+            "frontend": "bootstrap",
+            "social_login": "none",
+            "password_hasher": "argon2",
+            "secrets": {},
+            "directory": self.tmp,
+        }
+
+        result = cook_project(spec)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "exited with status 1")
+        self.assertEqual(result.log_path, os.path.join(self.tmp, "alpha.cook.log"))
+        mock_scaffold_project.assert_called_once_with(
+            "alpha", "bootstrap", "none", {}, self.tmp, password_hasher="argon2"
+        )
+
+    @patch("django_react_jollof.batch.ProcessPoolExecutor", InlineExecutor)
+    @patch("django_react_jollof.cook.scaffold_project")
+    def test_cook_manifest(self, mock_scaffold_project):
+        """Every project is cooked and results keep manifest order"""
+        path = self.write_manifest(
+            "projects.yaml",
+            f"defaults:\n  directory: {self.tmp}\n"
+            "projects:\n  - name: alpha\n  - name: beta\n",
+        )
+
+        results = cook_manifest(path, 2)
+
+        self.assertEqual([r.name for r in results], ["alpha", "beta"])
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(mock_scaffold_project.call_count, 2)
+
+    @patch("django_react_jollof.cook.cook_manifest")
+    def test_cook_command_with_manifest(self, mock_cook_manifest):
+        """`cook --manifest` skips the prompts and fails if a project failed"""
+        path = self.write_manifest("projects.yaml", "- name: alpha\n")
+        mock_cook_manifest.return_value = [
+            CookResult("alpha", False, 1.0, "alpha.cook.log", "boom")
+        ]
+
+        result = CliRunner().invoke(cli, ["cook", "--manifest", path, "--jobs", "3"])
+
+        mock_cook_manifest.assert_called_once_with(path, 3)
+        self.assertEqual(result.exit_code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import unittest
+
+from django_react_jollof.benchmark import compare, format_results, run_benchmark
+
+
+def make_results(wall, phases, files=41):
+    return {
+        "cases": {
+            "bootstrap-none": {
+                "wall_seconds": wall,
+                "files_written": files,
+                "bytes_written": 60000,
+                "phases": {
+                    name: {
+                        "wall_seconds": seconds,
+                        "cpu_seconds": seconds,
+                        "files_written": 0,
+                        "bytes_written": 0,
+                    }
+                    for name, seconds in phases.items()
+                },
+            }
+        }
+    }
+
+
+class TestBenchmark(unittest.TestCase):
+
+    @unittest.skipUnless(os.name == "posix", "the stub toolchain needs sh")
+    def test_run_benchmark_with_stub_toolchain(self):
+        """A whole cook runs against the stubs and every step is measured"""
+        results = run_benchmark(repeat=1, cases=[("material", "google")])
+
+        case = results["cases"]["material-google"]
+        self.assertEqual(
+            set(case["phases"]),
+            {
+                "project files",
+                "wheelhouse",
+                "base env",
+                "venv",
+                "migrate",
+                "node check",
+                "npm install",
+            },
+        )
+        self.assertGreater(case["phases"]["project files"]["files_written"], 30)
+        self.assertGreater(case["wall_seconds"], 0)
+        self.assertIn("material-google", format_results(results))
+
+        # Clones of the golden project skip npm and migrate
+        golden = results["cases"]["material-google-golden"]
+        self.assertEqual(
+            set(golden["phases"]), {"project files", "wheelhouse", "base env", "venv"}
+        )
+        self.assertIn("material-google-golden", format_results(results))
+
+    def test_compare_flags_slower_phases(self):
+        """Phases slower than tolerance and slack are reported"""
+        baseline = make_results(0.020, {"project files": 0.015, "migrate": 0.002})
+        results = make_results(0.040, {"project files": 0.035, "migrate": 0.004})
+
+        regressions = compare(results, baseline)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("bootstrap-none:"))
+        self.assertTrue(regressions[1].startswith("bootstrap-none project files:"))
+
+    def test_compare_within_tolerance(self):
+        """Noise and unknown cases are not regressions"""
+        baseline = make_results(0.020, {"project files": 0.015})
+        results = make_results(0.022, {"project files": 0.016, "migrate": 0.5})
+        results["cases"]["material-none"] = results["cases"]["bootstrap-none"]
+
+        self.assertEqual(compare(results, baseline), [])
+
+    def test_compare_file_count_change(self):
+        """A different number of written files is reported"""
+        baseline = make_results(0.020, {}, files=41)
+        results = make_results(0.020, {}, files=42)
+
+        self.assertEqual(len(compare(results, baseline)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.cache import (
+    fingerprint,
+    get_cache_dir,
+    publish_dir,
+    staging_dir,
+)
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_get_cache_dir_from_environment(self):
+        """JOLLOF_CACHE_DIR overrides the default cache location"""
+        with patch.dict(os.environ, {"JOLLOF_CACHE_DIR": self.tmp}):
+            path = get_cache_dir("wheels")
+
+        self.assertEqual(path, os.path.join(self.tmp, "wheels"))
+        self.assertTrue(os.path.isdir(path))
+
+    def test_get_cache_dir_xdg(self):
+        """The cache follows XDG_CACHE_HOME when no override is set"""
+        env = {"XDG_CACHE_HOME": self.tmp, "JOLLOF_CACHE_DIR": ""}
+        with patch.dict(os.environ, env):
+            path = get_cache_dir()
+
+        self.assertEqual(path, os.path.join(self.tmp, "django-react-jollof"))
+
+    def test_fingerprint(self):
+        """Fingerprints are stable and sensitive to part boundaries"""
+        self.assertEqual(fingerprint(["a", "b"]), fingerprint(["a", "b"]))
+        self.assertNotEqual(fingerprint(["ab"]), fingerprint(["a", "b"]))
+
+    def test_publish_dir(self):
+        """A staged entry is moved into place"""
+        final = os.path.join(self.tmp, "entry")
+        staging = staging_dir(final)
+        open(os.path.join(staging, "file"), "w").close()
+
+        publish_dir(staging, final)
+
+        self.assertTrue(os.path.isfile(os.path.join(final, "file")))
+        self.assertFalse(os.path.exists(staging))
+
+    def test_publish_dir_lost_race(self):
+        """An entry published by someone else wins and ours is dropped"""
+        final = os.path.join(self.tmp, "entry")
+        os.makedirs(final)
+        open(os.path.join(final, "theirs"), "w").close()
+        staging = staging_dir(final)
+        open(os.path.join(staging, "ours"), "w").close()
+
+        publish_dir(staging, final)
+
+        self.assertEqual(os.listdir(final), ["theirs"])
+        self.assertFalse(os.path.exists(staging))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,58 @@
+import os
+import subprocess
+import sys
 import unittest
-from unittest.mock import patch, MagicMock, call, ANY
+from unittest.mock import patch
 from click.testing import CliRunner
 
-from django_react_jollof.cli import cli, scaffold_project
+from django_react_jollof.cli import LAZY_COMMANDS, cli
+
+# Import time allowed for `django_react_jollof.cli` on top of click itself
+STARTUP_BUDGET_SECONDS = 0.01
+
+# Modules that belong to `cook` and must not load for `--help`
+HEAVY_MODULES = [
+    "django_react_jollof.backend",
+    "django_react_jollof.frontend",
+    "django_react_jollof.cook",
+    "subprocess",
+    "logging",
+    "json",
+]
+
+
+def import_times(code):
+    """
+    Run `code` under ``python -X importtime``, with click already imported.
+
+    Returns:
+        Dict[str, float]: Self time in seconds of every module imported
+        through a django_react_jollof module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import click\n{code}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    in_jollof = False
+    # Children are listed before their parent, so walk parents first
+    for line in reversed(result.stderr.splitlines()):
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            in_jollof = name.strip().startswith("django_react_jollof")
+        if in_jollof:
+            times[name.strip()] = int(own) / 1e6
+    return times
 
 
 class TestCLI(unittest.TestCase):
     """Test suite for the Django React Jollof CLI."""
 
-    @patch("django_react_jollof.cli.scaffold_project")
+    @patch("django_react_jollof.cook.scaffold_project")
     def test_cook_command(self, mock_scaffold_project):
         """Test the `cook` command."""
         runner = CliRunner()
@@ -28,7 +72,36 @@ class TestCLI(unittest.TestCase):
 
         self.assertEqual(result.exit_code, 0)
         mock_scaffold_project.assert_called_once_with(
-            "TestProject", "bootstrap", "google"
+            "TestProject",
+            "bootstrap",
+            "google",
+            password_hasher="pbkdf2",
+            verify_db=False,
+            timings=False,
+            timings_json=None,
+        )
+
+    @patch("django_react_jollof.cook.scaffold_project")
+    def test_cook_password_hasher(self, mock_scaffold_project):
+        """The password hasher profile is passed on"""
+        result = CliRunner().invoke(
+            cli,
+            [
+                "cook",
+                "--name",
+                "TestProject",
+                "--frontend",
+                "1",
+                "--social-login",
+                "2",
+                "--password-hasher",
+                "Argon2",
+            ],
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(
+            mock_scaffold_project.call_args.kwargs["password_hasher"], "argon2"
         )
 
     def test_cook_invalid_frontend(self):
@@ -76,110 +149,57 @@ class TestCLI(unittest.TestCase):
             f"Invalid choice '3'! Please choose a valid number option", result.output
         )
 
-    @patch("django_react_jollof.backend.update_settings")
-    @patch("django_react_jollof.backend.write_env_file")  # Mock write_env_file
-    @patch("django_react_jollof.backend.get_client_secrets")  # Mock get_client_secrets
-    @patch("subprocess.run")
-    @patch("django_react_jollof.backend.modify_urls_py")  # Mock modify_urls_py
-    @patch(
-        "django_react_jollof.backend.run_subprocess_command"
-    )  # Mock subprocess commands
-    @patch("os.makedirs")  # Mock directory creation
-    @patch("os.chdir")  # Mock directory change
-    @patch("django_react_jollof.backend.copy_templates")  # Mock template copying
-    @patch("django_react_jollof.cli.scaffold_frontend")  # Mock scaffold_frontend
-    def test_scaffold_project(
-        self,
-        mock_scaffold_frontend,
-        mock_copy_templates,
-        mock_chdir,
-        mock_makedirs,
-        mock_run_subprocess_command,
-        mock_modify_urls_py,
-        mock_subprocess_run,
-        mock_get_secrets,
-        mock_write_env_file,
-        mock_update_settings,
-    ):
-        """Test the `scaffold_project` function."""
-
-        # Set return values for mocked functions
-        mock_modify_urls_py.return_value = None
-        mock_copy_templates.return_value = None
-        mock_run_subprocess_command.return_value = None
-        mock_scaffold_frontend.return_value = None
-        mock_subprocess_run.return_value = MagicMock()
-        mock_get_secrets.return_value = {
-            "GOOGLE_CLIENT_ID": "test_id",
-            "GOOGLE_CLIENT_SECRET": "test_secret",
-        }
-        mock_update_settings.return_value = None
-
-        # Execute the function
-        scaffold_project("TestProject", "bootstrap", "google")
-
-        # Assertions for directory operations
-        mock_makedirs.assert_called_once_with("TestProject", exist_ok=True)
-        mock_chdir.assert_has_calls(
-            [call("TestProject"), call("backend"), call("..")], any_order=False
-        )
+    def test_resume_without_journal(self):
+        """Only projects with a journal can be resumed."""
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            os.makedirs("TestProject")
+            result = runner.invoke(cli, ["cook", "--name", "TestProject", "--resume"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("There is no cook of 'TestProject' to resume", result.output)
 
-        # Assertions for backend operations
-        mock_copy_templates.assert_called_once_with(ANY, ANY, "backend")
-
-        # Assertions for backend subprocess calls
-        expected_calls = [
-            call(
-                ["django-admin", "startproject", "backend"],
-                "Django project 'backend' created successfully.",
-                "Failed to create Django project 'backend'",
-            ),
-            call(
-                ["pip", "install", "--upgrade", "pip"],
-                "Pip upgraded successfully.",
-                "Failed to upgrade pip",
-            ),
-            call(
-                [
-                    "pip",
-                    "install",
-                    "djangorestframework",
-                    "djangorestframework-simplejwt",
-                    "django-cors-headers",
-                    "django-allauth",
-                    "python-decouple",
-                ],
-                "Backend dependencies installed successfully.",
-                "Failed to install backend dependencies",
-            ),
-        ]
-        mock_run_subprocess_command.assert_has_calls(expected_calls, any_order=True)
-
-        mock_modify_urls_py.assert_called_once_with(ANY)
-
-        # Assertions for secrets and env file
-        mock_write_env_file.assert_called_once_with(
-            {
-                "GOOGLE_CLIENT_ID": "test_id",
-                "GOOGLE_CLIENT_SECRET": "test_secret",
-            }
+    def test_cook_timings_with_manifest(self):
+        """Timings are only recorded for a single project."""
+        runner = CliRunner()
+        with runner.isolated_filesystem():
+            with open("projects.json", "w") as f:
+                f.write("[]")
+            result = runner.invoke(
+                cli, ["cook", "--manifest", "projects.json", "--timings"]
+            )
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("cannot be used with --manifest", result.output)
+
+    def test_help_does_not_load_cook(self):
+        """Listing the commands imports none of the scaffolding modules."""
+        times = import_times(
+            "from django_react_jollof.cli import cli\n"
+            "try:\n"
+            "    cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass"
         )
 
-        mock_update_settings.assert_called_once_with("google")
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
 
-        # Assertions for frontend operations
-        mock_scaffold_frontend.assert_called_once_with(
-            ANY,
-            "bootstrap",
-            "google",
-            "TestProject",
-            {"GOOGLE_CLIENT_ID": "test_id", "GOOGLE_CLIENT_SECRET": "test_secret"},
+    def test_startup_budget(self):
+        """Importing the CLI stays cheap."""
+        # Best of three, to keep a busy machine from failing the test
+        total = min(
+            sum(import_times("import django_react_jollof.cli").values())
+            for _ in range(3)
         )
 
-        # Assertions for mocked subprocess
-        mock_subprocess_run.assert_any_call(
-            ["python", "manage.py", "migrate"], check=True, text=True
-        )
+        self.assertLess(total, STARTUP_BUDGET_SECONDS)
+
+    def test_lazy_command_summaries(self):
+        """The summaries listed by `--help` match the commands."""
+        for name, (_, summary) in LAZY_COMMANDS.items():
+            command = cli.get_command(None, name)
+            self.assertEqual(command.get_short_help_str(), summary)
 
     def test_help_command(self):
         """Test the `help` command."""
@@ -0,0 +1,250 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.cook import resume_project, scaffold_project
+from django_react_jollof.journal import Journal
+
+
+class TestScaffoldProject(unittest.TestCase):
+
+    def setUp(self):
+        cache = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache)
+        env = patch.dict(os.environ, {"JOLLOF_CACHE_DIR": cache})
+        env.start()
+        self.addCleanup(env.stop)
+
+    @patch("django_react_jollof.backend.migrate_database")
+    @patch("django_react_jollof.backend.create_project_env")
+    @patch("django_react_jollof.backend.prepare_base_env")
+    @patch("django_react_jollof.backend.prepare_wheelhouse")
+    @patch("django_react_jollof.frontend.install_frontend_dependencies")
+    @patch("django_react_jollof.frontend.check_node_version")
+    @patch("django_react_jollof.cook.get_client_secrets")  # Mock get_client_secrets
+    def test_scaffold_project(
+        self,
+        mock_get_secrets,
+        mock_check_node_version,
+        mock_install_frontend,
+        mock_prepare_wheelhouse,
+        mock_prepare_base_env,
+        mock_create_env,
+        mock_migrate_database,
+    ):
+        """Test the `scaffold_project` function."""
+        mock_get_secrets.return_value = {
+            "GOOGLE_CLIENT_ID": "test_id",
+            "GOOGLE_CLIENT_SECRET": "test_secret",
+        }
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        project_dir = os.path.join(tmp, "TestProject")
+
+        # Execute the function
+        scaffold_project("TestProject", "bootstrap", "google", directory=tmp)
+
+        # Both halves of the project are written in one go
+        self.assertEqual(
+            sorted(os.listdir(project_dir)),
+            [".gitignore", ".jollof", "LICENSE", "README.md", "backend", "frontend"],
+        )
+        with open(os.path.join(project_dir, "backend", ".env")) as f:
+            self.assertEqual(
+                f.read(), "GOOGLE_CLIENT_ID=test_id\nGOOGLE_CLIENT_SECRET=test_secret\n"
+            )
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(
+                    project_dir,
+                    "frontend",
+                    "src",
+                    "components",
+                    "auth_buttons",
+                    "GoogleLoginButton.jsx",
+                )
+            )
+        )
+
+        # The slow steps run once the files are in place
+        mock_prepare_wheelhouse.assert_called_once()
+        mock_create_env.assert_called_once()
+        mock_migrate_database.assert_called_once_with(
+            os.path.join(project_dir, "backend"), False
+        )
+        mock_check_node_version.assert_called_once()
+        mock_install_frontend.assert_called_once_with(
+            os.path.join(project_dir, "frontend")
+        )
+
+    @patch("django_react_jollof.cook.interpreter_abi", return_value="cp-test")
+    @patch("django_react_jollof.backend.migrate_database")
+    @patch("django_react_jollof.backend.create_project_env")
+    @patch("django_react_jollof.backend.prepare_base_env")
+    @patch("django_react_jollof.backend.prepare_wheelhouse")
+    @patch("django_react_jollof.frontend.install_frontend_dependencies")
+    @patch("django_react_jollof.frontend.check_node_version")
+    def test_golden_project(
+        self,
+        mock_check_node_version,
+        mock_install_frontend,
+        mock_prepare_wheelhouse,
+        mock_prepare_base_env,
+        mock_create_env,
+        mock_migrate_database,
+        mock_abi,
+    ):
+        """A second project with the same options is cloned from the first."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        mock_migrate_database.side_effect = lambda backend_dir, verify: open(
+            os.path.join(backend_dir, "db.sqlite3"), "w"
+        ).close()
+        mock_install_frontend.side_effect = lambda frontend_dir: os.makedirs(
+            os.path.join(frontend_dir, "node_modules", "react")
+        )
+
+        scaffold_project("First", "bootstrap", "none", directory=tmp)
+        scaffold_project("Second", "bootstrap", "none", directory=tmp)
+
+        mock_install_frontend.assert_called_once()
+        mock_migrate_database.assert_called_once()
+        self.assertEqual(mock_create_env.call_count, 2)
+        second = os.path.join(tmp, "Second")
+        self.assertTrue(os.path.isfile(os.path.join(second, "backend", "db.sqlite3")))
+        self.assertTrue(
+            os.path.isdir(os.path.join(second, "frontend", "node_modules", "react"))
+        )
+        with open(os.path.join(second, "frontend", "index.html")) as f:
+            html = f.read()
+        self.assertIn("Second", html)
+        self.assertNotIn("First", html)
+        with open(os.path.join(tmp, "First", "backend", "backend", "settings.py")) as f:
+            first_settings = f.read()
+        with open(os.path.join(second, "backend", "backend", "settings.py")) as f:
+            self.assertNotEqual(f.read(), first_settings)
+
+        # Other options have their own golden project
+        scaffold_project("Third", "material", "none", directory=tmp)
+        self.assertEqual(mock_install_frontend.call_count, 2)
+
+    @patch("django_react_jollof.cook.add_backend_tasks")
+    @patch("django_react_jollof.cook.add_frontend_tasks")
+    def test_scaffold_project_refuses_existing_files(
+        self, mock_add_frontend_tasks, mock_add_backend_tasks
+    ):
+        """Existing project files are never overwritten."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        project_dir = os.path.join(tmp, "TestProject")
+        os.makedirs(os.path.join(project_dir, "frontend"))
+
+        with self.assertRaises(SystemExit):
+            scaffold_project("TestProject", "bootstrap", "none", directory=tmp)
+
+        self.assertEqual(os.listdir(project_dir), ["frontend"])
+        self.assertEqual(os.listdir(os.path.join(project_dir, "frontend")), [])
+
+    @patch("django_react_jollof.cook.golden_key", return_value=None)
+    @patch("django_react_jollof.cook.add_backend_tasks")
+    @patch("django_react_jollof.cook.add_frontend_tasks")
+    def test_scaffold_project_timings_json(
+        self, mock_add_frontend_tasks, mock_add_backend_tasks, mock_golden_key
+    ):
+        """Every step is reported in the timings file."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        report_path = os.path.join(tmp, "timings.json")
+
+        scaffold_project(
+            "TestProject",
+            "bootstrap",
+            "none",
+            directory=tmp,
+            timings=True,
+            timings_json=report_path,
+        )
+
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertTrue(report["succeeded"])
+        self.assertEqual(report["critical_path"], ["project files"])
+        (phase,) = report["phases"]
+        self.assertEqual(phase["name"], "project files")
+        self.assertGreater(phase["files_written"], 30)
+        self.assertGreater(phase["bytes_written"], 0)
+
+    @patch("django_react_jollof.backend.migrate_database")
+    @patch("django_react_jollof.backend.create_project_env")
+    @patch("django_react_jollof.backend.database_key", return_value="db-1")
+    @patch("django_react_jollof.backend.environment_fingerprint")
+    @patch("django_react_jollof.backend.prepare_base_env")
+    @patch("django_react_jollof.backend.prepare_wheelhouse")
+    @patch("django_react_jollof.frontend.install_frontend_dependencies")
+    @patch("django_react_jollof.frontend.check_node_version")
+    def test_resume_skips_finished_steps(
+        self,
+        mock_check_node_version,
+        mock_install_frontend,
+        mock_prepare_wheelhouse,
+        mock_prepare_base_env,
+        mock_environment_fingerprint,
+        mock_database_key,
+        mock_create_env,
+        mock_migrate_database,
+    ):
+        """A resumed cook only runs the steps that did not finish."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        project_dir = os.path.join(tmp, "TestProject")
+        mock_environment_fingerprint.return_value = "env-1"
+        mock_migrate_database.side_effect = lambda backend_dir, verify: open(
+            os.path.join(backend_dir, "db.sqlite3"), "w"
+        ).close()
+        mock_install_frontend.side_effect = SystemExit(1)
+
+        with self.assertRaises(SystemExit):
+            scaffold_project(
+                "TestProject",
+                "material",
+                "none",
+                directory=tmp,
+                password_hasher="argon2",
+            )
+
+        mock_install_frontend.side_effect = None
+        resume_project("TestProject", directory=tmp)
+
+        mock_create_env.assert_called_once()
+        mock_migrate_database.assert_called_once()
+        self.assertEqual(mock_install_frontend.call_count, 2)
+        journal = Journal(project_dir)
+        self.assertTrue(journal.load())
+        self.assertEqual(journal.options["frontend"], "material")
+        self.assertEqual(journal.options["password_hasher"], "argon2")
+        self.assertEqual(
+            sorted(journal.steps),
+            ["migrate", "npm install", "project files", "venv"],
+        )
+
+    @patch("django_react_jollof.cook.add_backend_tasks")
+    @patch("django_react_jollof.cook.add_frontend_tasks")
+    def test_resume_other_options(
+        self, mock_add_frontend_tasks, mock_add_backend_tasks
+    ):
+        """Files generated with other options are not taken as done."""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        scaffold_project("TestProject", "bootstrap", "none", directory=tmp)
+
+        with self.assertRaises(SystemExit):
+            scaffold_project(
+                "TestProject", "material", "none", directory=tmp, resume=True
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
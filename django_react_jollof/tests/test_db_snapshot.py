@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import db_snapshot
+
+SETTINGS = """\
+SECRET_KEY = "{secret}"
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "rest_framework",
+]
+"""
+
+
+class TestDbSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.env = patch.dict(
+            os.environ, {"JOLLOF_CACHE_DIR": os.path.join(self.tmp, "cache")}
+        )
+        self.env.start()
+        self.backend = self.make_backend("first", "one")
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def make_backend(self, name, secret):
+        backend = os.path.join(self.tmp, name, "backend")
+        os.makedirs(os.path.join(backend, "backend"))
+        os.makedirs(os.path.join(backend, "users", "migrations"))
+        with open(os.path.join(backend, "backend", "settings.py"), "w") as f:
+            f.write(SETTINGS.format(secret=secret))
+        with open(
+            os.path.join(backend, "users", "migrations", "0001_initial.py"), "w"
+        ) as f:
+            f.write("operations = []\n")
+        return backend
+
+    def test_installed_apps(self):
+        """INSTALLED_APPS is read without importing settings"""
+        apps = db_snapshot.installed_apps(
+            os.path.join(self.backend, "backend", "settings.py")
+        )
+
+        self.assertEqual(apps, ["django.contrib.auth", "rest_framework"])
+
+    def test_snapshot_key_ignores_secret_key(self):
+        """Projects that only differ in SECRET_KEY share a snapshot"""
+        other = self.make_backend("second", "two")
+
+        self.assertEqual(
+            db_snapshot.snapshot_key(self.backend, ["/w/Django-5.0-py3-none-any.whl"]),
+            db_snapshot.snapshot_key(other, ["/x/Django-5.0-py3-none-any.whl"]),
+        )
+
+    def test_snapshot_key_follows_migrations_and_packages(self):
+        """New migrations or package versions change the key"""
+        key = db_snapshot.snapshot_key(self.backend, ["Django-5.0-py3-none-any.whl"])
+
+        self.assertNotEqual(
+            key, db_snapshot.snapshot_key(self.backend, ["Django-5.1-py3-none-any.whl"])
+        )
+        with open(
+            os.path.join(self.backend, "users", "migrations", "0002_profile.py"), "w"
+        ) as f:
+            f.write("operations = []\n")
+        self.assertNotEqual(
+            key, db_snapshot.snapshot_key(self.backend, ["Django-5.0-py3-none-any.whl"])
+        )
+
+    def test_restore_miss(self):
+        """Nothing is restored for an unknown key"""
+        self.assertFalse(db_snapshot.restore("unknown", self.backend))
+        self.assertIsNone(db_snapshot.stored_plan("unknown"))
+
+    def test_save_and_restore(self):
+        """A stored database is copied into another project"""
+        with open(os.path.join(self.backend, "db.sqlite3"), "wb") as f:
+            f.write(b"SQLite format 3\0")
+        db_snapshot.save("key", self.backend, "[X]  auth.0001_initial\n")
+
+        other = self.make_backend("second", "two")
+        self.assertTrue(db_snapshot.restore("key", other))
+
+        restored = os.path.join(other, "db.sqlite3")
+        with open(restored, "rb") as f:
+            self.assertEqual(f.read(), b"SQLite format 3\0")
+        # Each project owns its database file
+        self.assertEqual(os.stat(restored).st_nlink, 1)
+        self.assertEqual(db_snapshot.stored_plan("key"), "[X]  auth.0001_initial\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
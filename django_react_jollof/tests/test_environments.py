@@ -0,0 +1,104 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.environments import (
+    base_env_path,
+    env_python,
+    has_overlay,
+    site_packages,
+    write_overlay,
+    write_pip_commands,
+)
+
+
+class TestEnvironments(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_base_env_path_is_keyed_by_wheels(self):
+        """Base environments differ with the pinned wheels and the interpreter"""
+        with patch.dict(os.environ, {"JOLLOF_CACHE_DIR": self.tmp}):
+            path = base_env_path("django==5.1 --hash=sha256:aa\n", "cp-test")
+
+            self.assertTrue(path.startswith(os.path.join(self.tmp, "envs")))
+            self.assertNotEqual(
+                path, base_env_path("django==5.1 --hash=sha256:bb\n", "cp-test")
+            )
+            self.assertNotEqual(
+                path, base_env_path("django==5.1 --hash=sha256:aa\n", "cp-other")
+            )
+
+    def test_missing_site_packages(self):
+        """A directory that is not a venv has no site-packages"""
+        with self.assertRaises(FileNotFoundError):
+            site_packages(self.tmp)
+        self.assertFalse(has_overlay(self.tmp, "/cache/env"))
+
+    def test_overlay_layers_base_below_venv(self):
+        """Packages of the base import in the venv; the venv's own take precedence"""
+        base = os.path.join(self.tmp, "base")
+        env_dir = os.path.join(self.tmp, "venv")
+        os.makedirs(base)
+        for name in ("jollof_base_probe", "jollof_shadowed_probe"):
+            with open(os.path.join(base, f"{name}.py"), "w") as f:
+                f.write("WHERE = 'base'\n")
+        subprocess.run(
+            [sys.executable, "-m", "venv", "--without-pip", env_dir], check=True
+        )
+        with open(
+            os.path.join(site_packages(env_dir), "jollof_shadowed_probe.py"), "w"
+        ) as f:
+            f.write("WHERE = 'venv'\n")
+
+        write_overlay(env_dir, base)
+
+        self.assertTrue(has_overlay(env_dir, base))
+        self.assertFalse(has_overlay(env_dir, os.path.join(self.tmp, "other")))
+        result = subprocess.run(
+            [
+                env_python(env_dir),
+                "-c",
+                "import jollof_base_probe as a, jollof_shadowed_probe as b; "
+                "print(a.WHERE, b.WHERE)",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout.split(), ["base", "venv"])
+
+    @unittest.skipUnless(os.name == "posix", "runs the sh pip command")
+    def test_pip_command_runs_base_pip_in_venv(self):
+        """The venv's pip command runs the base's pip with the venv's interpreter"""
+        base = os.path.join(self.tmp, "base")
+        env_dir = os.path.join(self.tmp, "venv")
+        os.makedirs(os.path.join(base, "pip"))
+        with open(os.path.join(base, "pip", "__main__.py"), "w") as f:
+            f.write("import sys; print(__file__, sys.prefix, *sys.argv[1:])\n")
+        subprocess.run(
+            [sys.executable, "-m", "venv", "--without-pip", env_dir], check=True
+        )
+        write_overlay(env_dir, base)
+        write_pip_commands(env_dir)
+
+        result = subprocess.run(
+            [os.path.join(env_dir, "bin", "pip"), "install", "-r", "requirements.txt"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        main, prefix, *args = result.stdout.split()
+        self.assertTrue(main.startswith(base))
+        self.assertEqual(os.path.realpath(prefix), os.path.realpath(env_dir))
+        self.assertEqual(args, ["install", "-r", "requirements.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
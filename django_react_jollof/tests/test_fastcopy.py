@@ -0,0 +1,130 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.fastcopy import Cloner
+
+
+class TestCloner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp, "src")
+        os.makedirs(os.path.join(self.src, "pkg", ".bin"))
+        with open(os.path.join(self.src, "pkg", "index.js"), "w") as f:
+            f.write("module.exports = 1;\n")
+        os.chmod(os.path.join(self.src, "pkg", "index.js"), 0o755)
+        os.symlink("../index.js", os.path.join(self.src, "pkg", ".bin", "run"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_clone_tree(self):
+        """Files, directories and symlinks are recreated"""
+        dst = os.path.join(self.tmp, "dst")
+        files, size = Cloner().clone_tree(self.src, dst)
+
+        self.assertEqual((files, size), (1, len("module.exports = 1;\n")))
+        with open(os.path.join(dst, "pkg", "index.js")) as f:
+            self.assertEqual(f.read(), "module.exports = 1;\n")
+        link = os.path.join(dst, "pkg", ".bin", "run")
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(os.readlink(link), "../index.js")
+        self.assertTrue(os.access(os.path.join(dst, "pkg", "index.js"), os.X_OK))
+
+    def test_clone_tree_skip(self):
+        """Skipped paths are left out, at any depth"""
+        dst = os.path.join(self.tmp, "dst")
+        files, _ = Cloner().clone_tree(self.src, dst, skip={"pkg/index.js"})
+
+        self.assertEqual(files, 0)
+        self.assertEqual(os.listdir(os.path.join(dst, "pkg")), [".bin"])
+
+        shutil.rmtree(dst)
+        Cloner().clone_tree(self.src, dst, skip={"pkg"})
+        self.assertEqual(os.listdir(dst), [])
+
+    def test_unsupported_method_is_dropped(self):
+        """A method the filesystem rejects is not tried again"""
+        error = OSError(errno.EXDEV, "cross-device link")
+
+        with patch(
+            "django_react_jollof.fastcopy.reflink_file", side_effect=error
+        ), patch("django_react_jollof.fastcopy.copy_range_file", side_effect=error):
+            cloner = Cloner(link=True)
+            with patch("os.link", side_effect=error) as mock_link:
+                first = cloner.clone_file(
+                    os.path.join(self.src, "pkg", "index.js"),
+                    os.path.join(self.tmp, "a.js"),
+                )
+                second = cloner.clone_file(
+                    os.path.join(self.src, "pkg", "index.js"),
+                    os.path.join(self.tmp, "b.js"),
+                )
+
+        self.assertEqual((first, second), ("copy", "copy"))
+        self.assertEqual(mock_link.call_count, 1)
+        self.assertEqual([name for name, _ in cloner.methods], ["copy"])
+
+    def test_hardlink_when_reflink_unsupported(self):
+        """Hardlinks are used when allowed and reflinks are not available"""
+        error = OSError(errno.EOPNOTSUPP, "not supported")
+        with patch("django_react_jollof.fastcopy.reflink_file", side_effect=error):
+            cloner = Cloner(link=True)
+            dst = os.path.join(self.tmp, "a.js")
+            method = cloner.clone_file(os.path.join(self.src, "pkg", "index.js"), dst)
+
+        self.assertEqual(method, "hardlink")
+        self.assertTrue(
+            os.path.samefile(dst, os.path.join(self.src, "pkg", "index.js"))
+        )
+
+    def test_no_hardlinks_when_disallowed(self):
+        """Files are never hardlinked unless the caller allows it"""
+        self.assertNotIn("hardlink", [name for name, _ in Cloner(link=False).methods])
+
+    def test_copy_file_range_without_links(self):
+        """Without links or reflinks, files are copied inside the kernel"""
+        if not hasattr(os, "copy_file_range"):
+            self.skipTest("copy_file_range is not available")
+
+        error = OSError(errno.EOPNOTSUPP, "not supported")
+        with patch("django_react_jollof.fastcopy.reflink_file", side_effect=error):
+            dst = os.path.join(self.tmp, "a.js")
+            method = Cloner(link=False).clone_file(
+                os.path.join(self.src, "pkg", "index.js"), dst
+            )
+
+        self.assertEqual(method, "copy_file_range")
+        with open(dst) as f:
+            self.assertEqual(f.read(), "module.exports = 1;\n")
+        self.assertTrue(os.access(dst, os.X_OK))
+
+    def test_clone_files(self):
+        """Files are cloned concurrently with the requested modes"""
+        jobs = [
+            (
+                os.path.join(self.src, "pkg", "index.js"),
+                os.path.join(self.tmp, "dst", str(i), "index.js"),
+                0o600,
+            )
+            for i in range(4)
+        ]
+        Cloner(link=False).clone_files(jobs, max_workers=2)
+
+        for _, dst, _ in jobs:
+            self.assertEqual(os.stat(dst).st_mode & 0o777, 0o600)
+
+    def test_real_errors_are_raised(self):
+        """Errors unrelated to filesystem support propagate"""
+        with self.assertRaises(FileNotFoundError):
+            Cloner().clone_file(
+                os.path.join(self.src, "missing"), os.path.join(self.tmp, "x")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
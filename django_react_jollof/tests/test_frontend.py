@@ -1,39 +1,51 @@
+import json
 import os
 import shutil
+import tempfile
 import unittest
-from unittest.mock import call, patch, MagicMock, mock_open
-import json
+from unittest.mock import patch
+
 from django_react_jollof.frontend import (
+    add_frontend_files,
     check_node_version,
-    scaffold_frontend,
-    setup_auth_buttons,
-    replace_placeholder_in_file,
-    finalise_setup,
-    update_package_json,
+    NPM_CI_CMD,
+    NPM_INSTALL_CMD,
+    install_frontend_dependencies,
+    load_lockfile,
+    lockfile_name,
+    render_package_json,
+)
+from django_react_jollof.tree import OutputTree
+from django_react_jollof.utils import FRONTEND_CHOICES
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates"
 )
 
 
 class TestFrontendFunctions(unittest.TestCase):
     def setUp(self):
-        """Set up required directories and files for tests."""
-        os.makedirs("test_templates/frontend", exist_ok=True)
-        os.makedirs("test_templates/helper_files/navbar", exist_ok=True)
-
-        # Create placeholder files required for the test
-        with open("test_templates/helper_files/navbar/BootstrapNavbar.jsx", "w") as f:
-            f.write("// Placeholder for BootstrapNavbar.jsx")
-        with open("test_templates/helper_files/gitignore.txt", "w") as f:
-            f.write("# Placeholder for .gitignore")
-        with open("test_templates/helper_files/LICENSE", "w") as f:
-            f.write("MIT License")
-        with open("test_templates/helper_files/README.md", "w") as f:
-            f.write("# Placeholder for README")
-        with open("test_templates/helper_files/eslintrc.json", "w") as f:
-            f.write("{}")
+        """Generate projects into a temporary directory."""
+        self.tmp = tempfile.mkdtemp()
 
     def tearDown(self):
-        """Clean up the created test directories and files."""
-        shutil.rmtree("test_templates", ignore_errors=True)
+        """Clean up the generated projects."""
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def render_project(self, frontend, social_login, secrets=None):
+        """Write the frontend files of a project and return its directory."""
+        project_dir = os.path.join(self.tmp, f"{frontend}-{social_login}")
+        tree = OutputTree()
+        add_frontend_files(
+            tree, TEMPLATE_DIR, frontend, social_login, "TestProject", secrets
+        )
+        with patch("click.echo"):
+            tree.commit(project_dir)
+        return project_dir
+
+    def read(self, *path):
+        with open(os.path.join(*path), "r") as file:
+            return file.read()
 
     @patch("subprocess.run")
     def test_check_node_version_success(self, mock_run):
@@ -51,279 +63,167 @@ class TestFrontendFunctions(unittest.TestCase):
         with self.assertRaises(SystemExit):
             check_node_version()
 
-    @patch("django_react_jollof.frontend.shutil.copy")
-    @patch("os.getcwd", return_value="frontend")
-    @patch("django_react_jollof.frontend.copy_template_file")  # Mock copy_template_file
-    @patch("django_react_jollof.frontend.write_to_env_file")
-    @patch("django_react_jollof.frontend.setup_auth_buttons")
-    @patch("django_react_jollof.frontend.replace_placeholder_in_file")
-    @patch("django_react_jollof.frontend.update_package_json")
-    @patch("django_react_jollof.frontend.copy_templates")
-    @patch("django_react_jollof.frontend.delete_file")  # Mock delete_file
-    @patch("os.makedirs")
-    @patch("os.chdir")
-    @patch("subprocess.run")
-    @patch("django_react_jollof.frontend.check_node_version")
-    def test_scaffold_frontend(
-        self,
-        mock_check_node_version,
-        mock_run,
-        mock_chdir,
-        mock_makedirs,
-        mock_delete_file,
-        mock_copy_templates,
-        mock_update_package_json,
-        mock_replace_placeholder_in_file,
-        mock_setup_auth_buttons,
-        mock_write_to_env_file,
-        mock_copy_template_file,
-        mock_getcwd,
-        mock_copy,
-    ):
-        """Test the full scaffold_frontend function with mocks."""
-        # Mock Node.js version check to always pass
-        mock_check_node_version.return_value = None
-
-        # Mock subprocess calls
-        mock_run.return_value = MagicMock()
-
-        # Mock directory operations
-        mock_chdir.return_value = None
-        mock_makedirs.return_value = None
-
-        # Mock file operations
-        mock_copy_templates.return_value = None
-        mock_delete_file.return_value = None
-        mock_update_package_json.return_value = None
-        mock_replace_placeholder_in_file.return_value = None
-        mock_setup_auth_buttons.return_value = None
-        mock_write_to_env_file.return_value = None
-        mock_copy_template_file.return_value = None
-        mock_copy.return_value = None
-
-        # Test parameters
-        template_dir = "test_templates"
-        frontend = "bootstrap"
-        social_login = "google"
-        project_name = "TestProject"
-
-        # Execute the function under test
-        try:
-            scaffold_frontend(template_dir, frontend, social_login, project_name)
-        except SystemExit:
-            self.fail("scaffold_frontend raised SystemExit unexpectedly!")
-
-        # Assertions for Node.js version check
-        mock_check_node_version.assert_called_once()
-
-        # Assertions for subprocess calls
-        mock_run.assert_any_call(
-            ["npm", "create", "vite@4.4.0", "frontend", "--", "--template", "react"],
-            check=True,
-            text=True,
-        )
-        mock_run.assert_any_call(["npm", "install"], check=True, text=True)
-
-        # Assertions for directory operations
-        mock_chdir.assert_any_call("frontend")
-        mock_makedirs.assert_any_call("src/components", exist_ok=True)
-
-        # Assertions for template copying
-        mock_copy_templates.assert_called_once_with(
-            f"{template_dir}/frontend", os.getcwd(), "frontend"
-        )
-
-        # Assert Navbar template was copiied
-        mock_copy.assert_has_calls(
-            [
-                call(
-                    "test_templates/helper_files/navbar/BootstrapNavbar.jsx",
-                    "src/components/Navbar.jsx",
+    def test_add_frontend_files_bootstrap(self):
+        """The Bootstrap navbar and dependencies are used without social login."""
+        project_dir = self.render_project("bootstrap", "none")
+        frontend_dir = os.path.join(project_dir, "frontend")
+
+        navbar = self.read(frontend_dir, "src", "components", "Navbar.jsx")
+        self.assertIn("react-bootstrap", navbar)
+        self.assertNotIn("{{ PROJECT_NAME }}", navbar)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(frontend_dir, "src", "components", "auth_buttons")
+            )
+        )
+        self.assertEqual(self.read(frontend_dir, ".env"), "VITE_SOCIAL_LOGIN=none\n")
+
+        package = json.loads(self.read(frontend_dir, "package.json"))
+        self.assertEqual(package["dependencies"]["bootstrap"], "^5.2.3")
+        self.assertNotIn("@mui/material", package["dependencies"])
+
+    def test_add_frontend_files_material_overlays(self):
+        """The Material overlays replace the base files in the tree."""
+        project_dir = self.render_project(
+            "material", "google", {"GOOGLE_CLIENT_ID": "id"}
+        )
+        frontend_dir = os.path.join(project_dir, "frontend")
+        helper_files_dir = os.path.join(TEMPLATE_DIR, "helper_files")
+
+        for src, dst in [
+            ("mui_main.jsx", ("src", "main.jsx")),
+            ("mui_main.css", ("src", "styles", "main.css")),
+            ("Login.jsx", ("src", "pages", "Login.jsx")),
+            ("Register.jsx", ("src", "pages", "Register.jsx")),
+        ]:
+            self.assertEqual(
+                self.read(frontend_dir, *dst), self.read(helper_files_dir, "mui", src)
+            )
+        self.assertIn(
+            "@mui/material", self.read(frontend_dir, "src", "components", "Navbar.jsx")
+        )
+        for name in ["AuthButtons.jsx", "GoogleLoginButton.jsx"]:
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(
+                        frontend_dir, "src", "components", "auth_buttons", name
+                    )
                 )
-            ]
-        )
-
-        # Assertions for file deletion
-        expected_delete_calls = [
-            call("frontend/.gitignore"),
-            call("frontend/.eslintrc.cjs"),
-            call("frontend/src/App.css"),
-            call("frontend/src/index.css"),
-        ]
-        mock_delete_file.assert_has_calls(expected_delete_calls, any_order=True)
-
-        # Assertions for copying specific files
-        mock_copy_template_file.assert_any_call(
-            f"{template_dir}/helper_files/gitignore.txt",
-            "frontend/.gitignore",
-            ".gitignore file",
-        )
-        mock_copy_template_file.assert_any_call(
-            f"{template_dir}/helper_files/eslintrc.json",
-            "frontend/frontend/.eslintrc.json",
-            ".eslintrc.json file",
-        )
-
-        # Assertions for package.json updates
-        mock_update_package_json.assert_called_once_with(
-            "package.json", {"react-bootstrap": "^2.7.4", "bootstrap": "^5.2.3"}
-        )
-
-        # Assertions for placeholder replacements
-        mock_replace_placeholder_in_file.assert_any_call(
-            "frontend/index.html", "{{ PROJECT_NAME }}", project_name
-        )
-        mock_replace_placeholder_in_file.assert_any_call(
-            "src/components/Navbar.jsx", "{{ PROJECT_NAME }}", project_name
-        )
-
-        # Assertions for authentication buttons setup
-        mock_setup_auth_buttons.assert_called_once_with(template_dir, social_login)
-
-        # Assertions for writing to .env file
-        mock_write_to_env_file.assert_called_once_with(social_login, None)
-
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data="Placeholder: {{ PROJECT_NAME }}",
-    )
-    @patch(
-        "os.path.isfile", return_value=True
-    )  # Mock os.path.isfile to always return True
-    def test_replace_placeholder_in_file(self, mock_isfile, mock_open_func):
-        """Test placeholder replacement in a file."""
-        file_path = "test_file.txt"
-
-        # Call the function
-        replace_placeholder_in_file(file_path, "{{ PROJECT_NAME }}", "TestProject")
-
-        # Assert file read and write
-        mock_open_func.assert_any_call(file_path, "r")
-        mock_open_func.assert_any_call(file_path, "w")
-
-        # Assert content written
-        file_handle = mock_open_func()
-        file_handle.write.assert_called_once_with("Placeholder: TestProject")
-
-    @patch("os.makedirs")
-    @patch("shutil.copy")
-    def test_setup_auth_buttons(self, mock_copy, mock_makedirs):
-        """Test setup of social login buttons."""
-        template_dir = "test_templates"
-        setup_auth_buttons(template_dir, "google")
-
-        # Assert directory creation
-        mock_makedirs.assert_called_once_with(
-            "src/components/auth_buttons", exist_ok=True
-        )
-
-        # Assert button files copying
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/auth_buttons/AuthButtons.jsx",
-            "src/components/auth_buttons/AuthButtons.jsx",
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/auth_buttons/GoogleLoginButton.jsx",
-            "src/components/auth_buttons/GoogleLoginButton.jsx",
+            )
+        self.assertEqual(
+            self.read(frontend_dir, ".env"),
+            "VITE_SOCIAL_LOGIN=google\n"
+            "VITE_GOOGLE_CLIENT_ID=id\n"
+            "VITE_GOOGLE_CLIENT_SECRET=\n",
         )
 
-    @patch("os.getcwd", return_value="test_templates")
-    @patch("shutil.copy")
-    def test_finalise_setup(self, mock_copy, mock_getcwd):
-        """Test finalizing setup by generating additional files."""
-        template_dir = "test_templates"
+    def test_render_package_json_unknown_framework(self):
+        """Unknown frameworks keep the base dependencies."""
+        with patch("click.echo"):
+            package = json.loads(render_package_json(TEMPLATE_DIR, "tailwind"))
 
-        # Test with Bootstrap frontend
-        finalise_setup(template_dir, "bootstrap")
+        with open(os.path.join(TEMPLATE_DIR, "frontend", "package.json")) as file:
+            self.assertEqual(package, json.load(file))
 
-        # Validate that required files are being copied
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/gitignore.txt",
-            os.path.join("test_templates", ".gitignore"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/LICENSE", os.path.join(template_dir, "LICENSE")
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/README.md",
-            os.path.join(template_dir, "README.md"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/eslintrc.json",
-            os.path.join(template_dir, "frontend/.eslintrc.json"),
-        )
-
-        # Ensure Material framework-specific files are not copied for Bootstrap
-        self.assertNotIn(
-            call(
-                "test_templates/helper_files/mui/mui_main.jsx",
-                os.path.join(template_dir, "frontend/src/main.jsx"),
+    @patch("subprocess.run")
+    @patch("django_react_jollof.frontend.node_store")
+    def test_install_frontend_dependencies_from_store(self, mock_node_store, mock_run):
+        """A stored node_modules is restored instead of running npm."""
+        mock_node_store.restore.return_value = "10 files (1.0 MB) via hardlink"
+
+        install_frontend_dependencies("frontend")
+
+        mock_node_store.restore.assert_called_once_with(
+            mock_node_store.store_key.return_value, "frontend"
+        )
+        mock_run.assert_not_called()
+        mock_node_store.save.assert_not_called()
+
+    def write_lockfile(self, template_dir, frontend, package_json):
+        """Ship a lockfile resolved for `package_json`."""
+        package = json.loads(package_json)
+        lockfile = {
+            "lockfileVersion": 3,
+            "packages": {
+                "": {
+                    "dependencies": package["dependencies"],
+                    "devDependencies": package["devDependencies"],
+                }
+            },
+        }
+        os.makedirs(os.path.join(template_dir, "lockfiles"), exist_ok=True)
+        with open(
+            os.path.join(
+                template_dir, "lockfiles", f"frontend-{frontend}.package-lock.json"
             ),
-            mock_copy.call_args_list,
-        )
-
-        # Reset mock for the Material framework test
-        mock_copy.reset_mock()
+            "w",
+        ) as file:
+            json.dump(lockfile, file)
+
+    def test_load_lockfile(self):
+        """A shipped lockfile is used only while it matches package.json."""
+        template_dir = os.path.join(self.tmp, "templates")
+        package_json = render_package_json(TEMPLATE_DIR, "material")
+        self.assertIsNone(load_lockfile(template_dir, "material", package_json))
+
+        self.write_lockfile(template_dir, "material", package_json)
+        lockfile = load_lockfile(template_dir, "material", package_json)
+        self.assertEqual(json.loads(lockfile)["lockfileVersion"], 3)
+
+        stale = json.loads(package_json)
+        stale["dependencies"]["react"] = "^19.0.0"
+        with patch("django_react_jollof.frontend.logger") as mock_logger:
+            self.assertIsNone(
+                load_lockfile(template_dir, "material", json.dumps(stale))
+            )
+        mock_logger.warning.assert_called_once()
+
+    def test_shipped_lockfiles_match_package_json(self):
+        """Every shipped lockfile was resolved from the current package.json."""
+        for frontend in FRONTEND_CHOICES.values():
+            with self.subTest(frontend=frontend):
+                path = os.path.join(TEMPLATE_DIR, "lockfiles", lockfile_name(frontend))
+                if not os.path.exists(path):
+                    self.skipTest(f"{lockfile_name(frontend)} is not shipped")
+                package_json = render_package_json(TEMPLATE_DIR, frontend)
+                with open(path) as file:
+                    self.assertEqual(
+                        load_lockfile(TEMPLATE_DIR, frontend, package_json),
+                        file.read(),
+                        f"Run `django-react-jollof lock --frontend {frontend}`.",
+                    )
+
+    @patch("django_react_jollof.frontend.load_lockfile")
+    def test_add_frontend_files_with_lockfile(self, mock_load_lockfile):
+        """The shipped lockfile is written next to package.json."""
+        mock_load_lockfile.return_value = '{"lockfileVersion": 3}'
+        project_dir = self.render_project("bootstrap", "none")
 
-        # Test with Material frontend
-        finalise_setup(template_dir, "material")
-
-        # Validate that Material framework-specific files are copied
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/mui/mui_main.jsx",
-            os.path.join(template_dir, "frontend/src/main.jsx"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/mui/mui_main.css",
-            os.path.join(template_dir, "frontend/src/styles/main.css"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/mui/Login.jsx",
-            os.path.join(template_dir, "frontend/src/pages/Login.jsx"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/mui/Register.jsx",
-            os.path.join(template_dir, "frontend/src/pages/Register.jsx"),
-        )
-
-        # Validate common files are still being copied
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/gitignore.txt",
-            os.path.join(template_dir, ".gitignore"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/LICENSE", os.path.join(template_dir, "LICENSE")
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/README.md",
-            os.path.join(template_dir, "README.md"),
-        )
-        mock_copy.assert_any_call(
-            "test_templates/helper_files/eslintrc.json",
-            os.path.join(template_dir, "frontend/.eslintrc.json"),
+        self.assertEqual(
+            self.read(project_dir, "frontend", "package-lock.json"),
+            '{"lockfileVersion": 3}',
         )
 
-    @patch("builtins.open", new_callable=mock_open)
-    def test_update_package_json(self, mock_open_func):
-        """Test updating package.json."""
-        mock_open_func.return_value.read.return_value = '{"dependencies": {}}'
-        updates = {"react-router-dom": "^6.0.0"}
-        update_package_json("package.json", updates)
+    @patch("django_react_jollof.frontend.run_streaming")
+    @patch("django_react_jollof.frontend.node_store")
+    def test_install_frontend_dependencies_with_npm_ci(self, mock_node_store, mock_run):
+        """Projects with a lockfile install with npm ci, others with npm install."""
+        mock_node_store.LOCKFILE = "package-lock.json"
+        mock_node_store.restore.return_value = None
+        frontend_dir = os.path.join(self.tmp, "frontend")
+        os.makedirs(frontend_dir)
 
-        # Assert file read and write
-        mock_open_func.assert_any_call("package.json", "r")
-        mock_open_func.assert_any_call("package.json", "w")
+        with patch("click.echo"):
+            install_frontend_dependencies(frontend_dir)
+            with open(os.path.join(frontend_dir, "package-lock.json"), "w") as file:
+                file.write("{}")
+            install_frontend_dependencies(frontend_dir)
 
-        # Assert updated JSON structure
-        file_handle = mock_open_func()
-        written_content = "".join(
-            call.args[0] for call in file_handle.write.call_args_list
-        )
         self.assertEqual(
-            json.loads(written_content),
-            {"dependencies": {"react-router-dom": "^6.0.0"}},
+            [call.args[0] for call in mock_run.call_args_list],
+            [NPM_INSTALL_CMD, NPM_CI_CMD],
         )
+        self.assertEqual(mock_node_store.save.call_count, 2)
 
 
 if __name__ == "__main__":
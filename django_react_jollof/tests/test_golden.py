@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import golden
+from django_react_jollof.tree import OutputTree
+
+
+class TestGolden(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        env = patch.dict(os.environ, {"JOLLOF_CACHE_DIR": os.path.join(self.tmp, "c")})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def write(self, path, content=""):
+        path = os.path.join(self.tmp, *path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def make_tree(self, secret="s3cret", package="{}"):
+        tree = OutputTree()
+        tree.add_file(self.write("t/LICENSE", "MIT\n"), "LICENSE")
+        tree.add_file(
+            self.write("t/index.html", "<title>{{ PROJECT_NAME }}</title>\n"),
+            "frontend/index.html",
+        )
+        tree.add_text("frontend/package.json", package)
+        tree.add_text("backend/.env", f"SECRET={secret}\n")
+        return tree
+
+    def make_project(self):
+        """Lay out a cooked project, as the steps leave it."""
+        for path in (
+            "p/LICENSE",
+            "p/frontend/index.html",
+            "p/frontend/package.json",
+            "p/frontend/node_modules/react/index.js",
+            "p/backend/.env",
+            "p/backend/db.sqlite3",
+            "p/backend/.venv/pyvenv.cfg",
+            "p/.jollof/journal.json",
+        ):
+            self.write(path, path)
+        return os.path.join(self.tmp, "p")
+
+    def test_project_paths(self):
+        """Rendered and generated files are per project, verbatim templates are not"""
+        self.assertEqual(
+            golden.project_paths(self.make_tree()),
+            {"frontend/index.html", "frontend/package.json", "backend/.env"},
+        )
+
+    def test_snapshot_key(self):
+        """The key follows options and build inputs, not secrets"""
+        key = golden.snapshot_key(
+            self.make_tree(), "bootstrap", "none", ["django"], "a"
+        )
+
+        self.assertEqual(
+            key,
+            golden.snapshot_key(
+                self.make_tree(secret="other"), "bootstrap", "none", ["django"], "a"
+            ),
+        )
+        for other in (
+            golden.snapshot_key(self.make_tree(), "material", "none", ["django"], "a"),
+            golden.snapshot_key(self.make_tree(), "bootstrap", "none", ["pyjwt"], "a"),
+            golden.snapshot_key(self.make_tree(), "bootstrap", "none", ["django"], "b"),
+            golden.snapshot_key(
+                self.make_tree(package='{"a": 1}'), "bootstrap", "none", ["django"], "a"
+            ),
+        ):
+            self.assertNotEqual(key, other)
+
+    def test_save_and_restore(self):
+        """Only the shared files are stored; node_modules is linked back"""
+        project = self.make_project()
+        golden.save("k", project, golden.project_paths(self.make_tree()))
+        self.assertTrue(golden.is_stored("k"))
+
+        dest = os.path.join(self.tmp, "new")
+        golden.restore("k", dest)
+
+        self.assertEqual(sorted(os.listdir(dest)), ["LICENSE", "backend", "frontend"])
+        self.assertEqual(os.listdir(os.path.join(dest, "backend")), ["db.sqlite3"])
+        self.assertEqual(os.listdir(os.path.join(dest, "frontend")), ["node_modules"])
+        module = os.path.join("frontend", "node_modules", "react", "index.js")
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(golden.snapshot_path("k"), module),
+                os.path.join(dest, module),
+            )
+        )
+
+    def test_incomplete_project_is_not_saved(self):
+        """A project without its database does not become a golden project"""
+        project = self.make_project()
+        os.remove(os.path.join(project, "backend", "db.sqlite3"))
+
+        with self.assertRaises(FileNotFoundError):
+            golden.save("k", project, [])
+
+        self.assertFalse(golden.is_stored("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
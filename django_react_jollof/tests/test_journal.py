@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from django_react_jollof.journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.project_dir = os.path.join(self.tmp, "TestProject")
+
+    def test_round_trip(self):
+        """Recorded steps and options survive a reload"""
+        os.makedirs(self.project_dir)
+        journal = Journal(self.project_dir)
+        journal.start()
+        journal.options = {"frontend": "bootstrap", "social_login": "none"}
+        journal.record("pip install", "abc")
+        journal.record_failure("npm install", "exited with status 1")
+
+        loaded = Journal(self.project_dir)
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.options["frontend"], "bootstrap")
+        self.assertTrue(loaded.is_done("pip install", "abc"))
+        self.assertFalse(loaded.is_done("pip install", "def"))
+        self.assertFalse(loaded.is_done("npm install", "abc"))
+        self.assertEqual(loaded.steps["npm install"]["status"], "failed")
+
+    def test_kept_in_memory_until_started(self):
+        """Steps finished before the project is written are saved with it"""
+        os.makedirs(self.project_dir)
+        journal = Journal(self.project_dir)
+        journal.record("pip install", "abc")
+        self.assertFalse(os.path.exists(journal.path))
+
+        journal.start()
+        journal.record("project files", "def")
+
+        loaded = Journal(self.project_dir)
+        self.assertTrue(loaded.load())
+        self.assertEqual(sorted(loaded.steps), ["pip install", "project files"])
+
+    def test_load_missing_or_foreign(self):
+        """Missing, corrupt and other-version journals are not loaded"""
+        journal = Journal(self.project_dir)
+        self.assertFalse(journal.load())
+
+        os.makedirs(os.path.dirname(journal.path))
+        with open(journal.path, "w") as f:
+            f.write("{not json")
+        self.assertFalse(journal.load())
+
+        with open(journal.path, "w") as f:
+            json.dump({"version": 0, "steps": {}}, f)
+        self.assertFalse(journal.load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_react_jollof.lock import (
+    NPM_LOCK_CMD,
+    PIP_LOCK_CMD,
+    lock,
+    lock_backend,
+    lock_frontend,
+    published_hashes,
+)
+from django_react_jollof.template_manifest import TEMPLATE_ROOT
+
+
+def fake_npm(command, cwd, label):
+    """Resolve package.json into a lockfile, as npm would."""
+    with open(os.path.join(cwd, "package.json")) as file:
+        package = json.load(file)
+    with open(os.path.join(cwd, "package-lock.json"), "w") as file:
+        json.dump({"lockfileVersion": 3, "packages": {"": package}}, file)
+    return os.path.join(cwd, "npm.log")
+
+
+# What pip resolves on Linux, and Django's Windows-only dependency
+REPORTS = {
+    "tzdata": [
+        {
+            "metadata": {"name": "tzdata", "version": "2024.2"},
+            "download_info": {"archive_info": {"hashes": {"sha256": "ccc"}}},
+        },
+    ],
+    None: [
+        {
+            "metadata": {
+                "name": "Django",
+                "version": "5.1.4",
+                "requires_dist": [
+                    "asgiref<4,>=3.8.1",
+                    'tzdata; sys_platform == "win32"',
+                    'argon2-cffi>=19.1.0; extra == "argon2"',
+                    'backports.zoneinfo; python_version < "3.9"',
+                ],
+            },
+            "download_info": {"archive_info": {"hashes": {"sha256": "aaa"}}},
+        },
+        {
+            "metadata": {"name": "asgiref", "version": "3.8.1"},
+            "download_info": {"archive_info": {"hash": "sha256=bbb"}},
+        },
+    ],
+}
+
+
+def fake_pip(command, label):
+    """Write an installation report, as `pip install --dry-run --report` would."""
+    report = {"install": REPORTS.get(command[-1], REPORTS[None])}
+    with open(command[command.index("--report") + 1], "w") as file:
+        json.dump(report, file)
+
+
+class TestLock(unittest.TestCase):
+
+    def setUp(self):
+        self.templates = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.templates)
+        os.makedirs(os.path.join(self.templates, "frontend"))
+        shutil.copy(
+            os.path.join(TEMPLATE_ROOT, "frontend", "package.json"),
+            os.path.join(self.templates, "frontend", "package.json"),
+        )
+
+    @patch("django_react_jollof.lock.run_streaming", side_effect=fake_npm)
+    def test_lock_frontend(self, mock_run):
+        """The resolved lockfile is written below the templates"""
+        with patch("click.echo"):
+            path = lock_frontend("material", self.templates)
+
+        self.assertEqual(
+            path,
+            os.path.join(
+                self.templates, "lockfiles", "frontend-material.package-lock.json"
+            ),
+        )
+        with open(path) as file:
+            root = json.load(file)["packages"][""]
+        self.assertIn("@mui/material", root["dependencies"])
+        self.assertEqual(mock_run.call_args[0][0], NPM_LOCK_CMD)
+
+    @patch("django_react_jollof.lock.published_hashes")
+    @patch(
+        "django_react_jollof.lock.interpreter_abi",
+        return_value="cpython-311-linux-x86_64",
+    )
+    @patch("django_react_jollof.lock.run_streaming", side_effect=fake_pip)
+    def test_lock_backend(self, mock_run, mock_abi, mock_published):
+        """Every published file is hashed and other platforms' dependencies kept"""
+        mock_published.side_effect = lambda name, version: {f"{name[:3]}-whl"}
+
+        path = lock_backend(self.templates, "python3.11")
+
+        self.assertEqual(
+            path,
+            os.path.join(
+                self.templates, "lockfiles", "backend-cpython-311.requirements.txt"
+            ),
+        )
+        with open(path) as file:
+            content = file.read()
+        self.assertIn("# Resolved for: cpython-311\n", content)
+        lines = [line for line in content.splitlines() if line[:1] != "#"]
+        self.assertEqual(
+            lines,
+            [
+                "asgiref==3.8.1 \\",
+                "    --hash=sha256:asg-whl \\",
+                "    --hash=sha256:bbb",
+                "django==5.1.4 \\",
+                "    --hash=sha256:Dja-whl \\",
+                "    --hash=sha256:aaa",
+                'tzdata==2024.2 ; sys_platform == "win32" \\',
+                "    --hash=sha256:ccc \\",
+                "    --hash=sha256:tzd-whl",
+            ],
+        )
+        self.assertEqual(
+            mock_run.call_args_list[0][0][0][: len(PIP_LOCK_CMD) + 1],
+            ["python3.11"] + PIP_LOCK_CMD,
+        )
+        mock_abi.assert_called_once_with("python3.11")
+        self.assertEqual(mock_run.call_args_list[1][0][0][-1], "tzdata")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("urllib.request.urlopen")
+    def test_published_hashes(self, mock_urlopen):
+        """Every file of the pinned release is hashed, and only those"""
+        releases = {
+            "5.1.4": [{"digests": {"sha256": "whl"}}, {"digests": {"sha256": "sdist"}}],
+            "5.1.3": [{"digests": {"sha256": "old"}}],
+        }
+        mock_urlopen.return_value = io.BytesIO(
+            json.dumps({"releases": releases}).encode()
+        )
+
+        self.assertEqual(published_hashes("Django", "5.1.4"), {"whl", "sdist"})
+        self.assertEqual(
+            mock_urlopen.call_args[0][0], "https://pypi.org/pypi/Django/json"
+        )
+
+        mock_urlopen.return_value = io.BytesIO(
+            json.dumps({"releases": releases}).encode()
+        )
+        with self.assertRaises(ValueError):
+            published_hashes("Django", "9.9")
+
+    @patch("django_react_jollof.lock.load_bundle", return_value=None)
+    @patch("django_react_jollof.lock.lock_frontend", return_value="frontend.json")
+    @patch("django_react_jollof.lock.lock_backend", return_value="backend.txt")
+    def test_lock_selection(self, mock_backend, mock_frontend, mock_load_bundle):
+        """Naming a framework locks just that; no option locks everything"""
+        CliRunner().invoke(lock, ["--frontend", "bootstrap"])
+        mock_backend.assert_not_called()
+        mock_frontend.assert_called_once_with("bootstrap")
+
+        mock_frontend.reset_mock()
+        CliRunner().invoke(lock, ["--backend"])
+        mock_backend.assert_called_once()
+        mock_frontend.assert_not_called()
+
+        CliRunner().invoke(lock, [])
+        self.assertEqual(mock_backend.call_count, 2)
+        self.assertEqual(mock_frontend.call_count, 2)
+
+    @patch("django_react_jollof.lock.load_bundle", return_value=None)
+    @patch("django_react_jollof.lock.lock_backend", return_value="backend.txt")
+    def test_lock_backend_per_python(self, mock_backend, mock_load_bundle):
+        """The backend is locked once for every interpreter given"""
+        result = CliRunner().invoke(
+            lock, ["--backend", "--python", "python3.10", "--python", "python3.11"]
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(
+            [c.kwargs["python"] for c in mock_backend.call_args_list],
+            ["python3.10", "python3.11"],
+        )
+
+    @patch("django_react_jollof.lock.load_bundle")
+    def test_lock_needs_source_checkout(self, mock_load_bundle):
+        """Installed packages cannot regenerate their own lockfiles"""
+        result = CliRunner().invoke(lock, [])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("source checkout", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
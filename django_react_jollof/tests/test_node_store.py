@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import node_store
+
+
+class TestNodeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.env = patch.dict(
+            os.environ, {"JOLLOF_CACHE_DIR": os.path.join(self.tmp, "cache")}
+        )
+        self.env.start()
+
+        self.frontend = os.path.join(self.tmp, "first", "frontend")
+        os.makedirs(os.path.join(self.frontend, "node_modules", "react"))
+        with open(os.path.join(self.frontend, "package.json"), "w") as f:
+            json.dump({"dependencies": {"react": "^18.2.0"}}, f)
+        with open(os.path.join(self.frontend, "package-lock.json"), "w") as f:
+            f.write("{}")
+        with open(
+            os.path.join(self.frontend, "node_modules", "react", "index.js"), "w"
+        ) as f:
+            f.write("export default {};\n")
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_store_key_follows_package_json(self):
+        """Any change to package.json changes the key"""
+        key = node_store.store_key(self.frontend)
+        with open(os.path.join(self.frontend, "package.json"), "w") as f:
+            json.dump({"dependencies": {"react": "^18.3.0"}}, f)
+
+        self.assertNotEqual(key, node_store.store_key(self.frontend))
+
+    def test_store_key_follows_lockfile(self):
+        """A different lockfile, or none, changes the key"""
+        key = node_store.store_key(self.frontend)
+        with open(os.path.join(self.frontend, "package-lock.json"), "w") as f:
+            f.write('{"lockfileVersion": 3}')
+        locked_key = node_store.store_key(self.frontend)
+        os.remove(os.path.join(self.frontend, "package-lock.json"))
+
+        self.assertNotEqual(key, locked_key)
+        self.assertNotIn(node_store.store_key(self.frontend), [key, locked_key])
+
+    def test_restore_miss(self):
+        """Nothing is restored for an unknown package.json"""
+        self.assertIsNone(node_store.restore("unknown", self.frontend))
+
+    def test_save_and_restore(self):
+        """A stored node_modules is recreated in another project"""
+        key = node_store.store_key(self.frontend)
+        node_store.save(key, self.frontend)
+        self.assertTrue(node_store.is_stored(key))
+
+        other = os.path.join(self.tmp, "second", "frontend")
+        os.makedirs(other)
+        summary = node_store.restore(key, other)
+
+        self.assertIn("1 files", summary)
+        with open(os.path.join(other, "node_modules", "react", "index.js")) as f:
+            self.assertEqual(f.read(), "export default {};\n")
+        self.assertTrue(os.path.isfile(os.path.join(other, "package-lock.json")))
+
+    def test_restore_replaces_existing_node_modules(self):
+        """A stale node_modules from an earlier run is replaced"""
+        key = node_store.store_key(self.frontend)
+        node_store.save(key, self.frontend)
+
+        stale = os.path.join(self.frontend, "node_modules", "stale.js")
+        open(stale, "w").close()
+        node_store.restore(key, self.frontend)
+
+        self.assertFalse(os.path.exists(stale))
+
+
+if __name__ == "__main__":
+    unittest.main()
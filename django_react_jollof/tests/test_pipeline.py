@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.journal import Journal
+from django_react_jollof.pipeline import TaskGraph
+
+
+class TestTaskGraph(unittest.TestCase):
+
+    def test_run_respects_dependencies(self):
+        """Tasks only start once their dependencies have finished"""
+        order = []
+        graph = TaskGraph()
+        graph.add("settings", lambda: order.append("settings"))
+        graph.add("migrate", lambda: order.append("migrate"), ["settings"])
+        graph.add("startproject", lambda: order.append("startproject"))
+        graph.run()
+
+        self.assertLess(order.index("settings"), order.index("migrate"))
+        self.assertEqual(len(order), 3)
+
+    def test_phases_are_recorded(self):
+        """Every task that ran is recorded as a phase, in start order"""
+        graph = TaskGraph()
+        graph.add("wheelhouse", lambda: None)
+        graph.add("pip install", lambda: None, ["wheelhouse"])
+        graph.run()
+
+        self.assertEqual(
+            [record.name for record in graph.phases()], ["wheelhouse", "pip install"]
+        )
+
+    def test_independent_tasks_overlap(self):
+        """Independent tasks run at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+        graph = TaskGraph()
+        graph.add("pip install", barrier.wait)
+        graph.add("npm install", barrier.wait)
+
+        # Would raise BrokenBarrierError if the tasks ran one after the other
+        graph.run()
+
+    def test_failure_stops_dependents(self):
+        """A failing task prevents its dependents from running"""
+        ran = []
+
+        def fail():
+            raise SystemExit(1)
+
+        graph = TaskGraph()
+        graph.add("pip install", fail)
+        graph.add("migrate", lambda: ran.append("migrate"), ["pip install"])
+
+        with self.assertRaises(SystemExit):
+            graph.run()
+        self.assertEqual(ran, [])
+
+    def test_unknown_dependency(self):
+        """Dependencies on undefined tasks are rejected"""
+        graph = TaskGraph()
+        graph.add("migrate", lambda: None, ["settings"])
+
+        with self.assertRaises(ValueError):
+            graph.run()
+
+    def test_cycle(self):
+        """Dependency cycles are rejected"""
+        graph = TaskGraph()
+        graph.add("a", lambda: None, ["b"])
+        graph.add("b", lambda: None, ["a"])
+
+        with self.assertRaises(ValueError):
+            graph.order()
+
+    def test_duplicate_task(self):
+        """Task names must be unique"""
+        graph = TaskGraph()
+        graph.add("a", lambda: None)
+
+        with self.assertRaises(ValueError):
+            graph.add("a", lambda: None)
+
+    def test_critical_path(self):
+        """The critical path follows the slowest chain of dependencies"""
+        graph = TaskGraph()
+        graph.add("pip install", lambda: time.sleep(0.05))
+        graph.add("startproject", lambda: None)
+        graph.add("migrate", lambda: None, ["startproject", "pip install"])
+        graph.add("node check", lambda: None)
+        graph.run()
+
+        path, total = graph.critical_path()
+        self.assertEqual(path, ["pip install", "migrate"])
+        self.assertGreaterEqual(total, 0.05)
+
+    @patch("click.echo")
+    def test_journal_skips_done_tasks(self, mock_echo):
+        """Tasks recorded with a matching fingerprint are skipped"""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        journal = Journal(tmp)
+        journal.start()
+        journal.record("pip install", "wheels-1")
+        journal.record("migrate", "schema-1")
+        ran = []
+
+        graph = TaskGraph(journal=journal)
+        graph.add(
+            "pip install", lambda: ran.append("pip"), fingerprint=lambda: "wheels-1"
+        )
+        graph.add(
+            "migrate",
+            lambda: ran.append("migrate"),
+            ["pip install"],
+            fingerprint=lambda: "schema-2",
+        )
+        graph.add("node check", lambda: ran.append("node"))
+        graph.run()
+
+        self.assertEqual(sorted(ran), ["migrate", "node"])
+        self.assertTrue(graph.tasks["pip install"].skipped)
+        mock_echo.assert_called_once_with("Skipping pip install: already done.")
+        self.assertTrue(Journal(tmp).load())
+        self.assertTrue(journal.is_done("migrate", "schema-2"))
+
+    def test_journal_records_failures(self):
+        """A failed task is recorded so that it runs again on resume"""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        journal = Journal(tmp)
+        journal.start()
+        journal.record("npm install", "modules-1")
+
+        def fail():
+            raise SystemExit(1)
+
+        graph = TaskGraph(journal=journal)
+        graph.add("npm install", fail, fingerprint=lambda: None)
+        with self.assertRaises(SystemExit):
+            graph.run()
+
+        self.assertEqual(journal.steps["npm install"]["status"], "failed")
+        self.assertTrue(os.path.isfile(journal.path))
+
+    @patch("click.secho")
+    def test_report_critical_path(self, mock_secho):
+        """The critical path is printed with task timings"""
+        graph = TaskGraph()
+        graph.add("startproject", lambda: None)
+        graph.add("migrate", lambda: None, ["startproject"])
+        graph.run()
+        graph.report_critical_path()
+
+        message = mock_secho.call_args[0][0]
+        self.assertIn("Critical path", message)
+        self.assertIn("startproject", message)
+        self.assertIn("migrate", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
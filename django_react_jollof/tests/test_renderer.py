@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from django_react_jollof.renderer import Renderer, UnknownPlaceholderError
+
+
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_render_all_placeholders(self):
+        """Every placeholder is substituted in one pass"""
+        renderer = Renderer({"PROJECT_NAME": "Jollof", "API_URL": "/api"})
+
+        self.assertEqual(
+            renderer.render("<title>{{ PROJECT_NAME }}</title> {{API_URL}}"),
+            "<title>Jollof</title> /api",
+        )
+
+    def test_jsx_objects_are_left_alone(self):
+        """Double braces of JSX props are not placeholders"""
+        text = 'style={{ cursor: "pointer" }} value={{ isLoggedIn, login }}'
+
+        self.assertEqual(Renderer({}).render(text), text)
+
+    def test_values_are_inserted_verbatim(self):
+        """Replacement values are not parsed for escapes or placeholders"""
+        renderer = Renderer({"SECRET_KEY": r"a$b\1{{ X }}"})
+
+        self.assertEqual(renderer.render("{{ SECRET_KEY }}"), r"a$b\1{{ X }}")
+
+    def test_unknown_placeholders_are_reported_together(self):
+        """All undefined placeholders are listed in one error"""
+        with self.assertRaises(UnknownPlaceholderError) as context:
+            Renderer({"PROJECT_NAME": "Jollof"}).render(
+                "{{ PROJECT_NAME }} {{ LOGO }} {{ API_URL }} {{ LOGO }}"
+            )
+
+        self.assertEqual(context.exception.names, ["API_URL", "LOGO"])
+        self.assertIn("API_URL, LOGO", str(context.exception))
+
+    def test_render_file(self):
+        """A template is rendered straight into place with its mode"""
+        src = os.path.join(self.tmp, "manage.py-tpl")
+        with open(src, "w") as f:
+            f.write("# {{ PROJECT_NAME }}\n")
+        os.chmod(src, 0o755)
+
+        dst = os.path.join(self.tmp, "out", "manage.py")
+        Renderer({"PROJECT_NAME": "Jollof"}).render_file(src, dst)
+
+        with open(dst) as f:
+            self.assertEqual(f.read(), "# Jollof\n")
+        self.assertTrue(os.access(dst, os.X_OK))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import runner
+from django_react_jollof.runner import StatusBoard, run_streaming
+from django_react_jollof.timings import phase
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = tempfile.mkdtemp()
+        env = patch.dict(os.environ, {"JOLLOF_CACHE_DIR": self.cache})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache, ignore_errors=True)
+
+    def python(self, script):
+        return [sys.executable, "-c", script]
+
+    def test_full_output_goes_to_the_log(self):
+        """Every line of stdout and stderr is written to the log file"""
+        with phase("pip install") as record:
+            path = run_streaming(
+                self.python(
+                    "import sys\n"
+                    "for i in range(1000): print('line', i)\n"
+                    "print('oops', file=sys.stderr)"
+                )
+            )
+
+        self.assertTrue(os.path.basename(path).startswith("pip-install-"))
+        with open(path) as f:
+            log = f.read()
+        self.assertIn("line 0\n", log)
+        self.assertIn("line 999\n", log)
+        self.assertIn("oops\n", log)
+        self.assertEqual(record.child_processes, 1)
+
+    def test_failure_reports_only_the_tail(self):
+        """A failing command raises with the last lines and the log path"""
+        with self.assertRaises(subprocess.CalledProcessError) as context:
+            run_streaming(
+                self.python(
+                    "import sys\n"
+                    "for i in range(1000): print('line', i)\n"
+                    "sys.exit(3)"
+                ),
+                label="npm install",
+            )
+
+        error = context.exception
+        self.assertEqual(error.returncode, 3)
+        tail = error.stderr.splitlines()
+        self.assertEqual(len(tail), runner.TAIL_LINES + 1)
+        self.assertEqual(tail[-2], "line 999")
+        self.assertNotIn("line 0", tail)
+        self.assertIn("full log:", tail[-1])
+
+    def test_status_board_shows_latest_line(self):
+        """The board shows the latest output of each running step"""
+        terminal = io.StringIO()
+        board = StatusBoard(terminal)
+        with patch.object(runner, "_board", board):
+            board.update("npm install", "resolving")
+            run_streaming(
+                self.python("print('Collecting django'); print('Installed')"),
+                label="pip install",
+            )
+
+        self.assertEqual(board.lines, {"npm install": "resolving"})
+        self.assertIn("pip install: Installed", terminal.getvalue())
+
+    def test_status_board_keeps_output_above(self):
+        """Other output is written above the board and the board is redrawn"""
+        terminal = io.StringIO()
+        board = StatusBoard(terminal)
+        board.update("pip install", "Collecting django")
+        board.write(terminal, "Project files written successfully.\n")
+
+        self.assertTrue(
+            terminal.getvalue().endswith(
+                "Project files written successfully.\n"
+                "  ▸ pip install: Collecting django\n"
+            )
+        )
+        self.assertEqual(board.drawn, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
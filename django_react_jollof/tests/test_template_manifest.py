@@ -0,0 +1,144 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import template_manifest
+from django_react_jollof.template_manifest import (
+    MANIFEST_FILE,
+    TemplateBundle,
+    entries_for,
+    load_manifest,
+    read_template,
+    scan,
+    write_bundle,
+    write_manifest,
+)
+
+
+class TestTemplateManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "frontend", "src", "__pycache__"))
+        os.makedirs(os.path.join(self.root, "backend"))
+        self.write("frontend/index.html", "<title>{{ PROJECT_NAME }}</title>\n")
+        self.write("frontend/src/App.jsx", "export default App;\n")
+        self.write("frontend/src/__pycache__/x.pyc", "")
+        self.write("backend/manage.py", "#!/usr/bin/env python\n")
+        os.chmod(os.path.join(self.root, "backend", "manage.py"), 0o755)
+        self.bundle_path = os.path.join(tempfile.mkdtemp(), "templates.bundle")
+        load_manifest.cache_clear()
+
+    def tearDown(self):
+        load_manifest.cache_clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+        shutil.rmtree(os.path.dirname(self.bundle_path), ignore_errors=True)
+
+    def write(self, path, content):
+        with open(os.path.join(self.root, *path.split("/")), "w") as f:
+            f.write(content)
+
+    def test_scan(self):
+        """Every template is indexed with its size, hash and mode"""
+        entries = {entry.path: entry for entry in scan(self.root)}
+
+        self.assertEqual(
+            sorted(entries),
+            ["backend/manage.py", "frontend/index.html", "frontend/src/App.jsx"],
+        )
+        self.assertEqual(entries["frontend/src/App.jsx"].size, 20)
+        self.assertEqual(len(entries["frontend/src/App.jsx"].sha256), 64)
+        self.assertEqual(entries["backend/manage.py"].mode, 0o755)
+        self.assertEqual(entries["frontend/index.html"].placeholders, ("PROJECT_NAME",))
+        self.assertEqual(entries["frontend/src/App.jsx"].placeholders, ())
+
+    def test_write_and_load_manifest(self):
+        """A written manifest is used instead of scanning"""
+        manifest_path = write_manifest(self.root)
+        with open(manifest_path) as f:
+            self.assertEqual(
+                json.load(f)["version"], template_manifest.MANIFEST_VERSION
+            )
+
+        with patch("django_react_jollof.template_manifest.scan") as mock_scan:
+            entries = load_manifest(self.root)
+
+        mock_scan.assert_not_called()
+        self.assertEqual(entries, scan(self.root))
+        self.assertNotIn(MANIFEST_FILE, [entry.path for entry in entries])
+
+    def test_load_manifest_without_file(self):
+        """Source checkouts without a manifest scan the tree"""
+        self.assertEqual(load_manifest(self.root), scan(self.root))
+
+    def test_entries_for_subdirectory(self):
+        """Entries below a template directory are relative to it"""
+        with patch.object(template_manifest, "TEMPLATE_ROOT", self.root):
+            entries = entries_for(os.path.join(self.root, "frontend"))
+
+        self.assertEqual(
+            [entry.path for entry in entries], ["index.html", "src/App.jsx"]
+        )
+
+    def test_bundle_round_trip(self):
+        """A bundle indexes and holds every template"""
+        path = write_bundle(self.root, self.bundle_path)
+        with open(path, "rb") as f:
+            bundle = TemplateBundle(f.read())
+
+        self.assertEqual(bundle.entries, scan(self.root))
+        self.assertEqual(
+            bytes(bundle.read("backend/manage.py")), b"#!/usr/bin/env python\n"
+        )
+        self.assertEqual(
+            bytes(bundle.read("frontend/src/App.jsx")), b"export default App;\n"
+        )
+        self.assertIsNone(bundle.read("frontend/missing.jsx"))
+
+    def test_bundle_rejects_other_files(self):
+        """Files that are not bundles of this version are rejected"""
+        with self.assertRaises(ValueError):
+            TemplateBundle(b"PK\x03\x04 not a bundle")
+
+        path = write_bundle(self.root, self.bundle_path)
+        with open(path, "rb") as f:
+            data = f.read()
+        with patch.object(template_manifest, "MANIFEST_VERSION", 0):
+            with self.assertRaises(ValueError):
+                TemplateBundle(data)
+
+    def test_bundled_templates_are_read_from_the_bundle(self):
+        """With a bundle, the manifest and contents come from it"""
+        path = write_bundle(self.root, self.bundle_path)
+        with open(path, "rb") as f:
+            bundle = TemplateBundle(f.read())
+        shutil.rmtree(os.path.join(self.root, "frontend"))
+
+        with patch.object(template_manifest, "TEMPLATE_ROOT", self.root), patch.object(
+            template_manifest, "load_bundle", return_value=bundle
+        ):
+            self.assertEqual(load_manifest(self.root), bundle.entries)
+            self.assertEqual(
+                read_template(os.path.join(self.root, "frontend", "index.html")),
+                b"<title>{{ PROJECT_NAME }}</title>\n",
+            )
+
+    def test_load_bundle_in_source_checkout(self):
+        """Source checkouts have no bundle and use the loose files"""
+        template_manifest.load_bundle.cache_clear()
+        self.addCleanup(template_manifest.load_bundle.cache_clear)
+
+        self.assertIsNone(template_manifest.load_bundle())
+
+    def test_entries_for_other_directory(self):
+        """Directories outside the bundled templates are scanned"""
+        entries = entries_for(os.path.join(self.root, "backend"))
+
+        self.assertEqual([entry.path for entry in entries], ["manage.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
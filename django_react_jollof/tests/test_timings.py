@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import timings
+from django_react_jollof.timings import Phase, format_table, phase, write_report
+
+
+class TestTimings(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_run_outside_phase_is_subprocess_run(self):
+        """Without a phase the arguments go to subprocess.run unchanged"""
+        with patch("subprocess.run") as mock_run:
+            timings.run(["node", "--version"], capture_output=True, text=True)
+
+        mock_run.assert_called_once_with(
+            ["node", "--version"], capture_output=True, text=True
+        )
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "needs os.wait4")
+    def test_run_records_child_resources(self):
+        """Child CPU time, peak RSS and block writes are added to the phase"""
+        script = (
+            "import os, sys\n"
+            "data = bytearray(30_000_000)\n"
+            "with open(sys.argv[1], 'wb') as f:\n"
+            "    f.write(os.urandom(1_000_000)); f.flush(); os.fsync(f.fileno())\n"
+            "print('done')\n"
+        )
+        with phase("migrate") as record:
+            result = timings.run(
+                [sys.executable, "-c", script, os.path.join(self.tmp, "out.bin")],
+                check=True,
+                text=True,
+                capture_output=True,
+            )
+
+        self.assertEqual(result.stdout, "done\n")
+        self.assertEqual(record.child_processes, 1)
+        self.assertGreater(record.child_cpu, 0)
+        self.assertGreater(record.child_peak_rss, 30_000_000)
+        self.assertGreaterEqual(record.wall, record.cpu)
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "needs os.wait4")
+    def test_run_check_failure(self):
+        """A failing command raises CalledProcessError with its output"""
+        with phase("pip install"):
+            with self.assertRaises(subprocess.CalledProcessError) as context:
+                timings.run(
+                    [sys.executable, "-c", "import sys; sys.exit('boom')"],
+                    check=True,
+                    text=True,
+                    capture_output=True,
+                )
+
+        self.assertEqual(context.exception.returncode, 1)
+        self.assertIn("boom", context.exception.stderr)
+
+    def test_record_files_goes_to_current_phase(self):
+        """Files are counted for the innermost phase of the thread only"""
+        timings.record_files(5, 500)  # No phase, ignored
+        with phase("project files") as outer:
+            timings.record_files(2, 100)
+            with phase("inner") as inner:
+                timings.record_files(1, 10)
+            timings.record_files(1, 50)
+
+        self.assertEqual((outer.files_written, outer.bytes_written), (3, 150))
+        self.assertEqual((inner.files_written, inner.bytes_written), (1, 10))
+        self.assertIsNone(timings.current())
+
+    def test_write_report(self):
+        """The report is versioned JSON with one entry per phase"""
+        record = Phase("npm install")
+        record.wall = 1.5
+        record.add_files(3, 300)
+        path = os.path.join(self.tmp, "timings.json")
+
+        write_report(path, [record], project="demo")
+
+        with open(path) as f:
+            report = json.load(f)
+        self.assertEqual(report["version"], timings.REPORT_VERSION)
+        self.assertEqual(report["project"], "demo")
+        self.assertEqual(report["phases"][0]["name"], "npm install")
+        self.assertEqual(report["phases"][0]["wall_seconds"], 1.5)
+        self.assertEqual(report["phases"][0]["files_written"], 3)
+
+    def test_format_table(self):
+        """Every phase gets a row"""
+        table = format_table([Phase("wheelhouse"), Phase("migrate")])
+
+        lines = table.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith("Phase"))
+        self.assertTrue(lines[2].startswith("migrate"))
+
+
+if __name__ == "__main__":
+    unittest.main()
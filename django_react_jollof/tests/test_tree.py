@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof import template_manifest
+from django_react_jollof.renderer import UnknownPlaceholderError
+from django_react_jollof.template_manifest import TemplateBundle, write_bundle
+from django_react_jollof.tree import OutputTree
+
+
+class TestOutputTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.templates = os.path.join(self.tmp, "templates")
+        self.write("templates/base/src/main.jsx", "base main\n")
+        self.write("templates/base/index.html", "<title>{{ PROJECT_NAME }}</title>\n")
+        self.write("templates/base/manage.py-tpl", "# {{ PROJECT_NAME }}\n")
+        os.chmod(os.path.join(self.templates, "base", "manage.py-tpl"), 0o755)
+        self.write("templates/overlay/main.jsx", "overlay main\n")
+
+        echo = patch("click.echo")
+        echo.start()
+        self.addCleanup(echo.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, path, content):
+        path = os.path.join(self.tmp, *path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def read(self, *path):
+        with open(os.path.join(*path)) as f:
+            return f.read()
+
+    def make_tree(self):
+        tree = OutputTree()
+        tree.add_directory(os.path.join(self.templates, "base"), "app")
+        tree.add_file(
+            os.path.join(self.templates, "overlay", "main.jsx"), "app/src/main.jsx"
+        )
+        tree.add_text("app/.env", "DEBUG=1\n")
+        tree.context["PROJECT_NAME"] = "Jollof"
+        return tree
+
+    def test_later_layers_win(self):
+        """An overlay replaces the base file before anything is written"""
+        tree = self.make_tree()
+
+        self.assertEqual(
+            sorted(tree.files),
+            ["app/.env", "app/index.html", "app/manage.py", "app/src/main.jsx"],
+        )
+        self.assertTrue(
+            tree.files["app/src/main.jsx"].source.endswith("overlay/main.jsx")
+        )
+
+    def test_commit_new_directory(self):
+        """A new project directory appears with every file in its final form"""
+        target = os.path.join(self.tmp, "out", "project")
+        self.make_tree().commit(target)
+
+        app = os.path.join(target, "app")
+        self.assertEqual(self.read(app, "src", "main.jsx"), "overlay main\n")
+        self.assertEqual(self.read(app, "index.html"), "<title>Jollof</title>\n")
+        self.assertEqual(self.read(app, "manage.py"), "# Jollof\n")
+        self.assertTrue(os.access(os.path.join(app, "manage.py"), os.X_OK))
+        self.assertEqual(self.read(app, ".env"), "DEBUG=1\n")
+        self.assertEqual(os.listdir(os.path.dirname(target)), ["project"])
+
+    def test_commit_into_existing_directory(self):
+        """Entries are moved into an existing directory next to its files"""
+        target = os.path.join(self.tmp, "project")
+        self.write("project/notes.txt", "keep me\n")
+
+        self.make_tree().commit(target)
+
+        self.assertEqual(sorted(os.listdir(target)), ["app", "notes.txt"])
+        self.assertEqual(self.read(target, "notes.txt"), "keep me\n")
+
+    def test_commit_refuses_existing_entries(self):
+        """Existing top-level entries are never overwritten"""
+        target = os.path.join(self.tmp, "project")
+        self.write("project/app/index.html", "mine\n")
+
+        with self.assertRaises(FileExistsError):
+            self.make_tree().commit(target)
+
+        self.assertEqual(os.listdir(target), ["app"])
+        self.assertEqual(self.read(target, "app", "index.html"), "mine\n")
+
+    def test_commit_with_seed(self):
+        """Seeded files are laid down first and the tree's files replace them"""
+        target = os.path.join(self.tmp, "project")
+
+        def seed(staging):
+            os.makedirs(os.path.join(staging, "app", "node_modules"))
+            with open(os.path.join(staging, "app", "index.html"), "w") as f:
+                f.write("stale\n")
+
+        self.make_tree().commit(target, seed)
+
+        self.assertEqual(
+            self.read(target, "app", "index.html"), "<title>Jollof</title>\n"
+        )
+        self.assertTrue(os.path.isdir(os.path.join(target, "app", "node_modules")))
+
+    def test_commit_refuses_existing_seeded_entries(self):
+        """Seeded top-level entries do not overwrite existing ones either"""
+        target = os.path.join(self.tmp, "project")
+        self.write("project/LICENSE", "mine\n")
+
+        def seed(staging):
+            with open(os.path.join(staging, "LICENSE"), "w") as f:
+                f.write("MIT\n")
+
+        with self.assertRaises(FileExistsError):
+            self.make_tree().commit(target, seed)
+
+        self.assertEqual(os.listdir(target), ["LICENSE"])
+        self.assertEqual(self.read(target, "LICENSE"), "mine\n")
+
+    def test_commit_from_bundle(self):
+        """Templates packed into a bundle are written without the loose files"""
+        with open(write_bundle(self.templates, os.path.join(self.tmp, "b")), "rb") as f:
+            bundle = TemplateBundle(f.read())
+        shutil.rmtree(self.templates)
+        template_manifest.load_manifest.cache_clear()
+        self.addCleanup(template_manifest.load_manifest.cache_clear)
+        target = os.path.join(self.tmp, "project")
+
+        with patch.object(
+            template_manifest, "TEMPLATE_ROOT", self.templates
+        ), patch.object(template_manifest, "load_bundle", return_value=bundle):
+            self.make_tree().commit(target)
+
+        app = os.path.join(target, "app")
+        self.assertEqual(self.read(app, "src", "main.jsx"), "overlay main\n")
+        self.assertEqual(self.read(app, "manage.py"), "# Jollof\n")
+        self.assertTrue(os.access(os.path.join(app, "manage.py"), os.X_OK))
+
+    def test_failed_commit_leaves_nothing_behind(self):
+        """A failure while writing removes the staging directory"""
+        tree = self.make_tree()
+        del tree.context["PROJECT_NAME"]
+
+        with self.assertRaises(UnknownPlaceholderError):
+            tree.commit(os.path.join(self.tmp, "out", "project"))
+
+        self.assertEqual(os.listdir(os.path.join(self.tmp, "out")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_react_jollof.wheelhouse import (
+    REQUIREMENTS_FILE,
+    interpreter_abi,
+    is_complete,
+    list_wheels,
+    wheelhouse_path,
+    write_index,
+)
+
+
+class TestWheelhouse(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {"JOLLOF_CACHE_DIR": self.tmp})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_interpreter_abi(self):
+        """The ABI tag names the implementation and platform"""
+        abi = interpreter_abi(sys.executable)
+        self.assertTrue(abi.startswith(sys.implementation.cache_tag))
+
+    def test_wheelhouse_path_is_keyed_by_inputs(self):
+        """Different dependency sets or interpreters get different wheelhouses"""
+        path = wheelhouse_path(["django", "pyjwt"], "cpython-311-linux-x86_64")
+
+        self.assertTrue(path.startswith(os.path.join(self.tmp, "wheels")))
+        self.assertEqual(
+            path, wheelhouse_path(["pyjwt", "django"], "cpython-311-linux-x86_64")
+        )
+        self.assertNotEqual(
+            path, wheelhouse_path(["django", "pyjwt"], "cpython-312-linux-x86_64")
+        )
+        self.assertNotEqual(
+            path, wheelhouse_path(["django"], "cpython-311-linux-x86_64")
+        )
+
+    def test_index_round_trip(self):
+        """A wheelhouse is complete once indexed and while its wheels exist"""
+        path = os.path.join(self.tmp, "house")
+        os.makedirs(path)
+        wheel = os.path.join(path, "Django-5.0-py3-none-any.whl")
+        with open(wheel, "wb") as f:
+            f.write(b"wheel")
+
+        self.assertFalse(is_complete(path))
+        write_index(path, ["django"], "cp-test")
+
+        self.assertTrue(is_complete(path))
+        self.assertEqual(list_wheels(path), [wheel])
+
+        os.remove(wheel)
+        self.assertFalse(is_complete(path))
+
+    def test_index_pins_wheel_hashes(self):
+        """The index comes with a requirements file pinning every wheel"""
+        path = os.path.join(self.tmp, "house")
+        os.makedirs(path)
+        with open(os.path.join(path, "Django-5.0-py3-none-any.whl"), "wb") as f:
+            f.write(b"wheel")
+        write_index(path, ["django"], "cp-test")
+
+        with open(os.path.join(path, REQUIREMENTS_FILE)) as f:
+            self.assertEqual(
+                f.read(),
+                f"Django==5.0 --hash=sha256:{hashlib.sha256(b'wheel').hexdigest()}\n",
+            )
+
+        os.remove(os.path.join(path, REQUIREMENTS_FILE))
+        self.assertFalse(is_complete(path))
+
+    def test_empty_wheelhouse_is_incomplete(self):
+        """An index without wheels does not count as a usable cache"""
+        path = os.path.join(self.tmp, "house")
+        os.makedirs(path)
+        write_index(path, ["django"], "cp-test")
+
+        self.assertFalse(is_complete(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+import io
+import json
+import locale
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Bump when the fields of the JSON report change
+REPORT_VERSION = 1
+
+_local = threading.local()
+
+
+class Phase:
+    """Resources used by one named step of a cook."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+        self.child_peak_rss = 0
+        self.child_processes = 0
+        self.child_bytes_written = 0
+        self.files_written = 0
+        self.bytes_written = 0
+
+    def add_files(self, count: int, size: int) -> None:
+        """Account for files written by jollof itself."""
+        self.files_written += count
+        self.bytes_written += size
+
+    def add_child(self, usage: Any) -> None:
+        """
+        Account for a finished child process.
+
+        Args:
+            usage: The `resource.struct_rusage` returned by `os.wait4`.
+        """
+        # ru_maxrss is in bytes on macOS and in kilobytes everywhere else. It
+        # is a high-water mark that includes the child before exec, so small
+        # commands report roughly the size of jollof itself.
+        scale = 1 if sys.platform == "darwin" else 1024
+        self.child_processes += 1
+        self.child_cpu += usage.ru_utime + usage.ru_stime
+        self.child_peak_rss = max(self.child_peak_rss, usage.ru_maxrss * scale)
+        self.child_bytes_written += usage.ru_oublock * 512
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the phase as a JSON-serialisable mapping."""
+        return {
+            "name": self.name,
+            "started_seconds": round(self.started, 6),
+            "wall_seconds": round(self.wall, 6),
+            "cpu_seconds": round(self.cpu, 6),
+            "child_cpu_seconds": round(self.child_cpu, 6),
+            "child_peak_rss_bytes": self.child_peak_rss,
+            "child_processes": self.child_processes,
+            "child_bytes_written": self.child_bytes_written,
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+        }
+
+
+@contextmanager
+def phase(name: str, started: float = 0.0) -> Iterator[Phase]:
+    """
+    Record the wall and CPU time of a block as a phase.
+
+    Child processes started through `run` and files reported through
+    `record_files` on the same thread are added to the phase.
+
+    Args:
+        name (str): Name of the phase.
+        started (float): Start offset reported for the phase, in seconds.
+    """
+    record = Phase(name)
+    record.started = started
+    previous = getattr(_local, "phase", None)
+    _local.phase = record
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield record
+    finally:
+        record.wall = time.perf_counter() - wall
+        record.cpu = time.thread_time() - cpu
+        _local.phase = previous
+
+
+def current() -> Optional[Phase]:
+    """Return the phase being recorded on this thread, if any."""
+    return getattr(_local, "phase", None)
+
+
+def record_files(count: int, size: int) -> None:
+    """Add files written on this thread to the current phase."""
+    record = current()
+    if record is not None:
+        record.add_files(count, size)
+
+
+def _read_output(file: Any, text: bool) -> Any:
+    file.seek(0)
+    if not text:
+        return file.read()
+    wrapper = io.TextIOWrapper(file, encoding=locale.getpreferredencoding(False))
+    try:
+        return wrapper.read()
+    finally:
+        wrapper.detach()  # The temporary file closes itself
+
+
+def wait(process: subprocess.Popen) -> int:
+    """
+    Wait for a child process, adding its resource use to the current phase.
+
+    Returns:
+        int: The exit code, as from `Popen.wait`.
+    """
+    record = current()
+    if record is None or not hasattr(os, "wait4") or process.returncode is not None:
+        return process.wait()
+
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    record.add_child(usage)
+    return process.returncode
+
+
+def run(command: Sequence[str], **kwargs: Any) -> subprocess.CompletedProcess:
+    """
+    Run a command like `subprocess.run`, adding its resource use to the current phase.
+
+    The child is reaped with `os.wait4`, which reports its CPU time, peak
+    RSS and block writes. Output is captured in temporary files rather
+    than pipes so nothing has to be read while waiting. Outside a phase,
+    or where `os.wait4` is missing, the arguments go to `subprocess.run`
+    unchanged.
+
+    Args:
+        command (Sequence[str]): The command to run.
+        **kwargs: `check`, `text`, `capture_output` and `cwd`, as for `subprocess.run`.
+
+    Raises:
+        subprocess.CalledProcessError: If `check` is set and the command fails.
+    """
+    record = current()
+    if record is None or not hasattr(os, "wait4"):
+        return subprocess.run(command, **kwargs)
+
+    check = kwargs.pop("check", False)
+    text = kwargs.pop("text", False)
+    capture_output = kwargs.pop("capture_output", False)
+    cwd = kwargs.pop("cwd", None)
+    if kwargs:
+        raise TypeError(f"Unsupported arguments: {', '.join(sorted(kwargs))}")
+
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        streams = {"stdout": out, "stderr": err} if capture_output else {}
+        process = subprocess.Popen(command, cwd=cwd, **streams)
+        try:
+            wait(process)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+
+        stdout = _read_output(out, text) if capture_output else None
+        stderr = _read_output(err, text) if capture_output else None
+
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def format_table(phases: List[Phase]) -> str:
+    """
+    Return a plain-text table of phases for the terminal.
+
+    CPU includes child processes; written includes their block writes.
+    """
+    rows = [("Phase", "Wall", "CPU", "Peak RSS", "Files", "Written")]
+    for record in phases:
+        rows.append(
+            (
+                record.name,
+                f"{record.wall:.2f}s",
+                f"{record.cpu + record.child_cpu:.2f}s",
+                (
+                    f"{record.child_peak_rss / 1e6:.1f} MB"
+                    if record.child_processes
+                    else "-"
+                ),
+                str(record.files_written),
+                f"{(record.bytes_written + record.child_bytes_written) / 1e6:.1f} MB",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def jollof_version() -> str:
+    """Return the installed version of django-react-jollof."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("django-react-jollof")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def write_report(path: str, phases: List[Phase], **info: Any) -> None:
+    """
+    Write a machine-readable timing report.
+
+    Args:
+        path (str): Output file.
+        phases (List[Phase]): The recorded phases.
+        **info: Extra top-level fields, e.g. the project options.
+    """
+    report = {
+        "version": REPORT_VERSION,
+        "jollof_version": jollof_version(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        **info,
+        "phases": [record.as_dict() for record in phases],
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
@@ -0,0 +1,221 @@
+import os
+import shutil
+import time
+from secrets import token_hex
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import click
+
+from django_react_jollof import timings
+from django_react_jollof.fastcopy import Cloner
+from django_react_jollof.renderer import Renderer
+from django_react_jollof.template_manifest import bundled, describe, entries_for
+
+# Suffix of templates whose output name must not exist in the package itself
+TEMPLATE_SUFFIX = "-tpl"
+
+
+class TreeFile(NamedTuple):
+    """Where an output file comes from: a template or generated text."""
+
+    source: Optional[str]
+    content: Optional[str]
+    mode: int
+    size: int
+    placeholders: Tuple[str, ...] = ()
+
+
+class OutputTree:
+    """
+    In-memory plan of a generated project.
+
+    Layers are added in order (base templates, framework overlays, social
+    login overlays, generated files); a later layer replaces what an
+    earlier one put at the same path. Nothing touches the disk until
+    `write` or `commit`, so every output file is written exactly once.
+
+    Attributes:
+        files (Dict[str, TreeFile]): Output files by "/"-separated relative path.
+        context (Dict[str, str]): Values of the `{{ NAME }}` placeholders.
+    """
+
+    def __init__(self) -> None:
+        self.files: Dict[str, TreeFile] = {}
+        self.context: Dict[str, str] = {}
+
+    def add_directory(self, src: str, prefix: str = "", render: bool = True) -> None:
+        """
+        Layer a template directory onto the tree.
+
+        Args:
+            src (str): Template directory.
+            prefix (str): Output directory of its files, relative to the tree root.
+            render (bool): Render placeholders; otherwise files are copied verbatim.
+        """
+        for entry in entries_for(src):
+            self.files[join(prefix, entry.path.removesuffix(TEMPLATE_SUFFIX))] = (
+                TreeFile(
+                    os.path.join(src, entry.path),
+                    None,
+                    entry.mode,
+                    entry.size,
+                    entry.placeholders if render else (),
+                )
+            )
+
+    def add_file(self, src: str, path: str) -> None:
+        """
+        Layer a single template onto the tree.
+
+        Args:
+            src (str): Template path.
+            path (str): Output path relative to the tree root.
+        """
+        entry = describe(src)
+        self.files[path] = TreeFile(
+            src, None, entry.mode, entry.size, entry.placeholders
+        )
+
+    def add_text(self, path: str, content: str, mode: int = 0o644) -> None:
+        """
+        Add a generated file to the tree.
+
+        Args:
+            path (str): Output path relative to the tree root.
+            content (str): The file contents.
+            mode (int): Permission bits of the file.
+        """
+        self.files[path] = TreeFile(None, content, mode, len(content.encode("utf-8")))
+
+    def write(self, dest: str) -> None:
+        """
+        Write the tree into a directory.
+
+        Placeholders are checked for the whole tree before anything is
+        written. Templates with placeholders are rendered straight into
+        place, and generated files and templates held by the template
+        bundle are written directly; all other files are cloned in a
+        thread pool.
+
+        Args:
+            dest (str): Target directory; created if missing.
+
+        Raises:
+            UnknownPlaceholderError: If a template uses a placeholder missing
+                from `context`.
+        """
+        start = time.perf_counter()
+        renderer = Renderer(self.context)
+        renderer.check(
+            name for file in self.files.values() for name in file.placeholders
+        )
+
+        clones: List[Tuple[str, str, int]] = []
+        for path, file in self.files.items():
+            target = os.path.join(dest, *path.split("/"))
+            if file.placeholders:
+                renderer.render_file(file.source, target, file.mode)
+            elif file.content is not None:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(file.content)
+                os.chmod(target, file.mode)
+            elif (data := bundled(file.source)) is not None:
+                # Straight from the memory-mapped bundle, no source file to open
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as f:
+                    f.write(data)
+                os.chmod(target, file.mode)
+            else:
+                clones.append((file.source, target, file.mode))
+
+        # Templates may be edited after copying, so they are never hardlinked
+        Cloner(link=False).clone_files(clones)
+
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        size = sum(file.size for file in self.files.values())
+        timings.record_files(len(self.files), size)
+        click.echo(
+            f"Copied {len(self.files)} files ({size / 1e3:.1f} kB) in {elapsed:.3f}s: "
+            f"{len(self.files) / elapsed:.0f} files/s, {size / 1e6 / elapsed:.1f} MB/s."
+        )
+
+    def commit(self, target: str, seed: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Write the tree to `target` atomically.
+
+        The tree is written to a temporary directory on the same filesystem
+        and renamed into place, so a failure never leaves a half-written
+        project behind. A new `target` appears in one rename; for an
+        existing directory each top-level entry is renamed into it, and
+        existing entries are never overwritten.
+
+        Args:
+            target (str): The project directory.
+            seed (Optional[Callable[[str], None]]): Called with the temporary
+                directory before the tree is written, to lay down files the
+                tree does not hold; files of the tree replace them.
+
+        Raises:
+            FileExistsError: If a top-level entry of the tree already exists.
+        """
+        target = os.path.abspath(target)
+        exists = os.path.isdir(target)
+        if exists:
+            taken = sorted(
+                name
+                for name in {path.split("/")[0] for path in self.files}
+                if os.path.lexists(os.path.join(target, name))
+            )
+            if taken:
+                raise FileExistsError(
+                    f"'{target}' already contains {', '.join(taken)}."
+                )
+            staging = make_staging_dir(target, ".jollof")
+        else:
+            parent, name = os.path.split(target)
+            os.makedirs(parent, exist_ok=True)
+            staging = make_staging_dir(parent, f".{name}")
+
+        try:
+            if seed is not None:
+                seed(staging)
+            self.write(staging)
+            if not exists:
+                os.rename(staging, target)
+                return
+            names = os.listdir(staging)
+            taken = sorted(
+                name for name in names if os.path.lexists(os.path.join(target, name))
+            )
+            if taken:  # Seeded entries the tree does not list
+                raise FileExistsError(
+                    f"'{target}' already contains {', '.join(taken)}."
+                )
+            for name in names:
+                os.rename(os.path.join(staging, name), os.path.join(target, name))
+            os.rmdir(staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+
+def join(prefix: str, path: str) -> str:
+    """Join "/"-separated tree paths."""
+    return f"{prefix}/{path}" if prefix else path
+
+
+def make_staging_dir(parent: str, prefix: str) -> str:
+    """
+    Create a uniquely named empty directory.
+
+    Unlike `tempfile.mkdtemp` (always 0o700), the directory gets the
+    usual umask-based permissions, as it may become the project itself.
+    """
+    while True:
+        path = os.path.join(parent, f"{prefix}-{token_hex(4)}")
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            continue
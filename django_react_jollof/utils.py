@@ -1,8 +1,10 @@
-import os
-import shutil
-from typing import List
+import sys
+from typing import Callable, List, Optional
 import click
 
+from django_react_jollof.renderer import UnknownPlaceholderError
+from django_react_jollof.tree import OutputTree
+
 
 def validate_choice(choice: str, valid_choices: List[int]) -> bool:
     """
@@ -33,56 +35,43 @@ def validate_choice(choice: str, valid_choices: List[int]) -> bool:
     return True
 
 
-def copy_templates(src: str, dest: str, directory: str) -> None:
+def write_project(
+    tree: OutputTree,
+    project_dir: str,
+    seed: Optional[Callable[[str], None]] = None,
+) -> None:
     """
-    Recursively copy template files from the source directory to the destination directory.
-
-    This function performs the following actions:
-    1. Validates the existence of the source directory.
-    2. Walks through the source directory and copies files to the destination.
-    3. Preserves the directory structure during copying.
-    4. Logs the progress and any errors encountered.
+    Write a project tree to disk in one atomic step.
 
     Args:
-        src (str): Source directory path containing template files.
-        dest (str): Destination directory path where templates will be copied.
-
-    Raises:
-        FileNotFoundError: If the source directory does not exist.
-        PermissionError: If there are permission issues accessing the directories or files.
-        Exception: For any other unforeseen errors during the copying process.
+        tree (OutputTree): The complete project tree.
+        project_dir (str): The project directory.
+        seed (Optional[Callable[[str], None]]): Lays down files the tree
+            does not hold, see `OutputTree.commit`.
     """
-    click.secho(f"Starting to generate templates for {directory}.", fg="yellow")
-
-    if not os.path.exists(src):
-        click.secho(f"Source directory '{src}' does not exist.", fg="red")
-        raise FileNotFoundError(f"Source directory '{src}' does not exist.")
-
+    click.secho(f"Writing {len(tree.files)} files to '{project_dir}'...", fg="yellow")
     try:
-        for root, dirs, files in os.walk(src):
-            for file in files:
-                # Full path of source and destination
-                src_file: str = os.path.join(root, file)
-                relative_path: str = os.path.relpath(src_file, src)
-                dest_file: str = os.path.join(dest, relative_path)
+        tree.commit(project_dir, seed)
+        click.secho("Project files written successfully.", fg="green")
 
-                # Ensure the destination directory exists
-                dest_dir: str = os.path.dirname(dest_file)
-                os.makedirs(dest_dir, exist_ok=True)
+    except FileExistsError as e:
+        click.secho(f"Refusing to overwrite existing files: {e}", fg="red")
+        sys.exit(1)
+    except UnknownPlaceholderError as e:
+        click.secho(f"Error rendering templates: {e}", fg="red")
+        sys.exit(1)
+    except OSError as e:
+        click.secho(f"Error writing project files: {e}", fg="red")
+        sys.exit(1)
 
-                # Copy the file with metadata
-                shutil.copy2(src_file, dest_file)
 
-    except PermissionError as e:
-        click.secho(f"Permission denied: {e}", fg="red")
-        raise
-    except shutil.Error as e:
-        click.secho(f"Error copying files: {e}", fg="red")
-        raise
-    except Exception as e:
-        click.secho(f"Unexpected error during template copying: {e}", fg="red")
-        raise
+# Numbered menu options offered by `cook`
+FRONTEND_CHOICES = {1: "bootstrap", 2: "material"}
+SOCIAL_LOGIN_CHOICES = {1: "google", 2: "none"}
+PASSWORD_HASHER_CHOICES = {1: "pbkdf2", 2: "argon2"}
 
+# Lockfiles resolved by `django-react-jollof lock`, below the template directory
+LOCKFILE_DIR = "lockfiles"
 
 FRONTEND_DEPENDENCIES = {
     "bootstrap": {"react-bootstrap": "^2.7.4", "bootstrap": "^5.2.3"},
@@ -93,31 +82,3 @@ FRONTEND_DEPENDENCIES = {
         "@mui/icons-material": "^5.16.13",
     },
 }
-
-
-def delete_file(file_path: str) -> None:
-    """
-    Delete a file at the specified file path.
-
-    This function attempts to remove the file located at `file_path`. It provides feedback
-    on the operation's success or failure using `click.echo`.
-
-    Args:
-        file_path (str): The path to the file that needs to be deleted.
-
-    Raises:
-        PermissionError: If the script lacks the necessary permissions to delete the file.
-        Exception: For any other unexpected errors that occur during the deletion process.
-    """
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            click.echo(f"Successfully deleted {file_path}")
-        except PermissionError:
-            click.echo(f"Error: Permission denied while deleting {file_path}.")
-        except Exception as e:
-            click.echo(f"An unexpected error occurred while deleting {file_path}: {e}")
-    else:
-        click.echo(
-            f"Warning: The file {file_path} does not exist and cannot be deleted."
-        )
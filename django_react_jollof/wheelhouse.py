@@ -0,0 +1,105 @@
+import glob
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+from django_react_jollof import timings
+from django_react_jollof.cache import fingerprint, get_cache_dir
+
+INDEX_FILE = "index.json"
+
+# Every wheel of a wheelhouse pinned to its hash, for `pip install --require-hashes`
+REQUIREMENTS_FILE = "requirements.txt"
+
+_ABI_SCRIPT = (
+    "import sys, sysconfig; "
+    "print(sys.implementation.cache_tag + '-' + sysconfig.get_platform())"
+)
+
+
+@lru_cache(maxsize=None)
+def interpreter_abi(python: str) -> str:
+    """
+    Return the ABI tag of an interpreter, e.g. ``cpython-311-linux-x86_64``.
+
+    Wheels built for one interpreter are only reused by interpreters that
+    report the same tag.
+
+    Args:
+        python (str): The interpreter to inspect.
+    """
+    result = timings.run(
+        [python, "-c", _ABI_SCRIPT], check=True, text=True, capture_output=True
+    )
+    return result.stdout.strip()
+
+
+def wheelhouse_path(dependencies: List[str], abi: str) -> str:
+    """
+    Return the cache directory holding the wheels for a dependency set.
+
+    The directory name is the hash of the dependency list and the ABI, so
+    a different dependency set or interpreter never reuses stale wheels.
+
+    Args:
+        dependencies (List[str]): Requirement specifiers.
+        abi (str): Interpreter ABI tag from `interpreter_abi`.
+
+    Returns:
+        str: Path of the wheelhouse, which may not exist yet.
+    """
+    key = fingerprint(["wheelhouse-v2", abi] + sorted(dependencies))
+    return os.path.join(get_cache_dir("wheels"), key)
+
+
+def list_wheels(path: str) -> List[str]:
+    """Return the wheel files stored in a wheelhouse."""
+    return sorted(glob.glob(os.path.join(path, "*.whl")))
+
+
+def write_index(path: str, dependencies: List[str], abi: str) -> None:
+    """
+    Record what a wheelhouse was built from and the hash of every wheel.
+
+    The hashes are also written as a requirements file pinning every wheel,
+    so installs from the wheelhouse can run in hash-checking mode.
+
+    Args:
+        path (str): The wheelhouse directory.
+        dependencies (List[str]): Requirement specifiers it was built from.
+        abi (str): Interpreter ABI tag.
+    """
+    wheels: Dict[str, str] = {}
+    for wheel in list_wheels(path):
+        with open(wheel, "rb") as file:
+            wheels[os.path.basename(wheel)] = hashlib.sha256(file.read()).hexdigest()
+
+    with open(os.path.join(path, REQUIREMENTS_FILE), "w") as file:
+        for name, digest in wheels.items():
+            # Wheel names start with the distribution name and version
+            distribution, version = name.split("-")[:2]
+            file.write(f"{distribution}=={version} --hash=sha256:{digest}\n")
+
+    with open(os.path.join(path, INDEX_FILE), "w") as file:
+        json.dump(
+            {"dependencies": dependencies, "abi": abi, "wheels": wheels},
+            file,
+            indent=2,
+        )
+
+
+def is_complete(path: str) -> bool:
+    """Check that a wheelhouse exists and every indexed wheel is present."""
+    try:
+        with open(os.path.join(path, INDEX_FILE), "r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return False
+
+    wheels = index.get("wheels") or {}
+    return bool(wheels) and all(
+        os.path.isfile(os.path.join(path, name))
+        for name in [*wheels, REQUIREMENTS_FILE]
+    )
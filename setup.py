@@ -1,4 +1,31 @@
+import importlib.util
+import os
+import shutil
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithTemplateBundle(build_py):
+    """Pack the templates into one indexed bundle inside the built package."""
+
+    def run(self):
+        super().run()
+        spec = importlib.util.spec_from_file_location(
+            "template_manifest",
+            os.path.join("django_react_jollof", "template_manifest.py"),
+        )
+        template_manifest = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(template_manifest)
+
+        package_dir = os.path.join(self.build_lib, "django_react_jollof")
+        templates_dir = os.path.join(package_dir, "templates")
+        template_manifest.write_bundle(
+            templates_dir, os.path.join(package_dir, template_manifest.BUNDLE_FILE)
+        )
+        # The bundle replaces the loose files
+        shutil.rmtree(templates_dir)
+
 
 # Read the long description from README.md
 with open("README.md", "r", encoding="utf-8") as fh:
@@ -30,12 +57,14 @@ setup(
         "djangorestframework-simplejwt>=5.2",  # JWT Authentication
         "django-cors-headers>=3.13",  # CORS for Django
         "django-allauth>=0.53",  # Social authentication
+        "pyyaml>=6.0",  # Batch manifests
     ],
     extras_require={
         "dev": [
             "flake8>=4.0",  # For linting
         ]
     },
+    cmdclass={"build_py": BuildPyWithTemplateBundle},
     entry_points={
         "console_scripts": [
             "django-react-jollof=django_react_jollof.cli:cli",  # CLI command setup